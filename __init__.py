@@ -16,6 +16,7 @@ if OS == 'Linux':
 
     SOURCE_PATH = join(LIBRARY_PATH, __version__)
     DATABASE_FILE = join(LIBRARY_PATH, 'database', 'db.db')
+    MEMPOOL_FILE = join(LIBRARY_PATH, 'database', 'mempool.bin')
     LOG_FILE = join(LIBRARY_PATH, 'logs', 'advaced.log')
 
 elif OS == 'Windows':
@@ -24,6 +25,7 @@ elif OS == 'Windows':
 
     SOURCE_PATH = join(LIBRARY_PATH, __version__)
     DATABASE_FILE = join(LIBRARY_PATH, 'db.db')
+    MEMPOOL_FILE = join(LIBRARY_PATH, 'mempool.bin')
     LOG_FILE = join(LIBRARY_PATH, 'advaced.log')
 
 elif OS == 'Darwin':
@@ -32,8 +34,86 @@ elif OS == 'Darwin':
 
     SOURCE_PATH = join(LIBRARY_PATH, __version__)
     DATABASE_FILE = join(LIBRARY_PATH, 'database', 'db.db')
+    MEMPOOL_FILE = join(LIBRARY_PATH, 'database', 'mempool.bin')
     LOG_FILE = join(LIBRARY_PATH, 'logs', 'advaced.log')
 
+# Maximal amount of read-only database connections that are kept open at the same time
+DATABASE_POOL_SIZE = 8
+
+# Storage profile (pragmas applied to every database connection)
+STORAGE_PROFILE = 'performance'
+STORAGE_PROFILES = {
+    # Plain sqlite defaults
+    'default': {},
+
+    # Write-ahead log, so that readers never wait for the writer (and the other way around)
+    'performance': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+
+        'mmap_size': 268_435_456,  # 256 MiB
+        'cache_size': -65_536,  # 64 MiB (negative values are KiB)
+        'temp_store': 'MEMORY'
+    }
+}
+
+# Amount of the last blocks that are kept in memory (lookups by index, block-hash and transaction-hash)
+BLOCK_CACHE_SIZE = 100
+
+# Memory budget (in bytes) of the older blocks that are kept compressed after they were fetched
+BLOCK_CACHE_MEMORY = 16_777_216  # 16 MiB
+
+# Every how many blocks the full account state is saved (point-in-time queries replay at most this many blocks)
+STATE_CHECKPOINT_INTERVAL = 1_024
+
+# Processes that verify signatures in parallel (None starts one per CPU core)
+VERIFICATION_WORKERS = None
+
+# Smaller batches of signatures are verified in the calling process (handing them to the workers costs more)
+VERIFICATION_BATCH_MIN = 32
+
+# Whether the whole chain is audited in the background when the validator starts
+AUDIT_ON_START = True
+
+# Processes that audit the whole chain in parallel (None starts one per CPU core)
+AUDIT_WORKERS = None
+
+# Smallest amount of blocks that one audit-process checks at once (smaller ranges cost more to start than to check)
+AUDIT_RANGE_MIN = 1_024
+
+# Amount of successfully verified signatures that are remembered (repeated checks skip the verification)
+SIGNATURE_CACHE_SIZE = 65_536
+
+# Decoded public-keys that are kept (decoding a point of the curve is expensive)
+VERIFYING_KEY_CACHE_SIZE = 4_096
+
+# Public-keys that are used this often get precomputed tables (faster verifications, but more memory per key)
+KEY_PRECOMPUTE_USES = 16
+PRECOMPUTED_KEY_LIMIT = 128
+
+# Decoded private-keys that are kept (validators sign a block every 32 seconds)
+SIGNING_KEY_CACHE_SIZE = 16
+
+# Implementation of the signatures ('auto' uses a native backend if it is installed and passes the self-test,
+# 'ecdsa' or 'openssl' force one)
+CRYPTO_BACKEND = 'auto'
+
+# Pending transactions that are kept (the ones with the lowest fees are dropped first)
+MEMPOOL_SIZE = 65_536
+
+# Seconds until a pending transaction expires
+MEMPOOL_TX_TTL = 3_600
+
+# Seconds between two snapshots of the mempool (it is saved on stop as well)
+MEMPOOL_SNAPSHOT_INTERVAL = 32
+
+# Most transactions of a block
+BLOCK_TX_LIMIT = 2_048
+
+# How the validator runs its components ('threads' gives every component its own thread, 'asyncio' drives the
+# processor, the node server and the rpc server from one event loop)
+RUNTIME = 'threads'
+
 # Standard logging format
 FORMAT = '[{levelname:^9}] Advaced: {asctime} → {message}'
 FORMATS = {
@@ -310,6 +390,40 @@ COMMANDS = {
         'description': 'Import blockchain from file'
     },
 
+    # Local database maintenance
+    'database': {
+        'standard': 'database',
+
+        'cmd-opts': {
+            'rebuild-state': {
+                'standard': 'rebuild-state',
+
+                'value': False,
+
+                'description': 'Rebuilds the account state (balances, stakes and claims) from the chain'
+            },
+
+            'audit': {
+                'standard': 'audit',
+
+                'value': False,
+
+                'description': 'Validates the whole chain (in parallel, one process per CPU core)'
+            },
+
+            'help': {
+                'min': 'h',
+                'standard': 'help',
+
+                'value': False,
+
+                'description': 'Shows this help'
+            }
+        },
+
+        'description': 'Maintain the local database'
+    },
+
     # Transaction management
     'transaction': {
         'min': 'tx',
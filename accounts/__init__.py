@@ -1,4 +1,5 @@
 from accounts.account import Account
 from accounts.wallet import Wallet
+from accounts.verifier import SignatureVerifier, verifier
 
-__all__ = ['Account', 'Wallet']
+__all__ = ['Account', 'Wallet', 'SignatureVerifier', 'verifier']
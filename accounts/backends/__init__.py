@@ -0,0 +1,180 @@
+from logging import getLogger
+
+# Add to path
+from sys import path
+from os.path import dirname, abspath, join
+
+path.insert(0, join(dirname(abspath(__file__)), '..', '..'))
+
+from __init__ import CRYPTO_BACKEND
+from accounts.backends.base import CryptoBackend
+from accounts.backends.python_ecdsa import EcdsaBackend
+
+# The backend is selected on import, before the logging is set up (logging.info would configure it too early)
+logger = getLogger(__name__)
+
+# Keypairs with signed data (signed with the reference backend), every backend has to derive and verify them exactly
+KEYPAIRS = [
+    {
+        'private_key': 'f084649343e478d3a524973d4d957d01208f6fd6a8a6c725d96abb3e0b1f8cd5',
+        'public_key': '4dba8ff1c6099f1a62e5ab09cdc7e4ad8dc52b4c6d20762d3a539a7ddcf940b4d69407de89951edd7e6d5a699c47381'
+                      '07a78f5f749486f8b5cea00d93c3216c8',
+        'data': 'fb0e61a901fc16843e44e281a60256633dff8123c6f874d83b58a6ce19a643aa',
+        'signature': '13a9cb371a4c53ebaed2eec69e6819d2254e3c1b21d01a4505a59375b635d49e52272412c4885efbfa0d12313e106b0f'
+                     '8ce9e5ae3cccd9f56017843ec76294c2'
+    },
+    {
+        'private_key': 'e57753da3b6f4427e494a4e5c50b9d15f8916d5a702ffa045ffb47a7898bd66a',
+        'public_key': '67a5d256d8b5c011b753c8b2632e9f23ec2993e2e7db8c8cd09e8be5a4c5d67817125634d8b6107a3b93d4d7155d85d'
+                      '71bc7fb325582affc9ffa4c4495c8ff69',
+        'data': '16027ccf9a8ee74834ab88ec5b5316e775f08cc96a4ce5fcd2eca4a6e894449b',
+        'signature': 'e37c6d6977e139c9160ed244bce4ebadb55f6cfd46ec48bcfe0847b83b2f28f95df1c43d4e272e5ef9bd15f1c236b2'
+                     '28551ba50bd8d15c2e653b861e6100e2d7'
+    }
+]
+
+
+def test_vectors() -> list:
+    """Creates the verification vectors from the keypairs (valid signatures and the ways to break them).
+
+    :return: Public-key, signature, data and the expected result.
+    :rtype: [ (bytes, bytes, bytes, bool) ]
+    """
+    vectors = []
+
+    for position, keypair in enumerate(KEYPAIRS):
+        public_key, signature = bytes.fromhex(keypair['public_key']), bytes.fromhex(keypair['signature'])
+        data = bytes(keypair['data'], 'utf-8')
+
+        other_key = bytes.fromhex(KEYPAIRS[(position + 1) % len(KEYPAIRS)]['public_key'])
+
+        vectors += [
+            (public_key, signature, data, True),
+            # Tampered data
+            (public_key, signature, data[:-1] + b'0', False),
+            # Flipped bit of the signature
+            (public_key, signature[:40] + bytes([signature[40] ^ 1]) + signature[41:], data, False),
+            # Signature with s = 0
+            (public_key, signature[:32] + bytes(32), data, False),
+            # Signature of another key
+            (other_key, signature, data, False)
+        ]
+
+    return vectors
+
+
+def self_test(backend: CryptoBackend, reference: CryptoBackend) -> bool:
+    """Check if a backend gives exactly the same results as the reference backend.
+
+    :param backend: Backend to test.
+    :type backend: :py:class:`accounts.backends.base.CryptoBackend`
+    :param reference: Reference backend.
+    :type reference: :py:class:`accounts.backends.base.CryptoBackend`
+
+    :return: Whether the backend passed the test or not.
+    :rtype: bool
+    """
+    try:
+        for keypair in KEYPAIRS:
+            signing_key = backend.load_signing_key(bytes.fromhex(keypair['private_key']))
+            data = bytes(keypair['data'], 'utf-8')
+
+            # Derive the keys
+            if not (backend.public_key(signing_key).hex() == keypair['public_key']
+                    and backend.private_key(signing_key).hex() == keypair['private_key']):
+                return False
+
+            # Signatures of both backends have to be accepted by the other one
+            signature = backend.sign(signing_key, data)
+            reference_key = reference.load_verifying_key(bytes.fromhex(keypair['public_key']))
+
+            if not reference.verify(reference_key, signature, data):
+                return False
+
+            reference_signature = reference.sign(reference.load_signing_key(bytes.fromhex(keypair['private_key'])),
+                                                 data)
+            verifying_key = backend.load_verifying_key(bytes.fromhex(keypair['public_key']))
+
+            if not backend.verify(verifying_key, reference_signature, data):
+                return False
+
+        # Keys outside of the curve have to be rejected
+        try:
+            backend.load_verifying_key(bytes(63) + b'\x01')
+            return False
+
+        except ValueError:
+            pass
+
+        vectors = test_vectors()
+
+        # Verify the vectors one by one and as batch
+        items = [(backend.load_verifying_key(public_key), signature, data) for public_key, signature, data, _ in vectors]
+        expected = [result for *_, result in vectors]
+
+        if not [backend.verify(*item) for item in items] == expected or not backend.verify_batch(items) == expected:
+            return False
+
+    # A crashing backend is as bad as a wrong one
+    except Exception:
+        return False
+
+    return True
+
+
+def available_backends() -> dict:
+    """Collects the backends that can be imported (native backends need optional packages).
+
+    :return: Backend-classes by their names.
+    :rtype: dict
+    """
+    backends = {EcdsaBackend.name: EcdsaBackend}
+
+    try:
+        from accounts.backends.openssl import OpenSSLBackend
+
+        backends[OpenSSLBackend.name] = OpenSSLBackend
+
+    except ImportError:
+        pass
+
+    return backends
+
+
+def load_backend(name: str = CRYPTO_BACKEND) -> CryptoBackend:
+    """Selects the crypto backend (a native backend is only used if it passed the self-test).
+
+    :param name: Name of the backend ('auto' takes the fastest one that passes the self-test).
+    :type name: str
+
+    :return: Crypto backend.
+    :rtype: :py:class:`accounts.backends.base.CryptoBackend`
+    """
+    reference = EcdsaBackend()
+    backends = available_backends()
+
+    # Native backends first
+    candidates = [backend for backend in backends if not backend == reference.name] if name == 'auto' else [name]
+
+    for candidate in candidates:
+        if candidate == reference.name:
+            return reference
+
+        if candidate not in backends:
+            logger.warning(f'Crypto backend {candidate} is not available, using {reference.name}')
+            continue
+
+        backend = backends[candidate]()
+
+        if not self_test(backend, reference):
+            logger.warning(f'Crypto backend {candidate} failed the self-test, using {reference.name}')
+            continue
+
+        logger.info(f'Using crypto backend {candidate}')
+
+        return backend
+
+    return reference
+
+
+__all__ = ['CryptoBackend', 'EcdsaBackend', 'self_test', 'available_backends', 'load_backend']
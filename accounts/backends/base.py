@@ -0,0 +1,96 @@
+class CryptoBackend:
+    # Name of the backend (used to select it in the configuration)
+    name = None
+
+    def generate_signing_key(self):
+        """Creates a new random private-key.
+
+        :return: Signing key of the backend.
+        """
+        raise NotImplementedError
+
+    def load_signing_key(self, private_key: bytes):
+        """Decodes a private-key (raises a ValueError if it is not a valid key).
+
+        :param private_key: Raw private-key (32 bytes).
+        :type private_key: bytes
+
+        :return: Signing key of the backend.
+        """
+        raise NotImplementedError
+
+    def load_verifying_key(self, public_key: bytes):
+        """Decodes a public-key (raises a ValueError if it is not a valid point of the curve).
+
+        :param public_key: Raw public-key (x- and y-coordinate, 64 bytes).
+        :type public_key: bytes
+
+        :return: Verifying key of the backend.
+        """
+        raise NotImplementedError
+
+    def precompute(self, verifying_key):
+        """Prepares a frequently used verifying key for faster verifications.
+
+        :param verifying_key: Verifying key of the backend.
+
+        :return: Verifying key to use from now on.
+        """
+        return verifying_key
+
+    def private_key(self, signing_key) -> bytes:
+        """Encodes a private-key.
+
+        :param signing_key: Signing key of the backend.
+
+        :return: Raw private-key (32 bytes).
+        :rtype: bytes
+        """
+        raise NotImplementedError
+
+    def public_key(self, signing_key) -> bytes:
+        """Derives the public-key of a private-key.
+
+        :param signing_key: Signing key of the backend.
+
+        :return: Raw public-key (x- and y-coordinate, 64 bytes).
+        :rtype: bytes
+        """
+        raise NotImplementedError
+
+    def sign(self, signing_key, data: bytes) -> bytes:
+        """Signs data (ECDSA over SECP256k1 with the SHA3-512 digest of the data).
+
+        :param signing_key: Signing key of the backend.
+        :param data: Data to sign.
+        :type data: bytes
+
+        :return: Raw signature (r and s, 64 bytes).
+        :rtype: bytes
+        """
+        raise NotImplementedError
+
+    def verify(self, verifying_key, signature: bytes, data: bytes) -> bool:
+        """Verifies a signature.
+
+        :param verifying_key: Verifying key of the backend.
+        :param signature: Raw signature (r and s, 64 bytes).
+        :type signature: bytes
+        :param data: Signed data.
+        :type data: bytes
+
+        :return: Whether the signature is valid or not.
+        :rtype: bool
+        """
+        raise NotImplementedError
+
+    def verify_batch(self, items) -> list:
+        """Verifies a batch of signatures.
+
+        :param items: Verifying keys, raw signatures and signed data.
+        :type items: [ (object, bytes, bytes) ]
+
+        :return: Result of every item (in the order of the items).
+        :rtype: [ bool ]
+        """
+        return [self.verify(verifying_key, signature, data) for verifying_key, signature, data in items]
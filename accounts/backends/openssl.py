@@ -0,0 +1,72 @@
+# Optional dependency (importing this module fails if it is not installed)
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.hazmat.primitives.asymmetric.utils import Prehashed, decode_dss_signature, encode_dss_signature
+
+from hashlib import sha3_512
+
+from accounts.backends.base import CryptoBackend
+
+CURVE = ec.SECP256K1()
+
+# The SHA3-512 digest is calculated here, OpenSSL truncates it to the curve order like the reference backend
+ALGORITHM = ec.ECDSA(Prehashed(hashes.SHA3_512()))
+
+# Order of the SECP256k1 curve
+ORDER = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEBAAEDCE6AF48A03BBFD25E8CD0364141
+
+
+class OpenSSLBackend(CryptoBackend):
+    """Native implementation with OpenSSL (through the cryptography-package)."""
+    name = 'openssl'
+
+    def generate_signing_key(self):
+        return ec.generate_private_key(CURVE)
+
+    def load_signing_key(self, private_key: bytes):
+        value = int.from_bytes(private_key, 'big')
+
+        if not len(private_key) == 32 or not 0 < value < ORDER:
+            raise ValueError('Invalid private-key')
+
+        return ec.derive_private_key(value, CURVE)
+
+    def load_verifying_key(self, public_key: bytes):
+        if not len(public_key) == 64:
+            raise ValueError('Invalid public-key')
+
+        # Raw keys are the uncompressed encoding without its prefix
+        return ec.EllipticCurvePublicKey.from_encoded_point(CURVE, b'\x04' + public_key)
+
+    def private_key(self, signing_key) -> bytes:
+        return signing_key.private_numbers().private_value.to_bytes(32, 'big')
+
+    def public_key(self, signing_key) -> bytes:
+        numbers = signing_key.public_key().public_numbers()
+
+        return numbers.x.to_bytes(32, 'big') + numbers.y.to_bytes(32, 'big')
+
+    def sign(self, signing_key, data: bytes) -> bytes:
+        # OpenSSL creates DER-encoded signatures
+        r, s = decode_dss_signature(signing_key.sign(sha3_512(data).digest(), ALGORITHM))
+
+        return r.to_bytes(32, 'big') + s.to_bytes(32, 'big')
+
+    def verify(self, verifying_key, signature: bytes, data: bytes) -> bool:
+        if not len(signature) == 64:
+            return False
+
+        r, s = int.from_bytes(signature[:32], 'big'), int.from_bytes(signature[32:], 'big')
+
+        # Values outside of the curve order are rejected like in the reference backend
+        if not 0 < r < ORDER or not 0 < s < ORDER:
+            return False
+
+        try:
+            verifying_key.verify(encode_dss_signature(r, s), sha3_512(data).digest(), ALGORITHM)
+
+        except InvalidSignature:
+            return False
+
+        return True
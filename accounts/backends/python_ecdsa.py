@@ -0,0 +1,55 @@
+from ecdsa import SigningKey, VerifyingKey, SECP256k1, BadSignatureError, MalformedPointError
+from ecdsa.ellipticcurve import PointJacobi
+from hashlib import sha3_512
+
+from accounts.backends.base import CryptoBackend
+
+
+class EcdsaBackend(CryptoBackend):
+    """Pure-python implementation (reference for all other backends)."""
+    name = 'ecdsa'
+
+    def generate_signing_key(self):
+        return SigningKey.generate(curve=SECP256k1, hashfunc=sha3_512)
+
+    def load_signing_key(self, private_key: bytes):
+        try:
+            return SigningKey.from_string(private_key, curve=SECP256k1, hashfunc=sha3_512)
+
+        # Keys with the wrong length or outside of the curve order
+        except AssertionError as error:
+            raise ValueError(error)
+
+    def load_verifying_key(self, public_key: bytes):
+        try:
+            # Only raw keys are accepted (like in every other backend)
+            return VerifyingKey.from_string(public_key, curve=SECP256k1, hashfunc=sha3_512, valid_encodings=['raw'])
+
+        # Points outside of the curve
+        except MalformedPointError as error:
+            raise ValueError(error)
+
+    def precompute(self, verifying_key):
+        point = verifying_key.pubkey.point
+
+        # Decoded points do not know the order of the curve, which the precomputation needs
+        # (VerifyingKey.precompute fails for them)
+        point = PointJacobi(SECP256k1.curve, point.x(), point.y(), 1, SECP256k1.order, generator=True)
+
+        return VerifyingKey.from_public_point(point, curve=SECP256k1, hashfunc=sha3_512)
+
+    def private_key(self, signing_key) -> bytes:
+        return signing_key.to_string()
+
+    def public_key(self, signing_key) -> bytes:
+        return signing_key.get_verifying_key().to_string()
+
+    def sign(self, signing_key, data: bytes) -> bytes:
+        return signing_key.sign(data, hashfunc=sha3_512)
+
+    def verify(self, verifying_key, signature: bytes, data: bytes) -> bool:
+        try:
+            return verifying_key.verify(signature, data, hashfunc=sha3_512)
+
+        except (BadSignatureError, ValueError, AssertionError):
+            return False
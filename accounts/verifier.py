@@ -0,0 +1,135 @@
+# Parallel signature verification
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context
+from threading import Lock
+from atexit import register as register_exit
+from os import cpu_count
+
+# Add to path
+from sys import path
+from os.path import dirname, abspath, join
+
+path.insert(0, join(dirname(abspath(__file__)), '..'))
+
+from __init__ import VERIFICATION_WORKERS, VERIFICATION_BATCH_MIN
+from accounts.wallet import Wallet
+
+
+def verify_item(item: tuple) -> bool:
+    """Verifies one signature (runs in the worker processes).
+
+    :param item: Public-key, signature and signed data.
+    :type item: (str, str, str)
+
+    :return: Whether the signature is valid or not.
+    :rtype: bool
+    """
+    public_key, signature, data = item
+
+    return Wallet.valid_signature(public_key, signature, data)
+
+
+class SignatureVerifier:
+    def __init__(self, workers: int = VERIFICATION_WORKERS, batch_min: int = VERIFICATION_BATCH_MIN):
+        """Sets up the verification engine (the worker processes are started on the first big batch).
+
+        :param workers: Amount of worker processes (one per CPU core if it is not set).
+        :type workers: int | NoneType
+        :param batch_min: Smallest batch that is handed to the worker processes.
+        :type batch_min: int
+        """
+        self.workers = workers if workers else cpu_count() or 1
+        self.batch_min = batch_min
+
+        self.executor = None
+
+        # Guards the start and the shutdown of the worker processes
+        self.lock = Lock()
+
+    def start_executor(self) -> ProcessPoolExecutor:
+        """Returns the pool of worker processes and starts it if it is not running yet.
+
+        :return: Pool of worker processes.
+        :rtype: :py:class:`concurrent.futures.ProcessPoolExecutor`
+        """
+        with self.lock:
+            if self.executor is None:
+                # Forking a process with running database-, rpc- and socket-threads is not safe
+                self.executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=get_context('spawn'))
+
+            return self.executor
+
+    def verify(self, items) -> list:
+        """Verifies a batch of signatures.
+
+        :param items: Public-keys, signatures and signed data.
+        :type items: [ (str, str, str) ]
+
+        :return: Result of every item (in the order of the items).
+        :rtype: [ bool ]
+        """
+        items = list(items)
+
+        # Small batches are faster in this process
+        if len(items) < self.batch_min or self.workers < 2:
+            return Wallet.valid_signatures(items)
+
+        # Only signatures that were not verified before go to the workers
+        results = [Wallet.cached_signature(*item) for item in items]
+        missing = [position for position, cached in enumerate(results) if not cached]
+
+        # Check if everything was cached
+        if not missing:
+            return results
+
+        missing_items = [items[position] for position in missing]
+
+        # Send every worker a few chunks, so that the work stays balanced
+        chunk_size = max(len(missing_items) // (self.workers * 4), 1)
+
+        try:
+            verified = list(self.start_executor().map(verify_item, missing_items, chunksize=chunk_size))
+
+        # A worker died, so start new ones next time and verify this batch here
+        except BrokenProcessPool:
+            self.close()
+
+            verified = Wallet.valid_signatures(missing_items)
+
+        for position, valid in zip(missing, verified):
+            results[position] = valid
+
+            # The workers have their own caches, so remember the result here as well
+            if valid:
+                Wallet.cache_signature(*items[position])
+
+        return results
+
+    def verify_all(self, items) -> bool:
+        """Check if all signatures of a batch are valid.
+
+        :param items: Public-keys, signatures and signed data.
+        :type items: [ (str, str, str) ]
+
+        :return: Whether all signatures are valid or not.
+        :rtype: bool
+        """
+        return all(self.verify(items))
+
+    def close(self):
+        """Stops the worker processes (they get restarted by the next big batch).
+
+        """
+        with self.lock:
+            if self.executor is not None:
+                self.executor.shutdown(wait=True, cancel_futures=True)
+
+            self.executor = None
+
+
+# Verification engine shared by everything that validates blocks and transactions
+verifier = SignatureVerifier()
+
+# Stop the worker processes when the program exits
+register_exit(verifier.close)
@@ -1,10 +1,44 @@
-from ecdsa import SigningKey, VerifyingKey, SECP256k1
-from hashlib import sha3_512
+from hashlib import sha3_256
 
 from datetime import datetime, timezone
 
+from collections import OrderedDict
+from threading import Lock
+
+# Add to path
+from sys import path
+from os.path import dirname, abspath, join
+
+path.insert(0, join(dirname(abspath(__file__)), '..'))
+
+from __init__ import (SIGNATURE_CACHE_SIZE, VERIFYING_KEY_CACHE_SIZE, KEY_PRECOMPUTE_USES, PRECOMPUTED_KEY_LIMIT,
+                      SIGNING_KEY_CACHE_SIZE)
+from accounts.backends import load_backend
+
 
 class Wallet:
+    # Implementation of the keys and signatures (selected once on startup)
+    backend = load_backend()
+
+    # Successfully verified signatures (least recently used first) and how often the cache was asked
+    signature_cache = OrderedDict()
+    signature_cache_size = SIGNATURE_CACHE_SIZE
+
+    signature_cache_hits = 0
+    signature_cache_misses = 0
+
+    # Guards the signature cache (signatures are verified by the processor-, rpc- and node-threads)
+    signature_cache_lock = Lock()
+
+    # Decoded keys (least recently used first), verifying keys are stored with their amount of uses
+    verifying_keys = OrderedDict()
+    signing_keys = OrderedDict()
+
+    # Public-keys of the verifying keys that have precomputed tables
+    precomputed_keys = set()
+
+    key_cache_lock = Lock()
+
     def __init__(self, public_key: str = None, private_key: str = None):
         """Create a new wallet.
 
@@ -14,14 +48,79 @@ class Wallet:
         :type private_key: str (hex digest)
         """
 
-        # Create wallet keypair (with ecdsa, the SECP256k1 curve and sha3-512 as hash-algorithm)
-        verifying_key = SigningKey.generate(curve=SECP256k1, hashfunc=sha3_512)
+        # Create wallet keypair (SECP256k1 curve and sha3-512 as hash-algorithm)
+        signing_key = self.backend.generate_signing_key()
 
-        self.public_key = public_key if public_key else verifying_key.get_verifying_key().to_string().hex()
-        self.private_key = private_key if private_key else verifying_key.to_string().hex()
+        self.public_key = public_key if public_key else self.backend.public_key(signing_key).hex()
+        self.private_key = private_key if private_key else self.backend.private_key(signing_key).hex()
 
-    @staticmethod
-    def sign_data(private_key: str, data: str):
+    @classmethod
+    def verifying_key(cls, public_key: str):
+        """Returns the decoded verifying key of a public-key (frequently used keys get precomputed tables).
+
+        :param public_key: Public-key of the wallet.
+        :type public_key: str (hex-digest)
+
+        :return: Verifying key of the public-key (object of the crypto backend).
+        """
+        with cls.key_cache_lock:
+            if public_key in cls.verifying_keys:
+                cls.verifying_keys.move_to_end(public_key)
+
+                key, uses = cls.verifying_keys[public_key]
+                cls.verifying_keys[public_key] = (key, uses + 1)
+
+                # Speed up the keys of validators and frequent senders (as long as the limit is not reached)
+                if (uses + 1 == KEY_PRECOMPUTE_USES and public_key not in cls.precomputed_keys
+                   and len(cls.precomputed_keys) < PRECOMPUTED_KEY_LIMIT):
+                    key = cls.backend.precompute(key)
+
+                    cls.verifying_keys[public_key] = (key, uses + 1)
+                    cls.precomputed_keys.add(public_key)
+
+                return key
+
+        # Decode the key outside of the lock (raises an error if it is not a valid key)
+        key = cls.backend.load_verifying_key(bytes.fromhex(public_key))
+
+        with cls.key_cache_lock:
+            cls.verifying_keys[public_key] = (key, 1)
+
+            # Drop the least recently used keys
+            while len(cls.verifying_keys) > VERIFYING_KEY_CACHE_SIZE:
+                dropped_key, _ = cls.verifying_keys.popitem(last=False)
+                cls.precomputed_keys.discard(dropped_key)
+
+        return key
+
+    @classmethod
+    def signing_key(cls, private_key: str):
+        """Returns the decoded signing key of a private-key.
+
+        :param private_key: Private-key of the wallet.
+        :type private_key: str (hex-digest)
+
+        :return: Signing key of the private-key (object of the crypto backend).
+        """
+        with cls.key_cache_lock:
+            if private_key in cls.signing_keys:
+                cls.signing_keys.move_to_end(private_key)
+
+                return cls.signing_keys[private_key]
+
+        # Decode the key outside of the lock (raises an error if it is not a valid key)
+        key = cls.backend.load_signing_key(bytes.fromhex(private_key))
+
+        with cls.key_cache_lock:
+            cls.signing_keys[private_key] = key
+
+            while len(cls.signing_keys) > SIGNING_KEY_CACHE_SIZE:
+                cls.signing_keys.popitem(last=False)
+
+        return key
+
+    @classmethod
+    def sign_data(cls, private_key: str, data: str):
         """Sign data with string of private-key
 
         :param private_key: Private-key of the wallet.
@@ -35,21 +134,101 @@ class Wallet:
         :rtype: str (hex-digest)
         """
 
-        # Fetch public-key from hex-string
+        # Fetch private-key from hex-string
         try:
-            key = SigningKey.from_string(bytes.fromhex(private_key), curve=SECP256k1, hashfunc=sha3_512)
+            key = cls.signing_key(private_key)
 
         except:
             return False
 
         # Create a signature
-        signature = key.sign(bytes(data, 'utf-8'), hashfunc=sha3_512).hex()
+        signature = cls.backend.sign(key, bytes(data, 'utf-8')).hex()
 
         return signature
 
     @staticmethod
-    def valid_signature(public_key: str, signature: str, data: str) -> bool:
-        """Verify signature with the public_key.
+    def signature_cache_key(public_key: str, signature: str, data: str) -> tuple:
+        """Creates the key of a signature in the signature cache.
+
+        :param public_key: Public-key of the wallet.
+        :type public_key: str (hex-digest)
+        :param signature: Signature of the data.
+        :type signature: str
+        :param data: Signed data.
+        :type data: str (json)
+
+        :return: Public-key, hash of the data and signature.
+        :rtype: (str, bytes, str)
+        """
+        return public_key, sha3_256(bytes(data, 'utf-8')).digest(), signature
+
+    @classmethod
+    def cached_signature(cls, public_key: str, signature: str, data: str) -> bool:
+        """Check if the signature was already verified successfully.
+
+        :param public_key: Public-key of the wallet.
+        :type public_key: str (hex-digest)
+        :param signature: Signature of the data.
+        :type signature: str
+        :param data: Signed data.
+        :type data: str (json)
+
+        :return: Whether the signature is in the cache or not.
+        :rtype: bool
+        """
+        try:
+            key = cls.signature_cache_key(public_key, signature, data)
+
+        # Values that can not be part of a key can not be cached either
+        except TypeError:
+            return False
+
+        with cls.signature_cache_lock:
+            if key not in cls.signature_cache:
+                cls.signature_cache_misses += 1
+
+                return False
+
+            # Mark the signature as recently used
+            cls.signature_cache.move_to_end(key)
+            cls.signature_cache_hits += 1
+
+        return True
+
+    @classmethod
+    def cache_signature(cls, public_key: str, signature: str, data: str):
+        """Remembers a successfully verified signature (the least recently used one is dropped if the cache is full).
+
+        :param public_key: Public-key of the wallet.
+        :type public_key: str (hex-digest)
+        :param signature: Signature of the data.
+        :type signature: str
+        :param data: Signed data.
+        :type data: str (json)
+        """
+        key = cls.signature_cache_key(public_key, signature, data)
+
+        with cls.signature_cache_lock:
+            cls.signature_cache[key] = True
+            cls.signature_cache.move_to_end(key)
+
+            while len(cls.signature_cache) > cls.signature_cache_size:
+                cls.signature_cache.popitem(last=False)
+
+    @classmethod
+    def signature_cache_stats(cls) -> dict:
+        """Returns the usage of the signature cache.
+
+        :return: Hits, misses and the amount of cached signatures.
+        :rtype: dict
+        """
+        with cls.signature_cache_lock:
+            return {'hits': cls.signature_cache_hits, 'misses': cls.signature_cache_misses,
+                    'size': len(cls.signature_cache)}
+
+    @classmethod
+    def valid_signature(cls, public_key: str, signature: str, data: str) -> bool:
+        """Verify signature with the public_key (signatures that were verified before are taken from the cache).
 
         :param public_key: Public-key of the wallet.
         :type public_key: str (hex-digest)
@@ -61,16 +240,64 @@ class Wallet:
         :return: Whether the signature is valid or not or the key for it is valid.
         :rtype: bool
         """
+        # Check if the signature was verified before
+        if cls.cached_signature(public_key, signature, data):
+            return True
+
         try:
             # Fetch public-key from hex-string
-            key = VerifyingKey.from_string(bytes.fromhex(public_key), curve=SECP256k1, hashfunc=sha3_512)
+            key = cls.verifying_key(public_key)
 
-            # Return the results
-            return key.verify(bytes.fromhex(signature), bytes(data, 'utf-8'), hashfunc=sha3_512)
+            # Verify the signature
+            if not cls.backend.verify(key, bytes.fromhex(signature), bytes(data, 'utf-8')):
+                return False
 
         except:
             return False
 
+        # Only valid signatures are remembered
+        cls.cache_signature(public_key, signature, data)
+
+        return True
+
+    @classmethod
+    def valid_signatures(cls, items) -> list:
+        """Verify a batch of signatures at once (the crypto backend may verify them faster than one by one).
+
+        :param items: Public-keys, signatures and signed data.
+        :type items: [ (str, str, str) ]
+
+        :return: Result of every item (in the order of the items).
+        :rtype: [ bool ]
+        """
+        items = list(items)
+
+        # Signatures that were verified before are taken from the cache
+        results = [cls.cached_signature(*item) for item in items]
+        missing, batch = [], []
+
+        for position, (public_key, signature, data) in enumerate(items):
+            if results[position]:
+                continue
+
+            # Items with invalid keys or signatures stay invalid
+            try:
+                batch.append((cls.verifying_key(public_key), bytes.fromhex(signature), bytes(data, 'utf-8')))
+
+            except:
+                continue
+
+            missing.append(position)
+
+        for position, valid in zip(missing, cls.backend.verify_batch(batch)):
+            results[position] = valid
+
+            # Only valid signatures are remembered
+            if valid:
+                cls.cache_signature(*items[position])
+
+        return results
+
     @classmethod
     def valid_version_stamp(cls, public_key: str, signature: str, version: str, timestamp: str, network: str) -> bool:
         """Verify a version stamp from a developer-key signature (Warning: This function does not check the validity of
@@ -96,8 +323,8 @@ class Wallet:
 
         return True
 
-    @staticmethod
-    def get_public_key(private_key: str):
+    @classmethod
+    def get_public_key(cls, private_key: str):
         """Returns the public-key of the parsed private-key.
 
         :param private_key: Private-key of the wallet.
@@ -108,8 +335,7 @@ class Wallet:
         """
         try:
             # Fetch private-key from hex-string and return public-key
-            return SigningKey.from_string(bytes.fromhex(private_key), curve=SECP256k1,
-                                          hashfunc=sha3_512).get_verifying_key().to_string().hex()
+            return cls.backend.public_key(cls.signing_key(private_key)).hex()
 
         # Occurred if private-key is false
         except:
@@ -137,8 +363,8 @@ class Wallet:
 
         return True
 
-    @classmethod
-    def coins(cls, public_key: str, blockchain) -> float:
+    @staticmethod
+    def coins(public_key: str, blockchain) -> float:
         """Returns the amount of coins the wallet owns.
 
         :param public_key: Public-key of the wallet.
@@ -149,65 +375,21 @@ class Wallet:
         :return: Amount of coins in the wallet.
         :rtype: float
         """
-
-        # Fetch the claimed coins
-        coins = cls.claims(public_key, blockchain)
-
-        # Fetch the coins that the account spend on staking
-        stake_tx = blockchain.fetch_transactions(public_key, tx_type='stake', is_sender=True)
-
-        if len(stake_tx) > 0:
-            coins -= sum([transaction.amount + transaction.fee for transaction in stake_tx])
-
-        # Fetch the coins that the account spend on unstaking fees
-        unstake_tx = blockchain.fetch_transactions(public_key, tx_type='unstake', is_sender=False)
-
-        if len(unstake_tx) > 0:
-            coins += sum([transaction.amount - transaction.fee for transaction in unstake_tx])
-
-        # Fetch the coins that the wallet sent and received as a tx
-        tx = blockchain.fetch_transactions(public_key, tx_type='tx')
-
-        if len(tx) > 1:
-            for transaction in tx:
-                # Check if the transaction comes from this wallet
-                if transaction.sender == public_key and not transaction.recipient == public_key:
-                    coins -= (transaction.amount + transaction.fee)
-
-                # Transaction goes to this wallet
-                elif transaction.recipient == public_key and not transaction.sender == public_key:
-                    coins += transaction.amount
-
-        elif len(tx) > 0:
-            # Check if the only transaction comes from this wallet
-            if tx[0].sender == public_key and not tx[0].recipient == public_key:
-                coins -= tx[0].amount + tx[0].fee
-
-            # Transaction goes to this wallet
-            elif tx[0].recipient == public_key and not tx[0].sender == public_key:
-                coins += tx[0].amount
-
-        return coins
+        return blockchain.fetch_account_state(public_key)['balance']
 
     @staticmethod
     def claims(public_key: str, blockchain) -> float:
-        """Returns the amount of coins the wallet owns.
+        """Returns the amount of coins the wallet claimed.
 
         :param public_key: Public-key of the wallet.
         :type public_key: str
         :param blockchain: The Blockchain to search.
         :type blockchain: :py:class:`blockchain.Blockchain`
 
-        :return: Amount of coins in the wallet.
+        :return: Amount of claimed coins.
         :rtype: float
         """
-        # Fetch the coins that the account claimed
-        claims_tx = blockchain.fetch_transactions(public_key, tx_type='claim', is_sender=False)
-
-        if not len(claims_tx) > 0:
-            return 0
-
-        return sum([transaction.amount - transaction.fee for transaction in claims_tx])
+        return blockchain.fetch_account_state(public_key)['claims']
 
     @staticmethod
     def stake(public_key: str, blockchain, index: int = None) -> float:
@@ -223,27 +405,11 @@ class Wallet:
         :return: Amount of staked coins of the wallet.
         :rtype: float
         """
-        # Fetch the staked and unstaked coins of this wallet
+        # Answered from the account state (and its checkpoints for past blocks)
+        return blockchain.fetch_account_state(public_key, index)['stake']
 
-        stake = 0
-
-        stake_tx = blockchain.fetch_transactions(public_key, tx_type='stake', is_sender=False,
-                                                 index=index if index else None)
-        unstake_tx = blockchain.fetch_transactions(public_key, tx_type='unstake', is_sender=True,
-                                                   index=index if index else None)
-
-        if len(stake_tx) > 0:
-            # Go through the stake transactions
-            stake -= sum([transaction.amount - transaction.fee for transaction in stake_tx])
-
-        if len(unstake_tx) > 0:
-            # Go through the unstake transactions
-            stake += sum([transaction.amount - transaction.fee for transaction in unstake_tx])
-
-        return stake
-
-    @classmethod
-    def score(cls, public_key: str, blockchain) -> float:
+    @staticmethod
+    def score(public_key: str, blockchain) -> float:
         """Returns the staking worth of the wallet.
 
         :param public_key: Public-key of the wallet.
@@ -256,47 +422,28 @@ class Wallet:
         :rtype: float
         """
 
-        # Fetch the staked, unstaked and the burned coins of this wallet
-        stake_tx = blockchain.fetch_transactions(public_key, tx_type='stake', is_sender=False)
-
-        # Check if the account has any stake
-        if len(stake_tx) < 0:
-            return 0
+        # Fetch the stake that was not unstaked yet (as amounts with their timestamps)
+        return Wallet.score_lots(blockchain.fetch_stake_lots(public_key), datetime.now(timezone.utc).timestamp())
 
-        # Bring the transactions into a better format
-        stakes = [(tx.amount, tx.timestamp.timestamp()) for tx in stake_tx]
-
-        stakes.sort(key=lambda x: x[1])
-
-        # Remove unstaked stake
-        unstake_tx = blockchain.fetch_transactions(public_key, tx_type='unstake', is_sender=True)
-
-        if len(unstake_tx) > 1:
-            for tx in unstake_tx:
-                amount_left = tx.amount
-
-                while amount_left > 0:
-                    # Check if something really went wrong (if this occurred the stake of the account is negative and
-                    # not allowed)
-                    if len(stakes) == 0:
-                        return 0
-
-                    # Check if unstaking amount is bigger than the last staked amount
-                    if amount_left > stakes[-1][0]:
-                        amount_left -= stakes[-1][0]
-                        stakes.pop(-1)
+    @staticmethod
+    def score_lots(stakes: list, now: float) -> float:
+        """Calculates the staking worth from stake-lots.
 
-                    else:
-                        stakes[-1][0] -= amount_left
-                        break
+        :param stakes: Staked amounts and their timestamps (in seconds).
+        :type stakes: [ (float, float) ]
+        :param now: Timestamp (in seconds) the coin age is calculated for.
+        :type now: float
 
+        :return: Staking score.
+        :rtype: float
+        """
         # Check if any stake is left
         if len(stakes) == 0:
             return 0
 
         # Calculate the coin age
-        coin_age = sum([stake[0] * 1.000_000_104_051 ** datetime.now(timezone.utc).timestamp() - stake[1]
-                        if datetime.now(timezone.utc).timestamp() - stake[1] <= 2_764_800 else 2_764_800  # 32d in sec
+        coin_age = sum([stake[0] * 1.000_000_104_051 ** now - stake[1]
+                        if now - stake[1] <= 2_764_800 else 2_764_800  # 32d in sec
                         for stake in stakes])
 
         # Check if the coin age is above the maximum
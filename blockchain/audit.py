@@ -0,0 +1,249 @@
+# Parallel audit of the whole chain
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from collections import deque
+from os import cpu_count
+
+# Add to path
+from sys import path
+from os.path import dirname, abspath, join
+
+path.insert(0, join(dirname(abspath(__file__)), '..'))
+
+# Project modules
+from __init__ import __version__, AUDIT_WORKERS, AUDIT_RANGE_MIN
+from accounts import verifier
+from blockchain.block import Block
+from blockchain.header import BASE_FEE_WINDOW, BlockHeader, calculate_base_fee
+from util.database.blockchain import fetch_header, fetch_last_index, fetch_tx_counts, fetch_version_stamps, iter_blocks
+from util.database.state import fetch_account_state
+
+# Amount of blocks whose signatures are verified together by one worker
+AUDIT_BATCH_SIZE = 256
+
+
+class AuditChain:
+    def __init__(self, network: str):
+        """Read-only view of the chain that the blocks of an audit range are checked against (the blocks are already
+           included, so nothing about the tip of the chain is needed).
+
+        :param network: Network of the chain.
+        :type network: str
+        """
+        self.version = __version__
+        self.version_stamps = fetch_version_stamps(network)
+
+        # Nothing is cached, all blocks are read from the database
+        self.last_blocks = []
+
+    @staticmethod
+    def stake_snapshot(index: int = None):
+        """Only the tip of a chain has a stake snapshot, so the stakes of older blocks come from the account state.
+
+        :param index: Index of the block.
+        :type index: int | NoneType
+
+        :return: No snapshot.
+        :rtype: NoneType
+        """
+        return None
+
+    @staticmethod
+    def fetch_account_state(public_key: str, index: int = None) -> dict:
+        """Fetch the state of an account (at the end of the given block).
+
+        :param public_key: Verifying key of the account.
+        :type public_key: str
+        :param index: Index of the block (the current state if it is not set).
+        :type index: int | NoneType
+
+        :return: Balance, stake and claims of the account.
+        :rtype: dict
+        """
+        return fetch_account_state(public_key, index)
+
+
+def init_worker():
+    """Sets an audit worker up (its signatures are verified in the worker itself instead of another pool).
+
+    """
+    verifier.workers = 1
+
+
+def split_range(start: int, end: int, workers: int, range_min: int = AUDIT_RANGE_MIN) -> list:
+    """Splits an index range into contiguous ranges (a few per worker, so that the work stays balanced).
+
+    :param start: Index of the first block.
+    :type start: int
+    :param end: Index of the last block (included).
+    :type end: int
+    :param workers: Amount of worker processes.
+    :type workers: int
+    :param range_min: Smallest amount of blocks in one range.
+    :type range_min: int
+
+    :return: First and last index of every range (ordered by their index, an empty range has no ranges).
+    :rtype: [ (int, int) ]
+    """
+    blocks = end - start + 1
+
+    if blocks < 1:
+        return []
+
+    range_size = max(-(-blocks // (workers * 4)), range_min, 1)
+
+    return [(range_start, min(range_start + range_size - 1, end)) for range_start in range(start, end + 1, range_size)]
+
+
+def audit_range(start: int, end: int, network: str = 'mainnet') -> tuple:
+    """Check the blocks of an index range (runs in the worker processes, each with its own read-only connections).
+
+    :param start: Index of the first block (must be bigger than 1).
+    :type start: int
+    :param end: Index of the last block (included).
+    :type end: int
+    :param network: Network of the chain.
+    :type network: str
+
+    :return: Index of the first invalid block (None if all blocks are valid), the previous hash of the first block
+             and the hash of the last block (both None if the blocks are missing).
+    :rtype: (int | NoneType, str | NoneType, str | NoneType)
+    """
+    chain = AuditChain(network)
+
+    # The first block is linked to the block before the range
+    previous_header = None
+    header_dict = fetch_header(start - 1)
+
+    if header_dict:
+        previous_header = BlockHeader()
+
+        if not previous_header.from_dict(header_dict):
+            return start, None, None
+
+    # The base-fee window moves along the blocks of the range
+    tx_counts = deque(fetch_tx_counts(max(start - BASE_FEE_WINDOW, 1), start - 1), maxlen=BASE_FEE_WINDOW)
+
+    first_previous_hash = None
+    expected_index = start
+    blocks = []
+
+    def valid_batch() -> int | None:
+        """Check the collected blocks (the signatures of all blocks are verified at once).
+
+        :return: Index of the first invalid block or None if all blocks are valid.
+        :rtype: int | NoneType
+        """
+        nonlocal previous_header
+
+        results = verifier.verify([item for block in blocks for item in block.signature_items])
+        position = 0
+
+        for block in blocks:
+            header = block.header
+
+            # Check the signatures of the block, the links to the previous block and the transactions
+            signatures = len(block.tx) + 1
+
+            if not all(results[position:position + signatures]):
+                return block.index
+
+            position += signatures
+
+            if not header.is_valid(chain, previous_header, calculate_base_fee(tx_counts), in_chain=True,
+                                   verify_signature=False):
+                return block.index
+
+            if not all(tx.is_valid(chain, True, verify_signature=False) for tx in block.tx):
+                return block.index
+
+            tx_counts.append(len(block.tx))
+            previous_header = header
+
+        return None
+
+    for block_data in iter_blocks(start, end):
+        # Check if a block is missing
+        if not block_data['index'] == expected_index:
+            break
+
+        expected_index += 1
+
+        block = Block(base_fee=False)
+
+        if not block.from_dict(block_data):
+            break
+
+        if first_previous_hash is None:
+            first_previous_hash = block.previous_hash
+
+        blocks.append(block)
+
+        if len(blocks) == AUDIT_BATCH_SIZE:
+            invalid_index = valid_batch()
+
+            if invalid_index is not None:
+                return invalid_index, first_previous_hash, None
+
+            blocks = []
+
+    # Check the blocks of the last batch
+    invalid_index = valid_batch()
+
+    if invalid_index is not None:
+        return invalid_index, first_previous_hash, None
+
+    # Check if the blocks were read until the end of the range
+    if expected_index <= end:
+        return expected_index, first_previous_hash, None
+
+    return None, first_previous_hash, previous_header.hash
+
+
+def audit_chain(network: str = 'mainnet', workers: int = AUDIT_WORKERS) -> int | None:
+    """Validates the whole chain in parallel: its blocks are split into contiguous ranges that are checked in separate
+       processes, the boundaries of the ranges are stitched together with their previous hashes afterwards.
+
+    :param network: Network of the chain.
+    :type network: str
+    :param workers: Amount of worker processes (one per CPU core if it is not set).
+    :type workers: int | NoneType
+
+    :return: Index of the first invalid block or None if the chain is valid.
+    :rtype: int | NoneType
+    """
+    workers = workers if workers else cpu_count() or 1
+
+    # The genesis block is skipped
+    ranges = split_range(2, fetch_last_index(), workers)
+
+    if not ranges:
+        return None
+
+    # Forking a process with running database-, rpc- and socket-threads is not safe
+    with ProcessPoolExecutor(max_workers=min(workers, len(ranges)), mp_context=get_context('spawn'),
+                             initializer=init_worker) as executor:
+        futures = [executor.submit(audit_range, start, end, network) for start, end in ranges]
+
+        last_hash = None
+
+        try:
+            # Go through the results in the order of the chain, so that the first invalid block is found
+            for (start, end), future in zip(ranges, futures):
+                invalid_index, first_previous_hash, range_last_hash = future.result()
+
+                # Check if the range continues the range before it (the genesis block has no real hash)
+                if start > 2 and not first_previous_hash == last_hash:
+                    return start
+
+                if invalid_index is not None:
+                    return invalid_index
+
+                last_hash = range_last_hash
+
+        finally:
+            # Later ranges can not change the result anymore
+            for future in futures:
+                future.cancel()
+
+    return None
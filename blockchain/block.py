@@ -1,7 +1,5 @@
-# SHA256 hash-algorithm
-from hashlib import sha3_256
-
-from datetime import datetime, timezone
+from datetime import datetime
+from time import time_ns
 from logging import basicConfig, info as log_info, error as log_error, warning as log_warning
 import json
 
@@ -14,16 +12,29 @@ path.insert(0, join(dirname(abspath(__file__)), '..'))
 # Project modules
 from __init__ import __version__, LOG_LEVEL
 from blockchain.transaction import Transaction
-from accounts import Wallet
-from util.database.blockchain import fetch_block
+from accounts import Wallet, verifier
+from blockchain.header import BlockHeader, block_hash, fetch_base_fee
+from blockchain.encoding import (hex_bytes, bytes_hex, Timestamp, to_microseconds, from_microseconds, parse_timestamp,
+                                 format_timestamp)
+from blockchain.merkle import merkle_root, merkle_proof
 from util.log.logger import init_logger
 
 handler = init_logger()
 basicConfig(level=LOG_LEVEL, handlers=[handler])
 
+# Fields that are covered by the block-hash (changing the list of transactions requires assigning a new list) and the
+# slots they are stored in
+HASHED_FIELDS = ('index', 'version', 'timestamp', 'base_fee', 'tx', 'validator', 'microseconds', 'raw_validator')
+
 
 class Block:
-    def __init__(self, transactions=[], previous_block=None, validator=None, signature=None, base_fee=True):
+    # Hashes, the key and the signature are stored as raw bytes and the timestamp as microseconds since the epoch
+    # (hex-digests and datetimes are only created when they are read)
+    __slots__ = ('index', 'raw_previous_hash', 'version', 'microseconds', 'base_fee', 'tx', 'raw_validator',
+                 'raw_signature', 'cached_hash')
+
+    def __init__(self, transactions=[], previous_block=None, validator=None, signature=None, base_fee=True,
+                 blockchain=None):
         """Set the block-values up.
 
         :param transactions: All transactions included into the block.
@@ -34,6 +45,10 @@ class Block:
         :type signature: str (hex digest)
         :param previous_block: The last block in the blockchain.
         :type previous_block: :py:class: blockchain.block.Block
+        :param base_fee: Whether the base-fee should be calculated (skipped for blocks that get loaded from data).
+        :type base_fee: bool
+        :param blockchain: The blockchain the block goes in (its base-fee window is used if it is set).
+        :type blockchain: :py:class:`blockchain.Blockchain`
         """
 
         # Check if there was a previous-block
@@ -49,31 +64,14 @@ class Block:
         self.version = __version__
 
         # Create the timestamp of the block
-        self.timestamp = datetime.now(timezone.utc)
+        self.microseconds = time_ns() // 1_000
 
         # Check if the base-fee should be calculated
-        if base_fee:
-            tx_len = 0
-            blocks_used = 0
-
-            # Fetch last 32 block dicts and add their tx-count
-            for x in range(self.index - 32, self.index):
-                if x < 1:
-                    continue
+        if base_fee and blockchain:
+            self.base_fee = blockchain.base_fee_for(self.index)
 
-                # Fetch block from its index
-                block_dict = fetch_block(x)
-
-                # Check if block could not be fetched
-                if not block_dict:
-                    continue
-
-                # Set the values
-                tx_len += len(block_dict['tx'])
-                blocks_used += 1
-
-            #               min-fee * exp. growth^average tx count
-            self.base_fee = .000001 * 1.00001 ** (tx_len / (blocks_used if blocks_used > 0 else 1))
+        elif base_fee:
+            self.base_fee = fetch_base_fee(self.index)
 
         else:
             self.base_fee = 1
@@ -93,21 +91,136 @@ class Block:
 
         return [tx.to_dict() for tx in self.tx]
 
+    @property
+    def merkle_root(self) -> str:
+        """Calculates the merkle-root over the hashes of the included transactions.
+
+        :return: Hex-digest of the merkle-root.
+        :rtype: str (hex-digest)
+        """
+        return merkle_root([(tx.hash, tx.signature) for tx in self.tx])
+
+    def transaction_proof(self, tx_hash: str) -> list | bool:
+        """Creates the proof that a transaction is included into the block.
+
+        :param tx_hash: Hex-digest of the transaction-hash.
+        :type tx_hash: str
+
+        :return: Hex-digests of the siblings and whether they are the left node, or False if the transaction is not
+                 included.
+        :rtype: [ (str, bool) ] | bool
+        """
+        tx_hashes = [tx.hash for tx in self.tx]
+
+        # Check if the transaction is included into the block
+        if tx_hash not in tx_hashes:
+            return False
+
+        return merkle_proof([(tx.hash, tx.signature) for tx in self.tx], tx_hashes.index(tx_hash))
+
+    def __setattr__(self, name, value):
+        """Sets an attribute and drops the cached hash if the attribute is covered by it.
+
+        """
+        if name in HASHED_FIELDS:
+            object.__setattr__(self, 'cached_hash', None)
+
+        object.__setattr__(self, name, value)
+
+    def __getstate__(self) -> tuple:
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state: tuple):
+        # Restore the slots as they were (the cached hash stays valid)
+        for name, value in zip(self.__slots__, state):
+            object.__setattr__(self, name, value)
+
+    @property
+    def previous_hash(self) -> str:
+        """Returns the hash of the previous block.
+
+        :return: Hex-digest of the previous block-hash.
+        :rtype: str (hex-digest)
+        """
+        return bytes_hex(self.raw_previous_hash)
+
+    @previous_hash.setter
+    def previous_hash(self, value):
+        self.raw_previous_hash = hex_bytes(value)
+
+    @property
+    def validator(self) -> str | None:
+        """Returns the public-key of the validator.
+
+        :return: Hex-digest of the public-key or None if the validator is not set.
+        :rtype: str (hex-digest) | NoneType
+        """
+        return bytes_hex(self.raw_validator)
+
+    @validator.setter
+    def validator(self, value):
+        self.raw_validator = hex_bytes(value)
+
+    @property
+    def signature(self) -> str | None:
+        """Returns the signature of the validator.
+
+        :return: Hex-digest of the signature or None if the block is not signed.
+        :rtype: str (hex-digest) | NoneType
+        """
+        return bytes_hex(self.raw_signature)
+
+    @signature.setter
+    def signature(self, value):
+        self.raw_signature = hex_bytes(value)
+
+    @property
+    def timestamp(self) -> datetime:
+        """Returns the creation time of the block.
+
+        :return: Timestamp of the block (in UTC).
+        :rtype: :py:class:`datetime.datetime`
+        """
+        return from_microseconds(self.microseconds)
+
+    @timestamp.setter
+    def timestamp(self, value):
+        self.microseconds = value if isinstance(value, int) else to_microseconds(value)
+
     @property
     def hash(self) -> str | bool:
-        """Calculates the hash of the block with the SHA3_256 hash-algorithm.
+        """Calculates the hash of the block with the SHA3_256 hash-algorithm (cached until a hashed field changes).
 
         :return: Hex-digest of transaction-hash or False if there is no validator.
         :rtype: str | bool
         """
 
         # Check if the block contains an important value
-        if not self.validator:
+        if not self.raw_validator:
             log_error('No validator found in block.')
             return False
 
-        return sha3_256((str(self.index) + self.version + str(self.timestamp) + str(self.base_fee) + str(self.tx_dict)
-                         + self.validator).encode()).hexdigest()
+        if self.cached_hash is None:
+            # Transactions are covered by the merkle-root and their count
+            self.cached_hash = block_hash(self.index, self.version, Timestamp(self.microseconds), self.base_fee,
+                                          self.merkle_root, len(self.tx), self.raw_validator)
+
+        return self.cached_hash
+
+    @property
+    def header(self) -> BlockHeader:
+        """Creates the header of the block (everything except the transactions).
+
+        :return: Header of the block.
+        :rtype: :py:class:`blockchain.header.BlockHeader`
+        """
+        header = BlockHeader(self.index, self.previous_hash, self.version, self.timestamp, self.base_fee,
+                             self.merkle_root, len(self.tx), self.validator, self.signature)
+
+        # Both hashes are calculated the same way
+        header.cached_hash = self.hash if self.validator else None
+
+        return header
 
     def sign_block(self, private_key: str):
         """Signs the block with the private-key of the validators keypair (The validator must be set).
@@ -137,13 +250,24 @@ class Block:
 
         return True
 
-    def is_valid(self, blockchain, in_chain=False) -> bool:
+    @property
+    def signature_items(self) -> list:
+        """Returns everything that is needed to verify the signatures of the validator and the transactions.
+
+        :return: Public-keys, signatures and the signed hashes.
+        :rtype: [ (str, str, str) ]
+        """
+        return [self.header.signature_item] + [tx.signature_item for tx in self.tx]
+
+    def is_valid(self, blockchain, in_chain=False, verify_signatures=True) -> bool:
         """Check if the block is valid.
 
         :param blockchain: The blockchain where the block is in or should go in.
         :type blockchain: :py:class:`blockchain.Blockchain`
         :param in_chain: Whether the block is already included or not.
         :type in_chain: bool
+        :param verify_signatures: Whether the signatures are verified (skipped if they were verified in a batch before).
+        :type verify_signatures: bool
 
         :return: Validity of block.
         :rtype: bool
@@ -154,68 +278,39 @@ class Block:
             # TODO -> Compare to the real genesis block
             return True
 
-        # Fetch the previous block
-        previous_block = blockchain.last_blocks[0]
-
-        if in_chain:
-            block_dict = blockchain.fetch_block(index=self.index - 1)
-
-            if block_dict:
-                previous_block = Block()
-                previous_block.from_dict(block_dict)
-
-        # Check if they could fetch the previous-block
-        if previous_block:
-            if previous_block.index == 1:
-                # TODO -> Check if previous block is the same as the genesis block
-                pass
-
-            else:
-                # Check if the previous hash matches with the previous blocks hash and compare the timestamps
-                if not self.previous_hash == previous_block.hash or self.timestamp < previous_block.timestamp:
-                    return False
-
-        # Check if version exists
-        if not blockchain.version_stamps[self.version]:
+        # Verify the signatures of the validator and of all transactions at once
+        if verify_signatures and not verifier.verify_all(self.signature_items):
             return False
 
-        # Check if version is allowed to use on this block
-        if (datetime.strptime(blockchain.version_stamps[self.version], '%Y-%m-%d %H:%M:%S.%f').replace(
-           tzinfo=timezone.utc) > self.timestamp):
+        # Check the links to the previous block, the version, the base-fee and the validator
+        if not self.header.is_valid(blockchain, in_chain=in_chain, verify_signature=False):
             return False
 
-        # Check if the block is from the future
-        if self.timestamp > datetime.now(timezone.utc) and in_chain:
-            return False
+        return self.valid_transactions(blockchain, in_chain, verify_signatures=False)
 
-        tx_len = 0
-        blocks_used = 0
+    def valid_transactions(self, blockchain, in_chain=False, verify_signatures=True) -> bool:
+        """Check if the transactions of the block are valid (the header is not checked).
 
-        # Fetch last 32 block dicts and add their tx-count
-        for x in range(self.index - 32, self.index):
-            if x < 1:
-                continue
-
-            # Fetch block from its index
-            block_dict = fetch_block(x)
+        :param blockchain: The blockchain where the block is in or should go in.
+        :type blockchain: :py:class:`blockchain.Blockchain`
+        :param in_chain: Whether the block is already included or not.
+        :type in_chain: bool
+        :param verify_signatures: Whether the signatures are verified (skipped if they were verified in a batch before).
+        :type verify_signatures: bool
 
-            # Set the values
-            tx_len += len(block_dict['tx'])
-            blocks_used += 1
+        :return: Validity of the transactions.
+        :rtype: bool
+        """
+        # Check if the block is the genesis block
+        if self.index == 1:
+            return True
 
-        if not self.base_fee == .000001 * 1.00001 ** (tx_len / (blocks_used if blocks_used > 0 else 1)):
+        # Verify the signatures of all transactions at once
+        if verify_signatures and not verifier.verify_all(tx.signature_item for tx in self.tx):
             return False
 
         # Check if transactions are valid
-        if not all([transaction.is_valid(blockchain, in_chain) for transaction in self.tx]):
-            return False
-
-        # Check if validators signature is valid
-        if not Wallet.valid_signature(self.validator, self.signature, self.hash):
-            return False
-
-        # Check if the validators stake is big enough
-        if not Wallet.stake(self.validator, blockchain, self.index - 1) >= 4_096:
+        if not all([transaction.is_valid(blockchain, in_chain, verify_signature=False) for transaction in self.tx]):
             return False
 
         return True
@@ -231,9 +326,10 @@ class Block:
             'previous_hash': self.previous_hash,
 
             'version': self.version,
-            'timestamp': str(self.timestamp),
+            'timestamp': format_timestamp(self.microseconds),
 
             'base_fee': self.base_fee,
+            'merkle_root': self.merkle_root,
             'tx': self.tx_dict,
 
             'hash': self.hash,
@@ -267,9 +363,8 @@ class Block:
             if not self.from_tx_dict(block_dict['tx']):
                 return False
 
-            # Create datetime-object from string
-            self.timestamp = datetime.strptime(block_dict['timestamp'], '%Y-%m-%d %H:%M:%S.%f%z').replace(
-                tzinfo=timezone.utc)
+            # Convert the timestamp from string
+            self.microseconds = parse_timestamp(block_dict['timestamp'])
 
             self.previous_hash = block_dict['previous_hash']
 
@@ -281,6 +376,10 @@ class Block:
             if 'signature' in block_dict:
                 self.signature = block_dict['signature']
 
+            # Check if the transactions match the merkle-root (blocks that were stored before it existed have none)
+            if block_dict.get('merkle_root') and not self.merkle_root == block_dict['merkle_root']:
+                return False
+
             # Check if the hashes are the same
             if block_dict['hash'] and not self.hash == block_dict['hash']:
                 return False
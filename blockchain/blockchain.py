@@ -1,4 +1,6 @@
 from logging import basicConfig, info as log_info, error as log_error, warning as log_warning
+from collections import deque
+from threading import Thread
 
 # Add to path
 from sys import path
@@ -8,40 +10,82 @@ path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 # Project modules
 from __init__ import __version__, LOG_LEVEL
+from accounts import verifier
 from blockchain.transaction import Transaction
 from blockchain.block import Block
-from util.database.blockchain import (add_block, fetch_block, fetch_transaction_block_index, fetch_transactions,
-                                      fetch_version_stamps, add_version_stamp)
-from util.database.cache import load_cache
+from blockchain.header import BASE_FEE_WINDOW, BlockHeader, calculate_base_fee, fetch_base_fee, valid_header_chain
+from blockchain.stake import StakeSnapshot
+from blockchain.audit import audit_chain
+from util.database.blockchain import (commit_block, CommitStatus, fetch_block, iter_blocks,
+                                      fetch_transaction_block_index, fetch_transactions, fetch_version_stamps,
+                                      add_version_stamp, fetch_tx_counts, fetch_header, fetch_headers,
+                                      fetch_validation_state, save_validation_state)
+from util.database.cache import BlockCache, CompressedBlockCache, load_cache
+from util.database.state import fetch_account_state, fetch_stake_lots, account_state_empty, rebuild_account_state
 from util.log.logger import init_logger
 
 handler = init_logger()
 basicConfig(level=LOG_LEVEL, handlers=[handler])
 
+# Amount of blocks whose signatures are verified together while the whole chain is checked
+VALIDATION_BATCH_SIZE = 256
+
 
 class Blockchain:
     def __init__(self, network='mainnet', genesis_block=None, genesis_tx: [Transaction] = None):
         # Set chain-versioning
+        self.network = network
         self.version = __version__
         self.version_stamps = fetch_version_stamps(network)
 
+        # Transaction counts of the last 32 blocks (the newest block last) and their sum for the base-fee
+        self.tx_counts = deque(maxlen=BASE_FEE_WINDOW)
+        self.tx_count_sum = 0
+
+        # Stakes and scores at the end of the last block (rebuilt once per block height)
+        self.stakes = None
+
+        # Older blocks that were fetched recently (kept compressed, behind the cache of the last blocks)
+        self.warm_blocks = CompressedBlockCache()
+
+        # Result of the last full audit (None while no audit finished)
+        self.audit_result = None
+
         # Check if a genesis-block was provided
         if genesis_block:
-            # Last block cache contains the last 100 blocks | Include genesis block into chain
-            self.last_blocks = [genesis_block]
+            # Last block cache contains the last blocks | Include genesis block into chain
+            self.last_blocks = BlockCache(blocks=[genesis_block])
 
         # Check if genesis-transactions were given
         elif genesis_tx:
             genesis_block = self.create_genesis(genesis_tx if genesis_tx else [])
 
-            # Last block cache contains the last 100 blocks | Include genesis block into chain
-            self.last_blocks = [genesis_block]
-            add_block(genesis_block.to_dict())
+            # Include genesis block into chain (a chain without its genesis block in the database is unusable)
+            status = commit_block(genesis_block.to_dict())
 
-        # Fetch last-blocks from database
+            if status is not CommitStatus.COMMITTED:
+                log_error(f'Genesis block could not be committed ({status.value})')
+
+                raise RuntimeError(f'genesis block could not be committed ({status.value})')
+
+            # Last block cache contains the last blocks
+            self.last_blocks = BlockCache(blocks=[genesis_block])
+
+        # Fetch last-blocks from database (loads the base-fee window as well)
         else:
             self.load_last_blocks()
 
+            # Build the account state of databases that were created before it existed
+            if account_state_empty():
+                log_info('Rebuilding account state...')
+
+                rebuild_account_state()
+
+        # A new chain only consists of its genesis block
+        if genesis_block:
+            self.tx_counts.append(len(genesis_block.tx))
+            self.tx_count_sum = len(genesis_block.tx)
+
     @property
     def is_valid(self) -> bool:
         """Check whether the blockchain is valid or not (Pretty important to make sure, that the block a node shares is
@@ -55,51 +99,227 @@ class Blockchain:
         if not self.valid_cache:
             return False
 
-        # Check if there are any blocks that are not cached
-        if self.last_blocks[-1].index - 1 > 1:
+        # Check if there are any blocks that are not cached (the genesis block is skipped)
+        if not self.valid_range(2, self.last_blocks[-1].index - 1):
+            return False
+
+        # The whole chain is valid up to its tip
+        save_validation_state(self.last_blocks[0].index, self.last_blocks[0].hash)
+
+        return True
+
+    def valid_since_watermark(self) -> bool:
+        """Check only the blocks that were added since the last successful validation (the whole chain is checked if
+           the last validated block changed).
+
+        :return: Status of the chain-validity
+        :rtype: bool
+        """
+        tip = self.last_blocks[0]
+        start = 2
+
+        watermark = fetch_validation_state()
+
+        # Continue after the watermark if its block is still the same
+        if watermark and watermark[0] <= tip.index:
+            header_dict = fetch_header(watermark[0])
+
+            if header_dict and header_dict['hash'] == watermark[1]:
+                start = watermark[0] + 1
+
+        # Blocks between the watermark and the cache come from the database
+        if not self.valid_range(start, self.last_blocks[-1].index - 1):
+            return False
+
+        # Cached blocks after the watermark (the first one is linked to the block before it)
+        if not self.valid_blocks([block for block in reversed(self.last_blocks) if block.index >= start]):
+            return False
 
-            # Go through all the blocks in the database
-            for x in range(1, self.last_blocks[-1].index - 1):
-                # Fetch dict-data of the block
-                block_data = fetch_block(x)
+        save_validation_state(tip.index, tip.hash)
 
-                # Check if the block could be fetched
-                if not block_data:
-                    # TODO -> Ask other nodes for block
+        return True
+
+    def valid_range(self, start: int, end: int) -> bool:
+        """Check the blocks of an index range from the database (in batches).
+
+        :param start: Index of the first block.
+        :type start: int
+        :param end: Index of the last block (included).
+        :type end: int
+
+        :return: Validity of the blocks (an empty range is valid).
+        :rtype: bool
+        """
+        # Check the links, base-fees and validators first, the transactions are only loaded for a valid header chain
+        if not self.valid_headers(start, end):
+            return False
+
+        expected_index = start
+        blocks = []
+
+        # Go through all the blocks in the database (chunk by chunk)
+        for block_data in iter_blocks(start, end):
+            # Check if a block is missing
+            if not block_data['index'] == expected_index:
+                # TODO -> Ask other nodes for block
+                return False
+
+            expected_index += 1
+
+            # Initialize block from the data and check if it was successful
+            block = Block(base_fee=False)
+
+            if not block.from_dict(block_data):
+                return False
+
+            blocks.append(block)
+
+            # Check the transactions in batches (the blocks have the same hashes as the validated headers)
+            if len(blocks) == VALIDATION_BATCH_SIZE:
+                if not self.valid_transactions(blocks):
                     return False
 
-                # Skip, if it is the genesis block
-                if block_data['index'] == 1:
-                    continue
+                blocks = []
 
-                # Initialize block from the data and check if it was successful
-                block = Block()
+        # Check the transactions of the last batch
+        if not self.valid_transactions(blocks):
+            return False
 
-                if not block.from_dict(block_data):
+        # Check if blocks are missing at the end of the range
+        if expected_index <= end:
+            return False
+
+        return True
+
+    def valid_headers(self, start: int, end: int) -> bool:
+        """Check the header chain of an index range from the database (in batches, without any transactions).
+
+        :param start: Index of the first block.
+        :type start: int
+        :param end: Index of the last block (included).
+        :type end: int
+
+        :return: Validity of the headers (an empty range is valid).
+        :rtype: bool
+        """
+        expected_index = start
+        previous_header = None
+
+        for batch_start in range(start, end + 1, VALIDATION_BATCH_SIZE):
+            headers = []
+
+            for header_dict in fetch_headers(batch_start, min(batch_start + VALIDATION_BATCH_SIZE - 1, end)):
+                # Check if a block is missing
+                if not header_dict['index'] == expected_index:
                     return False
 
-                # Check if the block and its transactions are valid
-                if not block.is_valid(self, in_chain=True):
-                    block.to_dict()
+                expected_index += 1
+
+                header = BlockHeader()
+
+                if not header.from_dict(header_dict):
                     return False
 
+                headers.append(header)
+
+            # The first header of a batch is linked to the last header of the batch before
+            if not valid_header_chain(headers, self, previous_header):
+                return False
+
+            previous_header = headers[-1] if headers else previous_header
+
+        # Check if blocks are missing at the end of the range
+        return expected_index > end
+
+    def audit(self) -> bool:
+        """Validates the whole chain from the genesis block in parallel processes (resets the watermark if the chain
+           is valid).
+
+        :return: Status of the chain-validity
+        :rtype: bool
+        """
+        # Check if there is anything to audit
+        if not self.last_blocks:
+            return True
+
+        # The audit covers at least the blocks up to the current tip
+        tip = self.last_blocks[0]
+
+        log_info('Auditing the whole chain...')
+
+        invalid_index = audit_chain(self.network)
+
+        if invalid_index is not None:
+            log_error(f'Chain audit failed! The chain is invalid from block {invalid_index} on')
+
+            self.audit_result = False
+
+            return False
+
+        save_validation_state(tip.index, tip.hash)
+
+        log_info('Chain audit finished, the chain is valid')
+
+        self.audit_result = True
+
         return True
 
+    def start_audit(self) -> Thread:
+        """Starts the full audit of the chain in the background (its result is kept in audit_result).
+
+        :return: Thread of the audit.
+        :rtype: :py:class:`threading.Thread`
+        """
+        thread = Thread(target=self.audit, daemon=True)
+        thread.start()
+
+        return thread
+
     @property
     def valid_cache(self) -> bool:
-        """Check whether the last 100 blocks are valid or not (Pretty important to make sure,
+        """Check whether the cached blocks are valid or not (Pretty important to make sure,
            that the block a node shares is valid).
 
-        :return: Status of the last 100 blocks-validity
+        :return: Status of the cached blocks-validity
         :rtype: bool
         """
 
         # Go through blocks and check their validity
-        if not all([block.is_valid(self, in_chain=True) for block in reversed(self.last_blocks)]):
+        if not self.valid_blocks(list(reversed(self.last_blocks))):
             return False
 
         return True
 
+    def valid_blocks(self, blocks: [Block]) -> bool:
+        """Check whether blocks of the chain are valid (the signatures of all blocks are verified in one batch).
+
+        :param blocks: Blocks to check.
+        :type blocks: [ :py:class:`blockchain.Block` ]
+
+        :return: Validity of all blocks.
+        :rtype: bool
+        """
+        # Verify all signatures in parallel (the genesis block has no real signatures)
+        if not verifier.verify_all(item for block in blocks if block.index > 1 for item in block.signature_items):
+            return False
+
+        return all(block.is_valid(self, in_chain=True, verify_signatures=False) for block in blocks)
+
+    def valid_transactions(self, blocks: [Block]) -> bool:
+        """Check whether the transactions of blocks of the chain are valid (their headers were checked before).
+
+        :param blocks: Blocks to check.
+        :type blocks: [ :py:class:`blockchain.Block` ]
+
+        :return: Validity of all transactions.
+        :rtype: bool
+        """
+        # Verify all signatures of the transactions in parallel (the genesis block has no real signatures)
+        if not verifier.verify_all(tx.signature_item for block in blocks if block.index > 1 for tx in block.tx):
+            return False
+
+        return all(block.valid_transactions(self, in_chain=True, verify_signatures=False) for block in blocks)
+
     @staticmethod
     def create_genesis(tx_data: [Transaction] = None):
         """Create the first block in the chain.
@@ -119,30 +339,73 @@ class Blockchain:
                                '00000000000000000000000000000000000000000')
 
     def load_last_blocks(self):
-        """Loads the cache (last 100 blocks) from the database.
+        """Loads the cache (last blocks) from the database.
 
         :return: Load was successful.
         :rtype: bool
         """
 
-        # Fetch last 100 blocks (or as much as there is) from the database
+        # Fetch the last blocks (or as much as there is) from the database
         new_cache = load_cache()
 
         # Something went wrong
         if not new_cache:
             return False
 
-        # Currently, there is nothing to cache
-        if new_cache is True:
-            self.last_blocks = []
-
-            return True
-
-        # Set the new cache
+        # Set the new cache (blocks of the warm tier could have been replaced in the meantime)
         self.last_blocks = new_cache
+        self.warm_blocks.clear()
+
+        # The window has to match the new tip
+        self.load_base_fee_window()
 
         return True
 
+    def load_base_fee_window(self):
+        """Loads the transaction counts of the last 32 blocks from the database.
+
+        """
+        tip = self.last_blocks[0].index if self.last_blocks else 0
+
+        self.tx_counts = deque(fetch_tx_counts(max(tip - BASE_FEE_WINDOW + 1, 1), tip), maxlen=BASE_FEE_WINDOW)
+        self.tx_count_sum = sum(self.tx_counts)
+
+    def base_fee_for(self, index: int) -> float:
+        """Returns the base-fee a block with the given index must have.
+
+        :param index: Index of the block.
+        :type index: int
+
+        :return: Base-fee of the block.
+        :rtype: float
+        """
+        # Blocks on top of the chain use the window, older blocks are calculated from the database
+        if self.last_blocks and index == self.last_blocks[0].index + 1:
+            return calculate_base_fee(self.tx_counts, self.tx_count_sum)
+
+        return fetch_base_fee(index)
+
+    def stake_snapshot(self, index: int = None) -> StakeSnapshot | None:
+        """Returns the stakes and scores at the end of a block (only the last block of the chain has a snapshot).
+
+        :param index: Index of the block (the last block if it is not set).
+        :type index: int | NoneType
+
+        :return: Snapshot of the block or None if the block is not the last one.
+        :rtype: :py:class:`blockchain.stake.StakeSnapshot` | NoneType
+        """
+        if not self.last_blocks or (index is not None and not index == self.last_blocks[0].index):
+            return None
+
+        snapshot = self.stakes
+
+        # Build the snapshot once per block height
+        if snapshot is None or not snapshot.index == self.last_blocks[0].index:
+            snapshot = StakeSnapshot.build(self.last_blocks[0])
+            self.stakes = snapshot
+
+        return snapshot
+
     def add_block(self, block: Block, genesis=False):
         """Adds block to the blockchain.
 
@@ -166,20 +429,30 @@ class Blockchain:
         if not block.is_valid(self):
             return False
 
-        # Add block to chain if it is not the genesis block
-        if not genesis:
-            self.last_blocks.insert(0, block)
-
         # Push block to database and check if it was successful
-        if not add_block(block.to_dict()):
-            # TODO -> Check why the operation failed
-            #         (because the data was wrong or the block is already included into the chain)
+        status = commit_block(block.to_dict())
+
+        if status is not CommitStatus.COMMITTED:
+            log_error(f'Block {block.index} could not be committed ({status.value})')
+
             return False
 
-        # Reduce all blocks in last-blocks cache, that are over the last 100
-        while len(self.last_blocks) > 100:
-            # Remove the last block from the caching-list
-            self.last_blocks.pop(len(self.last_blocks) - 1)
+        # Add block to chain if it is not the genesis block (only after it was committed, the oldest block leaves
+        # the cache)
+        if not genesis:
+            # The oldest block moves into the warm tier
+            if len(self.last_blocks) == self.last_blocks.size:
+                self.warm_blocks.put(self.last_blocks[-1])
+
+            self.last_blocks.add(block)
+            self.warm_blocks.discard(block.index)
+
+        # Move the base-fee window forward
+        if len(self.tx_counts) == BASE_FEE_WINDOW:
+            self.tx_count_sum -= self.tx_counts[0]
+
+        self.tx_counts.append(len(block.tx))
+        self.tx_count_sum += len(block.tx)
 
         return True
 
@@ -205,16 +478,11 @@ class Blockchain:
             if index > self.last_blocks[0].index:
                 return False
 
-            # Check if block is within the block cache
-            if index > self.last_blocks[-1].index:
-                # Go through the cache and find the block
-                block = [block if block.index == index else None for block in self.last_blocks]
-
-                if block:
-                    return block
+            # Check if block is within the block cache or in the warm tier
+            block = self.last_blocks.get(index) or self.warm_blocks.get(index)
 
-                else:
-                    log_error('Cache suffers from data loss')
+            if block and block.index == index:
+                return block
 
             # If not in cache fetch it from the database
             block_dict = fetch_block(index)
@@ -223,16 +491,15 @@ class Blockchain:
             if not block_dict:
                 return False
 
-            # Set block up
-            block_dict = fetch_block(index)
-
-            block = Block()
-            block.from_dict(block_dict)
+            # Set block up and check if it was successful
+            block = Block(base_fee=False)
 
-            # Check if the block was fetched successful
-            if not block:
+            if not block.from_dict(block_dict):
                 return False
 
+            # Keep it for the next time
+            self.warm_blocks.put(block)
+
             return block
 
         elif tx:
@@ -241,7 +508,7 @@ class Blockchain:
         return False
 
     @staticmethod
-    def fetch_transactions(public_key: str, tx_type: str = None, is_sender: bool = None):
+    def fetch_transactions(public_key: str, tx_type: str = None, is_sender: bool = None, max_block_index: int = None):
         """Fetch all transactions the account made in the past.
 
         :param public_key: Verifying key of the account.
@@ -250,11 +517,62 @@ class Blockchain:
         :type tx_type: str
         :param is_sender: If the account is the sender, the recipient or both.
         :type is_sender: bool | NoneType
+        :param max_block_index: The maximal index of the block to fetch transactions from.
+        :type max_block_index: int | NoneType
 
         :return: List of transactions the account made or received.
         :rtype: [ Transaction ]
         """
-        return fetch_transactions(public_key, tx_type, is_sender)
+        return fetch_transactions(public_key, tx_type, is_sender, max_block_index)
+
+    @staticmethod
+    def fetch_account_state(public_key: str, index: int = None) -> dict:
+        """Fetch the balance, stake and claims of an account.
+
+        :param public_key: Verifying key of the account.
+        :type public_key: str
+        :param index: Index of the block to use as last block (the current state if it is not set).
+        :type index: int | NoneType
+
+        :return: Balance, stake and claims of the account.
+        :rtype: dict
+        """
+        return fetch_account_state(public_key, index)
+
+    @staticmethod
+    def fetch_stake_lots(public_key: str) -> list:
+        """Fetch the staked amounts of an account, that were not unstaked yet.
+
+        :param public_key: Verifying key of the account.
+        :type public_key: str
+
+        :return: List of the staked amounts and their timestamps (in seconds), the oldest first.
+        :rtype: [ (float, float) ]
+        """
+        return fetch_stake_lots(public_key)
+
+    @property
+    def cache_stats(self) -> dict:
+        """Returns the statistics of both block caches.
+
+        :return: Blocks, hits, misses and hit-rate of the last blocks ('hot') and of the compressed blocks ('warm',
+                 including its memory).
+        :rtype: dict
+        """
+        lookups = self.last_blocks.hits + self.last_blocks.misses
+
+        return {
+            'hot': {
+                'blocks': len(self.last_blocks),
+                'size': self.last_blocks.size,
+
+                'hits': self.last_blocks.hits,
+                'misses': self.last_blocks.misses,
+                'hit_rate': self.last_blocks.hits / lookups if lookups else 0.
+            },
+
+            'warm': self.warm_blocks.stats
+        }
 
     def block_included(self, block: Block) -> bool:
         """Check whether the block is in the chain or not.
@@ -299,7 +617,7 @@ class Blockchain:
         """
 
         # Check if transaction is in block-cache
-        if any(tx in block.transactions for block in self.last_blocks):
+        if self.last_blocks.tx_block_index(tx.hash) is not None:
             return True
 
         # Check if transaction is in the database
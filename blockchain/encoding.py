@@ -0,0 +1,157 @@
+from datetime import datetime, timezone, timedelta
+from struct import pack
+
+# Start of the timestamps (they are encoded as microseconds since then)
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+# Type tags of the encoded fields
+TAG_NONE = b'N'
+TAG_INT = b'I'
+TAG_FLOAT = b'F'
+TAG_STR = b'S'
+TAG_BYTES = b'B'
+TAG_TIMESTAMP = b'T'
+TAG_LIST = b'L'
+
+
+def hex_bytes(value):
+    """Converts a hex-digest (keys, signatures and hashes) to its raw bytes, so that its encoding does not depend on
+       upper- or lowercase digits.
+
+    :param value: Hex-digest to convert.
+    :type value: str | bytes | NoneType
+
+    :return: Raw bytes of the hex-digest (other values are returned unchanged).
+    :rtype: bytes | str | NoneType
+    """
+    if not isinstance(value, str):
+        return value
+
+    # Values that are no hex-digest are encoded as text
+    try:
+        return bytes.fromhex(value)
+
+    except ValueError:
+        return value
+
+
+def bytes_hex(value):
+    """Converts raw bytes (keys, signatures and hashes) back to their hex-digest.
+
+    :param value: Raw bytes to convert.
+    :type value: bytes | str | NoneType
+
+    :return: Hex-digest of the bytes (other values are returned unchanged).
+    :rtype: str | NoneType
+    """
+    if not isinstance(value, bytes):
+        return value
+
+    return value.hex()
+
+
+class Timestamp(int):
+    """Microseconds since the epoch, that are encoded like the datetime they stand for."""
+
+
+def to_microseconds(value: datetime) -> int:
+    """Converts a datetime to the microseconds since the epoch.
+
+    :param value: Datetime to convert (naive datetimes are meant as UTC).
+    :type value: :py:class:`datetime.datetime`
+
+    :return: Microseconds since the epoch.
+    :rtype: int
+    """
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+
+    return (value - EPOCH) // timedelta(microseconds=1)
+
+
+def from_microseconds(microseconds: int) -> datetime:
+    """Converts microseconds since the epoch to a datetime (in UTC).
+
+    :param microseconds: Microseconds since the epoch.
+    :type microseconds: int
+
+    :return: Datetime of the microseconds.
+    :rtype: :py:class:`datetime.datetime`
+    """
+    return EPOCH + timedelta(microseconds=microseconds)
+
+
+def parse_timestamp(text: str) -> int:
+    """Converts the text of a timestamp (as it is stored and sent) to the microseconds since the epoch.
+
+    :param text: Timestamp in the format '%Y-%m-%d %H:%M:%S.%f%z'.
+    :type text: str
+
+    :return: Microseconds since the epoch.
+    :rtype: int
+    """
+    return to_microseconds(datetime.fromisoformat(text).replace(tzinfo=timezone.utc))
+
+
+def format_timestamp(microseconds: int) -> str:
+    """Converts microseconds since the epoch to the text of the timestamp (as it is stored and sent).
+
+    :param microseconds: Microseconds since the epoch.
+    :type microseconds: int
+
+    :return: Timestamp in the format '%Y-%m-%d %H:%M:%S.%f%z'.
+    :rtype: str
+    """
+    return str(from_microseconds(microseconds))
+
+
+def encode_field(value) -> bytes:
+    """Encodes one value as type-tag, length (4 bytes, big-endian) and payload.
+
+    :param value: Value to encode.
+    :type value: NoneType | int | float | str | bytes | datetime | Timestamp | list | tuple
+
+    :return: Canonical encoding of the value.
+    :rtype: bytes
+    """
+    if value is None:
+        tag, payload = TAG_NONE, b''
+
+    elif isinstance(value, Timestamp):
+        tag, payload = TAG_TIMESTAMP, value.to_bytes(8, 'big', signed=True)
+
+    elif isinstance(value, int):
+        tag, payload = TAG_INT, value.to_bytes((value.bit_length() + 8) // 8, 'big', signed=True)
+
+    elif isinstance(value, float):
+        tag, payload = TAG_FLOAT, pack('>d', value)
+
+    elif isinstance(value, str):
+        tag, payload = TAG_STR, value.encode('utf-8')
+
+    elif isinstance(value, bytes):
+        tag, payload = TAG_BYTES, value
+
+    elif isinstance(value, datetime):
+        # Naive timestamps are always meant as UTC
+        tag, payload = TAG_TIMESTAMP, to_microseconds(value).to_bytes(8, 'big', signed=True)
+
+    elif isinstance(value, (list, tuple)):
+        tag, payload = TAG_LIST, b''.join(encode_field(item) for item in value)
+
+    else:
+        raise TypeError(f'Can not encode value of type {type(value).__name__}')
+
+    return tag + len(payload).to_bytes(4, 'big') + payload
+
+
+def canonical_encoding(*fields) -> bytes:
+    """Encodes the fields of an object in the given order (the input of its hash).
+
+    :param fields: Values to encode.
+    :type fields: NoneType | int | float | str | bytes | datetime | list | tuple
+
+    :return: Canonical encoding of all fields.
+    :rtype: bytes
+    """
+    return b''.join(encode_field(field) for field in fields)
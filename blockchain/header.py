@@ -0,0 +1,328 @@
+# SHA256 hash-algorithm
+from hashlib import sha3_256
+
+from collections import deque
+from datetime import datetime, timezone
+
+# Add to path
+from sys import path
+from os.path import dirname, abspath, join
+
+path.insert(0, join(dirname(abspath(__file__)), '..'))
+
+# Project modules
+from __init__ import __version__
+from accounts import Wallet, verifier
+from blockchain.encoding import canonical_encoding, hex_bytes, from_microseconds, parse_timestamp
+from blockchain.merkle import EMPTY_ROOT
+from util.database.blockchain import fetch_header, fetch_tx_counts
+
+# Fields that are covered by the block-hash
+HASHED_FIELDS = ('index', 'version', 'timestamp', 'base_fee', 'merkle_root', 'tx_count', 'validator')
+
+# Amount of previous blocks whose transaction count sets the base-fee
+BASE_FEE_WINDOW = 32
+
+
+def calculate_base_fee(tx_counts, tx_count_sum: int = None) -> float:
+    """Calculates the base-fee from the transaction counts of the previous blocks.
+
+    :param tx_counts: Transaction counts of (up to) the last 32 blocks.
+    :type tx_counts: [ int ]
+    :param tx_count_sum: Sum of the transaction counts if it is kept up to date already (calculated if it is not set).
+    :type tx_count_sum: int | NoneType
+
+    :return: Base-fee of the next block.
+    :rtype: float
+    """
+    blocks_used = len(tx_counts)
+    tx_count_sum = sum(tx_counts) if tx_count_sum is None else tx_count_sum
+
+    #      min-fee * exp. growth^average tx count
+    return .000001 * 1.00001 ** (tx_count_sum / (blocks_used if blocks_used > 0 else 1))
+
+
+def fetch_base_fee(index: int) -> float:
+    """Calculates the base-fee of a block from the blocks in the database.
+
+    :param index: Index of the block.
+    :type index: int
+
+    :return: Base-fee of the block.
+    :rtype: float
+    """
+    return calculate_base_fee(fetch_tx_counts(max(index - BASE_FEE_WINDOW, 1), index - 1))
+
+
+def block_hash(index: int, version: str, timestamp: datetime, base_fee: float, merkle_root: str, tx_count: int,
+               validator: str) -> str:
+    """Calculates the hash of a block from its header-values with the SHA3_256 hash-algorithm.
+
+    :param index: Index of the block.
+    :type index: int
+    :param version: Version of the block.
+    :type version: str
+    :param timestamp: Creation time of the block.
+    :type timestamp: :py:class:`datetime.datetime`
+    :param base_fee: Base-fee of the block.
+    :type base_fee: float
+    :param merkle_root: Merkle-root of the transactions of the block.
+    :type merkle_root: str (hex-digest)
+    :param tx_count: Amount of transactions of the block.
+    :type tx_count: int
+    :param validator: The public key of the validator.
+    :type validator: str (hex-digest)
+
+    :return: Hex-digest of the block-hash.
+    :rtype: str (hex-digest)
+    """
+    return sha3_256(canonical_encoding(index, version, timestamp, float(base_fee), hex_bytes(merkle_root), tx_count,
+                                       hex_bytes(validator))).hexdigest()
+
+
+class BlockHeader:
+    def __init__(self, index=1, previous_hash='0000000000000000000000000000000000000000000000000000000000000000',
+                 version=__version__, timestamp=None, base_fee=1, merkle_root=EMPTY_ROOT, tx_count=0, validator=None,
+                 signature=None):
+        """Set the header-values up (everything of a block except its transactions).
+
+        :param index: Index of the block.
+        :type index: int
+        :param previous_hash: Hash of the previous block.
+        :type previous_hash: str (hex-digest)
+        :param version: Version of the block.
+        :type version: str
+        :param timestamp: Creation time of the block.
+        :type timestamp: :py:class:`datetime.datetime`
+        :param base_fee: Base-fee of the block.
+        :type base_fee: float
+        :param merkle_root: Merkle-root of the transactions of the block.
+        :type merkle_root: str (hex-digest)
+        :param tx_count: Amount of transactions of the block.
+        :type tx_count: int
+        :param validator: The public key of the validator.
+        :type validator: str (hex-digest)
+        :param signature: Signed hash with the private-key of the validator.
+        :type signature: str (hex-digest)
+        """
+        self.index = index
+        self.previous_hash = previous_hash
+
+        self.version = version
+        self.timestamp = timestamp if timestamp else datetime.now(timezone.utc)
+
+        self.base_fee = base_fee
+
+        self.merkle_root = merkle_root
+        self.tx_count = tx_count
+
+        self.validator = validator
+        self.signature = signature
+
+    def __setattr__(self, name, value):
+        """Sets an attribute and drops the cached hash if the attribute is covered by it.
+
+        """
+        if name in HASHED_FIELDS:
+            object.__setattr__(self, 'cached_hash', None)
+
+        object.__setattr__(self, name, value)
+
+    @property
+    def hash(self) -> str | bool:
+        """Calculates the hash of the block (cached until a hashed field changes).
+
+        :return: Hex-digest of the block-hash or False if there is no validator.
+        :rtype: str | bool
+        """
+        # Check if the header contains an important value
+        if not self.validator:
+            return False
+
+        if self.cached_hash is None:
+            self.cached_hash = block_hash(self.index, self.version, self.timestamp, self.base_fee, self.merkle_root,
+                                          self.tx_count, self.validator)
+
+        return self.cached_hash
+
+    @property
+    def signature_item(self) -> tuple:
+        """Returns everything that is needed to verify the signature of the validator.
+
+        :return: Public-key of the validator, signature and the signed hash.
+        :rtype: (str, str, str)
+        """
+        return self.validator, self.signature, self.hash
+
+    def is_valid(self, blockchain, previous_header=None, base_fee: float = None, in_chain=False,
+                 verify_signature=True) -> bool:
+        """Check if the header is valid (the transactions of the block are not checked).
+
+        :param blockchain: The blockchain where the block is in or should go in.
+        :type blockchain: :py:class:`blockchain.Blockchain`
+        :param previous_header: Header of the previous block (fetched from the chain if it is not set).
+        :type previous_header: :py:class:`blockchain.header.BlockHeader` | NoneType
+        :param base_fee: Expected base-fee (calculated from the chain if it is not set).
+        :type base_fee: float | NoneType
+        :param in_chain: Whether the block is already included or not.
+        :type in_chain: bool
+        :param verify_signature: Whether the signature is verified (skipped if it was verified in a batch before).
+        :type verify_signature: bool
+
+        :return: Validity of the header.
+        :rtype: bool
+        """
+
+        # Check if the block is the genesis block
+        if self.index == 1:
+            # TODO -> Compare to the real genesis block
+            return True
+
+        # Fetch the previous header
+        if previous_header is None and in_chain:
+            header_dict = fetch_header(self.index - 1)
+
+            if header_dict:
+                previous_header = BlockHeader()
+                previous_header.from_dict(header_dict)
+
+        elif previous_header is None and blockchain.last_blocks:
+            previous_header = blockchain.last_blocks[0].header
+
+        # Check if they could fetch the previous header
+        if previous_header:
+            if not previous_header.index == self.index - 1:
+                return False
+
+            if previous_header.index == 1:
+                # TODO -> Check if previous block is the same as the genesis block
+                pass
+
+            else:
+                # Check if the previous hash matches with the previous blocks hash and compare the timestamps
+                if not self.previous_hash == previous_header.hash or self.timestamp < previous_header.timestamp:
+                    return False
+
+        # Check if version exists
+        if not blockchain.version_stamps.get(self.version):
+            return False
+
+        # Check if version is allowed to use on this block
+        if (datetime.strptime(blockchain.version_stamps[self.version], '%Y-%m-%d %H:%M:%S.%f').replace(
+           tzinfo=timezone.utc) > self.timestamp):
+            return False
+
+        # Check if the block is from the future
+        if self.timestamp > datetime.now(timezone.utc) and in_chain:
+            return False
+
+        # Check if the base-fee matches the transaction counts of the previous blocks
+        if not self.base_fee == (base_fee if base_fee is not None else blockchain.base_fee_for(self.index)):
+            return False
+
+        # Check if validators signature is valid
+        if verify_signature and not Wallet.valid_signature(*self.signature_item):
+            return False
+
+        # Check if the validators stake is big enough (blocks on top of the chain use the stake snapshot)
+        snapshot = blockchain.stake_snapshot(self.index - 1)
+
+        stake = snapshot.stake(self.validator) if snapshot else Wallet.stake(self.validator, blockchain, self.index - 1)
+
+        if not stake >= 4_096:
+            return False
+
+        return True
+
+    def to_dict(self) -> dict:
+        """Creates dictionary from header-information.
+
+        :return: Header in dict-format
+        :rtype: dict
+        """
+        return {
+            'index': self.index,
+            'previous_hash': self.previous_hash,
+
+            'version': self.version,
+            'timestamp': str(self.timestamp),
+
+            'base_fee': self.base_fee,
+
+            'merkle_root': self.merkle_root,
+            'tx_count': self.tx_count,
+
+            'hash': self.hash,
+            'validator': self.validator,
+            'signature': self.signature
+        }
+
+    def from_dict(self, header_dict) -> bool:
+        """Set header-data from dictionary.
+
+        :param header_dict: Information of the header.
+        :type header_dict: dict
+
+        :return: A status whether the data-load was successful or not
+        :rtype: bool
+        """
+        try:
+            self.index = header_dict['index']
+            self.previous_hash = header_dict['previous_hash']
+
+            self.version = header_dict['version']
+            self.timestamp = from_microseconds(parse_timestamp(header_dict['timestamp']))
+
+            self.base_fee = header_dict['base_fee']
+
+            self.merkle_root = header_dict['merkle_root']
+            self.tx_count = header_dict['tx_count']
+
+            self.validator = header_dict['validator']
+            self.signature = header_dict['signature']
+
+            # Check if the hashes are the same
+            if header_dict['hash'] and not self.hash == header_dict['hash']:
+                return False
+
+        # An error occurred while assigning data
+        except:
+            return False
+
+        return True
+
+
+def valid_header_chain(headers: list, blockchain, previous_header: BlockHeader = None) -> bool:
+    """Check if consecutive headers form a valid chain without touching any transactions.
+
+    :param headers: Headers to check (ordered by their index).
+    :type headers: [ :py:class:`blockchain.header.BlockHeader` ]
+    :param blockchain: The blockchain the headers belong to.
+    :type blockchain: :py:class:`blockchain.Blockchain`
+    :param previous_header: Header before the first one (fetched from the database if it is not set).
+    :type previous_header: :py:class:`blockchain.header.BlockHeader` | NoneType
+
+    :return: Validity of the header chain.
+    :rtype: bool
+    """
+    # Check if there is nothing to validate
+    if not headers:
+        return True
+
+    # The base-fee window starts with the blocks before the first header and moves along the headers
+    tx_counts = deque(fetch_tx_counts(max(headers[0].index - BASE_FEE_WINDOW, 1), headers[0].index - 1),
+                      maxlen=BASE_FEE_WINDOW)
+
+    # Verify the signatures of all headers at once
+    if not verifier.verify_all(header.signature_item for header in headers if header.index > 1):
+        return False
+
+    for header in headers:
+        if not header.is_valid(blockchain, previous_header, calculate_base_fee(tx_counts), in_chain=True,
+                               verify_signature=False):
+            return False
+
+        tx_counts.append(header.tx_count)
+        previous_header = header
+
+    return True
@@ -0,0 +1,141 @@
+from hashlib import sha3_256
+
+# Add to path
+from sys import path
+from os.path import dirname, abspath, join
+
+path.insert(0, join(dirname(abspath(__file__)), '..'))
+
+from blockchain.encoding import canonical_encoding, hex_bytes
+
+# Prefixes that separate the hashes of leaves from the hashes of inner nodes (a leaf can not pose as a subtree)
+LEAF_PREFIX = b'\x00'
+NODE_PREFIX = b'\x01'
+
+# Root of a block without transactions
+EMPTY_ROOT = '0' * 64
+
+
+def hash_leaf(tx_hash: str, signature: str | None) -> bytes:
+    """Hashes a transaction into a leaf of the merkle-tree (the transaction-hash does not cover the signature, so the
+       signature is committed to as well and can not be swapped without changing the root).
+
+    :param tx_hash: Hex-digest of the transaction-hash.
+    :type tx_hash: str
+    :param signature: Hex-digest of the signature of the transaction.
+    :type signature: str | NoneType
+
+    :return: Hash of the leaf.
+    :rtype: bytes
+    """
+    return sha3_256(LEAF_PREFIX + canonical_encoding(bytes.fromhex(tx_hash), hex_bytes(signature))).digest()
+
+
+def hash_node(left: bytes, right: bytes) -> bytes:
+    """Hashes two nodes of the merkle-tree into their parent node.
+
+    :param left: Hash of the left node.
+    :type left: bytes
+    :param right: Hash of the right node.
+    :type right: bytes
+
+    :return: Hash of the parent node.
+    :rtype: bytes
+    """
+    return sha3_256(NODE_PREFIX + left + right).digest()
+
+
+def next_level(level: list) -> list:
+    """Hashes the nodes of a tree-level pairwise (a node without partner is moved up unchanged).
+
+    :param level: Hashes of the nodes of one level.
+    :type level: [ bytes ]
+
+    :return: Hashes of the nodes of the level above.
+    :rtype: [ bytes ]
+    """
+    parents = [hash_node(level[position], level[position + 1]) for position in range(0, len(level) - 1, 2)]
+
+    if len(level) % 2:
+        parents.append(level[-1])
+
+    return parents
+
+
+def merkle_root(leaves: list) -> str:
+    """Calculates the merkle-root over the transactions of a block.
+
+    :param leaves: Hex-digests of the transaction-hashes and signatures (in the order of the block).
+    :type leaves: [ (str, str) ]
+
+    :return: Hex-digest of the merkle-root.
+    :rtype: str
+    """
+    # Check if the block has no transactions
+    if not leaves:
+        return EMPTY_ROOT
+
+    level = [hash_leaf(tx_hash, signature) for tx_hash, signature in leaves]
+
+    while len(level) > 1:
+        level = next_level(level)
+
+    return level[0].hex()
+
+
+def merkle_proof(leaves: list, position: int) -> list:
+    """Creates the inclusion proof of one transaction (the siblings on the path from its leaf up to the root).
+
+    :param leaves: Hex-digests of the transaction-hashes and signatures (in the order of the block).
+    :type leaves: [ (str, str) ]
+    :param position: Position of the transaction in the block.
+    :type position: int
+
+    :return: Hex-digests of the siblings and whether they are the left node, or False if the position does not exist.
+    :rtype: [ (str, bool) ] | bool
+    """
+    if not 0 <= position < len(leaves):
+        return False
+
+    level = [hash_leaf(tx_hash, signature) for tx_hash, signature in leaves]
+    proof = []
+
+    while len(level) > 1:
+        sibling = position ^ 1
+
+        # Nodes without partner are moved up without a proof-step
+        if sibling < len(level):
+            proof.append((level[sibling].hex(), sibling < position))
+
+        level = next_level(level)
+        position //= 2
+
+    return proof
+
+
+def verify_merkle_proof(tx_hash: str, signature: str, proof: list, root: str) -> bool:
+    """Check if a transaction is included into the block with the given merkle-root.
+
+    :param tx_hash: Hex-digest of the transaction-hash.
+    :type tx_hash: str
+    :param signature: Hex-digest of the signature of the transaction.
+    :type signature: str
+    :param proof: Hex-digests of the siblings and whether they are the left node.
+    :type proof: [ (str, bool) ]
+    :param root: Hex-digest of the merkle-root of the block.
+    :type root: str
+
+    :return: Validity of the proof.
+    :rtype: bool
+    """
+    try:
+        node = hash_leaf(tx_hash, signature)
+
+        for sibling, is_left in proof:
+            node = hash_node(bytes.fromhex(sibling), node) if is_left else hash_node(node, bytes.fromhex(sibling))
+
+    # Hashes that are no hex-digests can not be part of a valid proof
+    except ValueError:
+        return False
+
+    return node.hex() == root
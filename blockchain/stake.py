@@ -0,0 +1,69 @@
+# Add to path
+from sys import path
+from os.path import dirname, abspath, join
+
+path.insert(0, join(dirname(abspath(__file__)), '..'))
+
+# Project modules
+from accounts import Wallet
+from util.database.state import fetch_all_stakes
+
+
+class StakeSnapshot:
+    def __init__(self, index: int, timestamp: float, stakes: dict, lots: dict):
+        """Stake and staking score of every validator at the end of one block.
+
+        :param index: Index of the block the snapshot belongs to.
+        :type index: int
+        :param timestamp: Timestamp (in seconds) of the block (the coin age is calculated for it, so that all nodes
+                          get the same scores).
+        :type timestamp: float
+        :param stakes: Stakes by public-key.
+        :type stakes: dict
+        :param lots: Staked amounts and their timestamps (in seconds) by public-key.
+        :type lots: dict
+        """
+        self.index = index
+        self.timestamp = timestamp
+
+        self.stakes = stakes
+
+        # Scores are calculated once for every account that has stake-lots
+        self.scores = {public_key: Wallet.score_lots(stakes_lots, timestamp) for public_key, stakes_lots in
+                       lots.items()}
+
+    @classmethod
+    def build(cls, block):
+        """Creates the snapshot of the last block of the chain from the account state.
+
+        :param block: Last block of the chain.
+        :type block: :py:class:`blockchain.Block`
+
+        :return: Snapshot of the block.
+        :rtype: :py:class:`blockchain.stake.StakeSnapshot`
+        """
+        stakes, lots = fetch_all_stakes()
+
+        return cls(block.index, block.timestamp.timestamp(), stakes, lots)
+
+    def stake(self, public_key: str) -> float:
+        """Returns the stake of an account.
+
+        :param public_key: Public-key of the account.
+        :type public_key: str
+
+        :return: Staked coins.
+        :rtype: float
+        """
+        return self.stakes.get(public_key, 0)
+
+    def score(self, public_key: str) -> float:
+        """Returns the staking score of an account.
+
+        :param public_key: Public-key of the account.
+        :type public_key: str
+
+        :return: Staking score.
+        :rtype: float
+        """
+        return self.scores.get(public_key, 0)
@@ -1,5 +1,6 @@
 from hashlib import sha3_256
-from datetime import datetime, timezone
+from datetime import datetime
+from time import time_ns
 import json
 
 # Add to path
@@ -10,9 +11,20 @@ path.insert(0, os.path.join(os.getcwd(), '..'))
 
 # Wallet
 from accounts import Wallet
+from blockchain.encoding import (canonical_encoding, hex_bytes, bytes_hex, Timestamp, to_microseconds,
+                                 from_microseconds, parse_timestamp, format_timestamp)
+
+# Fields that are covered by the transaction-hash (and the slots they are stored in)
+HASHED_FIELDS = ('sender', 'recipient', 'amount', 'fee', 'type', 'timestamp', 'raw_sender', 'raw_recipient',
+                 'microseconds')
 
 
 class Transaction:
+    # Keys and the signature are stored as raw bytes and the timestamp as microseconds since the epoch (hex-digests
+    # and datetimes are only created when they are read)
+    __slots__ = ('raw_sender', 'raw_recipient', 'amount', 'fee', 'type', 'raw_signature', 'microseconds',
+                 'cached_hash')
+
     def __init__(self, sender, recipient, amount: float, fee: float = 0, tx_type='tx', tip: float = 0):
         """Set the transaction-values up.
 
@@ -50,17 +62,103 @@ class Transaction:
         self.signature = None
 
         # Add a timestamp
-        self.timestamp = datetime.now(timezone.utc)
+        self.microseconds = time_ns() // 1_000
+
+    def __setattr__(self, name, value):
+        """Sets an attribute and drops the cached hash if the attribute is covered by it.
+
+        """
+        if name in HASHED_FIELDS:
+            object.__setattr__(self, 'cached_hash', None)
+
+        object.__setattr__(self, name, value)
+
+    def __getstate__(self) -> tuple:
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state: tuple):
+        # Restore the slots as they were (the cached hash stays valid)
+        for name, value in zip(self.__slots__, state):
+            object.__setattr__(self, name, value)
+
+    @property
+    def sender(self) -> str:
+        """Returns the public-key of the sender.
+
+        :return: Hex-digest of the public-key.
+        :rtype: str (hex-digest)
+        """
+        return bytes_hex(self.raw_sender)
+
+    @sender.setter
+    def sender(self, value):
+        self.raw_sender = hex_bytes(value)
+
+    @property
+    def recipient(self) -> str:
+        """Returns the public-key of the recipient.
+
+        :return: Hex-digest of the public-key.
+        :rtype: str (hex-digest)
+        """
+        return bytes_hex(self.raw_recipient)
+
+    @recipient.setter
+    def recipient(self, value):
+        self.raw_recipient = hex_bytes(value)
+
+    @property
+    def signature(self) -> str | None:
+        """Returns the signature of the transaction.
+
+        :return: Hex-digest of the signature or None if the transaction is not signed.
+        :rtype: str (hex-digest) | NoneType
+        """
+        return bytes_hex(self.raw_signature)
+
+    @signature.setter
+    def signature(self, value):
+        self.raw_signature = hex_bytes(value)
+
+    @property
+    def timestamp(self) -> datetime:
+        """Returns the creation time of the transaction.
+
+        :return: Timestamp of the transaction (in UTC).
+        :rtype: :py:class:`datetime.datetime`
+        """
+        return from_microseconds(self.microseconds)
+
+    @timestamp.setter
+    def timestamp(self, value):
+        self.microseconds = value if isinstance(value, int) else to_microseconds(value)
 
     @property
     def hash(self) -> str:
-        """Calculates the hash of the transaction with the SHA3-256 hash-algorithm.
+        """Calculates the hash of the transaction with the SHA3-256 hash-algorithm (cached until a hashed field
+           changes).
 
         :return: Hex-digest of transaction-hash
         :rtype: str (hex-digest)
         """
-        return sha3_256((str(self.sender) + str(self.recipient) + str(float(self.amount)) + str(float(self.fee)) +
-                         str(self.type) + str(self.timestamp)).encode()).hexdigest()
+        if self.cached_hash is None:
+            self.cached_hash = sha3_256(canonical_encoding(self.raw_sender, self.raw_recipient, float(self.amount),
+                                                           float(self.fee), self.type,
+                                                           Timestamp(self.microseconds))).hexdigest()
+
+        return self.cached_hash
+
+    @property
+    def signature_item(self) -> tuple:
+        """Returns everything that is needed to verify the signature of the transaction.
+
+        :return: Verifying-key, signature and the signed hash.
+        :rtype: (str, str, str)
+        """
+        # Burn transactions are signed by the recipient
+        verifying_key = self.recipient if self.type == 'burn' else self.sender
+
+        return verifying_key, self.signature, self.hash
 
     def sign_tx(self, private_key):
         """Signs the transaction with the private-key of the keypair (in most cases the private-key of the sender)
@@ -97,13 +195,15 @@ class Transaction:
 
         return True
 
-    def is_valid(self, blockchain, in_chain=False) -> bool:
+    def is_valid(self, blockchain, in_chain=False, verify_signature=True) -> bool:
         """Check if transactions-signature is valid.
 
         :param blockchain: The blockchain where the transaction should go in.
         :type blockchain: :py:class:`blockchain.Blockchain`
         :param in_chain: If the transaction is already in the chain.
         :type in_chain: bool
+        :param verify_signature: Whether the signature is verified (skipped if it was verified in a batch before).
+        :type verify_signature: bool
 
         :return: Validity of transaction and its signature.
         :rtype: bool
@@ -117,23 +217,17 @@ class Transaction:
         if not self.signature:
             return False
 
-        # Set the verifying-key for signature-validity check
-        verifying_key = self.sender
-
-        if self.type == 'burn':
-            verifying_key = self.recipient
-
         # Check if the transaction type is wrong
         if (not self.type == 'tx' and not self.type == 'stake' and not self.type == 'unstake'
             and not self.type == 'claim'):
             return False
 
         # Check if the signature is valid
-        if not Wallet.valid_signature(verifying_key, self.signature, self.hash):
+        if verify_signature and not Wallet.valid_signature(*self.signature_item):
             return False
 
         # Check if transaction is signed for the future
-        if self.timestamp > datetime.now(timezone.utc):
+        if self.microseconds > time_ns() // 1_000:
             return False
 
         # Only for not in-chain transactions
@@ -161,7 +255,7 @@ class Transaction:
             'fee': self.fee,
 
             'type': self.type,
-            'timestamp': str(self.timestamp),
+            'timestamp': format_timestamp(self.microseconds),
 
             'hash': self.hash,
             'signature': self.signature
@@ -188,8 +282,7 @@ class Transaction:
             if dict_data['signature']:
                 self.signature = dict_data['signature']
 
-            self.timestamp = datetime.strptime(dict_data['timestamp'], '%Y-%m-%d %H:%M:%S.%f%z').replace(
-                                               tzinfo=timezone.utc)
+            self.microseconds = parse_timestamp(dict_data['timestamp'])
 
         # Return the status
         except:
@@ -29,6 +29,7 @@ from blockchain.transaction import Transaction
 
 from accounts.account import Account
 from util.database.database import Database
+from util.database.state import rebuild_account_state
 
 
 def handle_input():
@@ -419,6 +420,33 @@ def handle_input():
             # TODO -> Import blockchain-data from sqlite-file
             pass
 
+    elif cmd == 'database':
+        if cmd_opt == 'rebuild-state':
+            print('Rebuilding account state...')
+
+            # Replay all transactions of the chain
+            if not rebuild_account_state():
+                print('Failed to rebuild account state')
+
+                return False
+
+            print('Account state rebuilt successfully')
+
+            return True
+
+        elif cmd_opt == 'audit':
+            print('Auditing the chain...')
+
+            # Validate every block of the chain (the first invalid block is logged)
+            if not Blockchain().audit():
+                print('The chain is invalid')
+
+                return False
+
+            print('The chain is valid')
+
+            return True
+
     elif cmd == 'transaction':
         while True:
             account = fetch_account()
@@ -1,7 +1,6 @@
 from threading import Thread, Event
 from zmq import Context, REQ
 from requests import get
-from time import sleep as time_sleep
 import json
 
 # Add to path
@@ -44,8 +43,8 @@ class Client:
         :return: Status if the message was sent successfully.
         :rtype: bool
         """
-        # Check if database is running
-        if not self.thread.is_alive():
+        # Check if the client was stopped
+        if self.stop_event.is_set():
             return False
 
         # Check if there are nodes to send to
@@ -67,6 +66,26 @@ class Client:
 
         :return: None
         """
+        if not self.connect_nodes():
+            return False
+
+        # Run the node client
+        while not self.stop_event.is_set():
+            # Check if the list of connected nodes is empty
+            if self.connected_nodes:
+                self.keep_alive()
+
+            # Sleep for a while (stopping wakes the client up)
+            self.stop_event.wait(20)
+
+        self.disconnect_nodes()
+
+    def connect_nodes(self) -> bool:
+        """Connects to all known nodes.
+
+        :return: Whether there were known nodes or not.
+        :rtype: bool
+        """
         # Fetch known nodes
         known_nodes = fetch_known_nodes()
 
@@ -99,41 +118,41 @@ class Client:
                 # Dev log
                 print(f'Failed to connect to node {node[0]}:{node[1]}')
 
-        # Run the node client
-        while not self.stop_event.is_set():
-            # Check if the list of connected nodes is empty
-            if not self.connected_nodes:
-                # Sleep
-                time_sleep(20)
+        return True
 
-                continue
+    def keep_alive(self):
+        """Sends a keep alive message to the connected nodes.
 
-            # Send keep alive message
-            try:
-                self.socket.send(json.dumps({'type': 'keep_alive', 'data': None}))
+        """
+        try:
+            self.socket.send(json.dumps({'type': 'keep_alive', 'data': None}))
 
-                # Receive response
-                response = self.socket.recv()
+            # Receive response
+            response = self.socket.recv()
 
-                if not response:
-                    # Dev log
-                    print('No response from the nodes')
-            except:
+            if not response:
                 # Dev log
-                print('Failed to send keep alive message to node')
+                print('No response from the nodes')
+        except:
+            # Dev log
+            print('Failed to send keep alive message to node')
 
-            # Sleep for a while
-            time_sleep(20)
+    def disconnect_nodes(self):
+        """Disconnects from all connected nodes.
 
+        """
         # Dev log
         print('Disconnecting from nodes')
 
         # Disconnect from all nodes
         try:
-            iter(self.socket.disconnect(f'tcp://{node[0]}:{node[1]}') for node in self.connected_nodes)
+            for node in self.connected_nodes:
+                self.socket.disconnect(f'tcp://{node[0]}:{node[1]}')
         except:
             pass
 
+        self.connected_nodes = []
+
     def start(self):
         """Starts the node server thread.
 
@@ -184,9 +203,8 @@ class Client:
         # Stop the processor
         self.stop()
 
-        # Wait until stop is injected
-        while self.thread.is_alive():
-            time_sleep(.01)
+        # Wait until the thread has finished
+        self.thread.join()
 
         # Start the processor
         self.start()
@@ -4,7 +4,6 @@ from queue import Queue
 from zmq import Context, REP
 from requests import get
 
-from time import sleep as time_sleep
 import json
 
 # Add to path
@@ -55,7 +54,7 @@ class Server:
         self.stop_event = Event()
 
         # Messages that are already broadcast
-        self.broadcast_messages = []
+        self.broadcasted_messages = []
 
         if start:
             self.start()
@@ -89,26 +88,33 @@ class Server:
             # Wait for a request
             message = self.socket.recv()
 
-            # Handle the request
-            response, broadcast_message = self.handle_request(message)
+            # Send the response (the next recv blocks until a request arrives)
+            self.socket.send(self.reply(message))
 
-            # Check if the request should be broadcast
-            if broadcast_message and message not in self.broadcasted_messages:
-                success = self.broadcast(message)
+    def reply(self, message: bytes) -> bytes:
+        """Handles a request and broadcasts it to the other nodes if it is new.
 
-                # Check if the broadcast was successful
-                if not success:
-                    # Dev log
-                    print('Failed to broadcast message')
+        :param message: Clients message.
+        :type message: bytes
+
+        :return: Response to the client.
+        :rtype: bytes
+        """
+        response, broadcast_message = self.handle_request(message)
 
-                # Add the message to the list of broadcasted messages
-                self.broadcasted_messages.append(message)
+        # Check if the request should be broadcast
+        if broadcast_message and message not in self.broadcasted_messages:
+            success = self.broadcast(message)
 
-            # Send the response
-            self.socket.send(response)
+            # Check if the broadcast was successful
+            if not success:
+                # Dev log
+                print('Failed to broadcast message')
+
+            # Add the message to the list of broadcasted messages
+            self.broadcasted_messages.append(message)
 
-            # Sleep for a while
-            time_sleep(.025)
+        return response
 
     def handle_request(self, message):
         """Handles the request.
@@ -141,7 +147,7 @@ class Server:
         # Handle the request
         if message['type'] == 'temp_block':
             # Fetch the block data from the dictionary
-            block = Block()
+            block = Block(base_fee=False)
             success = block.from_json(message['data'])
 
             # Check if the block was successfully created
@@ -149,13 +155,13 @@ class Server:
                 return json.dumps({'success': False}).encode('utf-8'), False
 
             # Put the block into the input queue
-            self.processor_queue.put({'type': 'temp_block', 'data': block})
+            self.processor_queue.put_nowait({'type': 'temp_block', 'data': block})
 
             return json.dumps({'success': True}).encode('utf-8'), True
 
         elif message['type'] == 'winner_block':
             # Fetch the block data from the dictionary
-            block = Block()
+            block = Block(base_fee=False)
             success = block.from_json(message['data'])
 
             # Check if the block was successfully created
@@ -163,7 +169,7 @@ class Server:
                 return json.dumps({'success': False}).encode('utf-8'), False
 
             # Put the block into the input queue
-            self.processor_queue.put({'type': 'winner_block', 'data': block})
+            self.processor_queue.put_nowait({'type': 'winner_block', 'data': block})
 
             return json.dumps({'success': True}).encode('utf-8'), True
 
@@ -177,7 +183,7 @@ class Server:
                 return json.dumps({'success': False}).encode('utf-8'), False
 
             # Put the transaction into the input queue
-            self.processor_queue.put({'type': 'tx', 'data': tx})
+            self.processor_queue.put_nowait({'type': 'tx', 'data': tx})
 
             return json.dumps({'success': True}).encode('utf-8'), True
 
@@ -206,6 +212,8 @@ class Server:
             self.blockchain.add_version_stamp(data['timestamp'], data['version'], data['network'], data['public_key'],
                                               data['signature'], db_q=self.database.db_q)
 
+            return json.dumps({'success': True}).encode('utf-8'), True
+
         else:
             return json.dumps({'success': False}).encode('utf-8'), False
 
@@ -263,9 +271,8 @@ class Server:
         # Stop the processor
         self.stop()
 
-        # Wait until stop is injected
-        while self.thread.is_alive():
-            time_sleep(.01)
+        # Wait until the thread has finished
+        self.thread.join()
 
         # Start the processor
         self.start()
@@ -14,7 +14,7 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x10\x62lockchain.proto\x12\nblockchain\"\x97\x02\n\x0c\x42lockRequest\x12\x12\n\x05index\x18\x01 \x01(\x03H\x00\x88\x01\x01\x12\x19\n\x0cpreviousHash\x18\x02 \x01(\tH\x01\x88\x01\x01\x12\x16\n\ttimestamp\x18\x04 \x01(\tH\x02\x88\x01\x01\x12(\n\x02tx\x18\x06 \x01(\x0b\x32\x17.blockchain.TransactionH\x03\x88\x01\x01\x12\x11\n\x04hash\x18\x07 \x01(\tH\x04\x88\x01\x01\x12\x16\n\tvalidator\x18\x08 \x01(\tH\x05\x88\x01\x01\x12\x16\n\tsignature\x18\t \x01(\tH\x06\x88\x01\x01\x42\x08\n\x06_indexB\x0f\n\r_previousHashB\x0c\n\n_timestampB\x05\n\x03_txB\x07\n\x05_hashB\x0c\n\n_validatorB\x0c\n\n_signature\"\xc2\x01\n\x12TransactionRequest\x12\x13\n\x06sender\x18\x01 \x01(\tH\x00\x88\x01\x01\x12\x16\n\trecipient\x18\x02 \x01(\tH\x01\x88\x01\x01\x12\x16\n\ttimestamp\x18\x06 \x01(\tH\x02\x88\x01\x01\x12\x11\n\x04hash\x18\x07 \x01(\tH\x03\x88\x01\x01\x12\x16\n\tsignature\x18\x08 \x01(\tH\x04\x88\x01\x01\x42\t\n\x07_senderB\x0c\n\n_recipientB\x0c\n\n_timestampB\x07\n\x05_hashB\x0c\n\n_signature\"\x8f\x01\n\x0bTransaction\x12\x0e\n\x06sender\x18\x01 \x01(\t\x12\x11\n\trecipient\x18\x02 \x01(\t\x12\x0e\n\x06\x61mount\x18\x03 \x01(\x01\x12\x0b\n\x03\x66\x65\x65\x18\x04 \x01(\x01\x12\x0c\n\x04type\x18\x05 \x01(\t\x12\x11\n\ttimestamp\x18\x06 \x01(\t\x12\x0c\n\x04hash\x18\x07 \x01(\t\x12\x11\n\tsignature\x18\x08 \x01(\t\"3\n\x0cTransactions\x12#\n\x02tx\x18\x01 \x03(\x0b\x32\x17.blockchain.Transaction\"\xba\x01\n\x05\x42lock\x12\r\n\x05index\x18\x01 \x01(\x03\x12\x14\n\x0cpreviousHash\x18\x02 \x01(\t\x12\x0f\n\x07version\x18\x03 \x01(\t\x12\x11\n\ttimestamp\x18\x04 \x01(\t\x12\x0f\n\x07\x62\x61seFee\x18\x05 \x01(\r\x12#\n\x02tx\x18\x06 \x03(\x0b\x32\x17.blockchain.Transaction\x12\x0c\n\x04hash\x18\x07 \x01(\t\x12\x11\n\tvalidator\x18\x08 \x01(\t\x12\x11\n\tsignature\x18\t \x01(\t\"+\n\x06\x42locks\x12!\n\x06\x62locks\x18\x01 \x03(\x0b\x32\x11.blockchain.Block\"\x10\n\x0e\x42\x61seFeeRequest\"\x1a\n\x07\x42\x61seFee\x12\x0f\n\x07\x62\x61seFee\x18\x01 \x01(\x01\"\x1a\n\x07Success\x12\x0f\n\x07success\x18\x01 \x01(\x08\x32\xd9\x03\n\nBlockchain\x12\x37\n\x08getBlock\x12\x18.blockchain.BlockRequest\x1a\x11.blockchain.Block\x12\x39\n\tgetBlocks\x12\x18.blockchain.BlockRequest\x1a\x12.blockchain.Blocks\x12I\n\x0egetTransaction\x12\x1e.blockchain.TransactionRequest\x1a\x17.blockchain.Transaction\x12K\n\x0fgetTransactions\x12\x1e.blockchain.TransactionRequest\x1a\x18.blockchain.Transactions\x12>\n\x0e\x61\x64\x64Transaction\x12\x17.blockchain.Transaction\x1a\x13.blockchain.Success\x12@\n\x0f\x61\x64\x64Transactions\x12\x18.blockchain.Transactions\x1a\x13.blockchain.Success\x12=\n\ngetBaseFee\x12\x1a.blockchain.BaseFeeRequest\x1a\x13.blockchain.BaseFeeb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x10\x62lockchain.proto\x12\nblockchain\"\x97\x02\n\x0c\x42lockRequest\x12\x12\n\x05index\x18\x01 \x01(\x03H\x00\x88\x01\x01\x12\x19\n\x0cpreviousHash\x18\x02 \x01(\tH\x01\x88\x01\x01\x12\x16\n\ttimestamp\x18\x04 \x01(\tH\x02\x88\x01\x01\x12(\n\x02tx\x18\x06 \x01(\x0b\x32\x17.blockchain.TransactionH\x03\x88\x01\x01\x12\x11\n\x04hash\x18\x07 \x01(\tH\x04\x88\x01\x01\x12\x16\n\tvalidator\x18\x08 \x01(\tH\x05\x88\x01\x01\x12\x16\n\tsignature\x18\t \x01(\tH\x06\x88\x01\x01\x42\x08\n\x06_indexB\x0f\n\r_previousHashB\x0c\n\n_timestampB\x05\n\x03_txB\x07\n\x05_hashB\x0c\n\n_validatorB\x0c\n\n_signature\"\xc2\x01\n\x12TransactionRequest\x12\x13\n\x06sender\x18\x01 \x01(\tH\x00\x88\x01\x01\x12\x16\n\trecipient\x18\x02 \x01(\tH\x01\x88\x01\x01\x12\x16\n\ttimestamp\x18\x06 \x01(\tH\x02\x88\x01\x01\x12\x11\n\x04hash\x18\x07 \x01(\tH\x03\x88\x01\x01\x12\x16\n\tsignature\x18\x08 \x01(\tH\x04\x88\x01\x01\x42\t\n\x07_senderB\x0c\n\n_recipientB\x0c\n\n_timestampB\x07\n\x05_hashB\x0c\n\n_signature\"\x8f\x01\n\x0bTransaction\x12\x0e\n\x06sender\x18\x01 \x01(\t\x12\x11\n\trecipient\x18\x02 \x01(\t\x12\x0e\n\x06\x61mount\x18\x03 \x01(\x01\x12\x0b\n\x03\x66\x65\x65\x18\x04 \x01(\x01\x12\x0c\n\x04type\x18\x05 \x01(\t\x12\x11\n\ttimestamp\x18\x06 \x01(\t\x12\x0c\n\x04hash\x18\x07 \x01(\t\x12\x11\n\tsignature\x18\x08 \x01(\t\"3\n\x0cTransactions\x12#\n\x02tx\x18\x01 \x03(\x0b\x32\x17.blockchain.Transaction\"\xce\x01\n\x05\x42lock\x12\r\n\x05index\x18\x01 \x01(\x03\x12\x14\n\x0cpreviousHash\x18\x02 \x01(\t\x12\x0f\n\x07version\x18\x03 \x01(\t\x12\x11\n\ttimestamp\x18\x04 \x01(\t\x12\x0f\n\x07\x62\x61seFee\x18\x05 \x01(\r\x12#\n\x02tx\x18\x06 \x03(\x0b\x32\x17.blockchain.Transaction\x12\x0c\n\x04hash\x18\x07 \x01(\t\x12\x11\n\tvalidator\x18\x08 \x01(\t\x12\x11\n\tsignature\x18\t \x01(\t\x12\x12\n\nmerkleRoot\x18\n \x01(\t\"+\n\x06\x42locks\x12!\n\x06\x62locks\x18\x01 \x03(\x0b\x32\x11.blockchain.Block\"\x1c\n\x0cProofRequest\x12\x0c\n\x04hash\x18\x01 \x01(\t\"\'\n\tProofStep\x12\x0c\n\x04hash\x18\x01 \x01(\t\x12\x0c\n\x04left\x18\x02 \x01(\x08\"r\n\x10TransactionProof\x12\x12\n\nblockIndex\x18\x01 \x01(\x03\x12\x12\n\nmerkleRoot\x18\x02 \x01(\t\x12\x10\n\x08position\x18\x03 \x01(\x03\x12$\n\x05steps\x18\x04 \x03(\x0b\x32\x15.blockchain.ProofStep\"\x10\n\x0e\x42\x61seFeeRequest\"\x1a\n\x07\x42\x61seFee\x12\x0f\n\x07\x62\x61seFee\x18\x01 \x01(\x01\"\x1a\n\x07Success\x12\x0f\n\x07success\x18\x01 \x01(\x08\x32\xa8\x04\n\nBlockchain\x12\x37\n\x08getBlock\x12\x18.blockchain.BlockRequest\x1a\x11.blockchain.Block\x12\x39\n\tgetBlocks\x12\x18.blockchain.BlockRequest\x1a\x12.blockchain.Blocks\x12I\n\x0egetTransaction\x12\x1e.blockchain.TransactionRequest\x1a\x17.blockchain.Transaction\x12K\n\x0fgetTransactions\x12\x1e.blockchain.TransactionRequest\x1a\x18.blockchain.Transactions\x12M\n\x13getTransactionProof\x12\x18.blockchain.ProofRequest\x1a\x1c.blockchain.TransactionProof\x12>\n\x0e\x61\x64\x64Transaction\x12\x17.blockchain.Transaction\x1a\x13.blockchain.Success\x12@\n\x0f\x61\x64\x64Transactions\x12\x18.blockchain.Transactions\x1a\x13.blockchain.Success\x12=\n\ngetBaseFee\x12\x1a.blockchain.BaseFeeRequest\x1a\x13.blockchain.BaseFeeb\x06proto3')
 
 
 
@@ -24,6 +24,9 @@ _TRANSACTION = DESCRIPTOR.message_types_by_name['Transaction']
 _TRANSACTIONS = DESCRIPTOR.message_types_by_name['Transactions']
 _BLOCK = DESCRIPTOR.message_types_by_name['Block']
 _BLOCKS = DESCRIPTOR.message_types_by_name['Blocks']
+_PROOFREQUEST = DESCRIPTOR.message_types_by_name['ProofRequest']
+_PROOFSTEP = DESCRIPTOR.message_types_by_name['ProofStep']
+_TRANSACTIONPROOF = DESCRIPTOR.message_types_by_name['TransactionProof']
 _BASEFEEREQUEST = DESCRIPTOR.message_types_by_name['BaseFeeRequest']
 _BASEFEE = DESCRIPTOR.message_types_by_name['BaseFee']
 _SUCCESS = DESCRIPTOR.message_types_by_name['Success']
@@ -69,6 +72,27 @@ Blocks = _reflection.GeneratedProtocolMessageType('Blocks', (_message.Message,),
   })
 _sym_db.RegisterMessage(Blocks)
 
+ProofRequest = _reflection.GeneratedProtocolMessageType('ProofRequest', (_message.Message,), {
+  'DESCRIPTOR' : _PROOFREQUEST,
+  '__module__' : 'blockchain_pb2'
+  # @@protoc_insertion_point(class_scope:blockchain.ProofRequest)
+  })
+_sym_db.RegisterMessage(ProofRequest)
+
+ProofStep = _reflection.GeneratedProtocolMessageType('ProofStep', (_message.Message,), {
+  'DESCRIPTOR' : _PROOFSTEP,
+  '__module__' : 'blockchain_pb2'
+  # @@protoc_insertion_point(class_scope:blockchain.ProofStep)
+  })
+_sym_db.RegisterMessage(ProofStep)
+
+TransactionProof = _reflection.GeneratedProtocolMessageType('TransactionProof', (_message.Message,), {
+  'DESCRIPTOR' : _TRANSACTIONPROOF,
+  '__module__' : 'blockchain_pb2'
+  # @@protoc_insertion_point(class_scope:blockchain.TransactionProof)
+  })
+_sym_db.RegisterMessage(TransactionProof)
+
 BaseFeeRequest = _reflection.GeneratedProtocolMessageType('BaseFeeRequest', (_message.Message,), {
   'DESCRIPTOR' : _BASEFEEREQUEST,
   '__module__' : 'blockchain_pb2'
@@ -103,15 +127,21 @@ if _descriptor._USE_C_DESCRIPTORS == False:
   _TRANSACTIONS._serialized_start=657
   _TRANSACTIONS._serialized_end=708
   _BLOCK._serialized_start=711
-  _BLOCK._serialized_end=897
-  _BLOCKS._serialized_start=899
-  _BLOCKS._serialized_end=942
-  _BASEFEEREQUEST._serialized_start=944
-  _BASEFEEREQUEST._serialized_end=960
-  _BASEFEE._serialized_start=962
-  _BASEFEE._serialized_end=988
-  _SUCCESS._serialized_start=990
-  _SUCCESS._serialized_end=1016
-  _BLOCKCHAIN._serialized_start=1019
-  _BLOCKCHAIN._serialized_end=1492
+  _BLOCK._serialized_end=917
+  _BLOCKS._serialized_start=919
+  _BLOCKS._serialized_end=962
+  _PROOFREQUEST._serialized_start=964
+  _PROOFREQUEST._serialized_end=992
+  _PROOFSTEP._serialized_start=994
+  _PROOFSTEP._serialized_end=1033
+  _TRANSACTIONPROOF._serialized_start=1035
+  _TRANSACTIONPROOF._serialized_end=1149
+  _BASEFEEREQUEST._serialized_start=1151
+  _BASEFEEREQUEST._serialized_end=1167
+  _BASEFEE._serialized_start=1169
+  _BASEFEE._serialized_end=1195
+  _SUCCESS._serialized_start=1197
+  _SUCCESS._serialized_end=1223
+  _BLOCKCHAIN._serialized_start=1226
+  _BLOCKCHAIN._serialized_end=1778
 # @@protoc_insertion_point(module_scope)
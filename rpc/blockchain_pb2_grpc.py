@@ -34,6 +34,11 @@ class BlockchainStub(object):
                 request_serializer=blockchain__pb2.TransactionRequest.SerializeToString,
                 response_deserializer=blockchain__pb2.Transactions.FromString,
                 )
+        self.getTransactionProof = channel.unary_unary(
+                '/blockchain.Blockchain/getTransactionProof',
+                request_serializer=blockchain__pb2.ProofRequest.SerializeToString,
+                response_deserializer=blockchain__pb2.TransactionProof.FromString,
+                )
         self.addTransaction = channel.unary_unary(
                 '/blockchain.Blockchain/addTransaction',
                 request_serializer=blockchain__pb2.Transaction.SerializeToString,
@@ -78,6 +83,12 @@ class BlockchainServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def getTransactionProof(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def addTransaction(self, request, context):
         """Missing associated documentation comment in .proto file."""
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
@@ -119,6 +130,11 @@ def add_BlockchainServicer_to_server(servicer, server):
                     request_deserializer=blockchain__pb2.TransactionRequest.FromString,
                     response_serializer=blockchain__pb2.Transactions.SerializeToString,
             ),
+            'getTransactionProof': grpc.unary_unary_rpc_method_handler(
+                    servicer.getTransactionProof,
+                    request_deserializer=blockchain__pb2.ProofRequest.FromString,
+                    response_serializer=blockchain__pb2.TransactionProof.SerializeToString,
+            ),
             'addTransaction': grpc.unary_unary_rpc_method_handler(
                     servicer.addTransaction,
                     request_deserializer=blockchain__pb2.Transaction.FromString,
@@ -212,6 +228,23 @@ class Blockchain(object):
             options, channel_credentials,
             insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
 
+    @staticmethod
+    def getTransactionProof(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/blockchain.Blockchain/getTransactionProof',
+            blockchain__pb2.ProofRequest.SerializeToString,
+            blockchain__pb2.TransactionProof.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
     @staticmethod
     def addTransaction(request,
             target,
@@ -111,6 +111,30 @@ class Client:
         except:
             return False
 
+    def getTransactionProof(self, proof_request):
+        """Fetch the proof that a transaction is included into its block (verify it with
+           :py:func:`blockchain.merkle.verify_merkle_proof` from the hash and signature of the transaction against the
+           merkle-root of the block-header).
+
+        :param proof_request: Hash of the transaction to prove.
+        :type proof_request: :py:class:`rpc.blockchain_pb2.ProofRequest`
+
+        :return: Result of requested proof.
+        :rtype: :py:class:`rpc.blockchain_pb2.TransactionProof`
+        """
+
+        # TODO -> Fetch from multiple servers and compare the values
+
+        try:
+            with insecure_channel(f'{self.ip_address}:{self.port}') as channel:
+                stub = BlockchainStub(channel)
+
+                # Fetch the proof and return it to the user
+                return stub.getTransactionProof(proof_request)
+
+        except:
+            return False
+
     def addTransaction(self, tx):
         """Add transaction to blockchain.
 
@@ -12,7 +12,8 @@ from os.path import dirname, abspath, join
 path.insert(0, join(dirname(abspath(__file__))))
 
 # Blockchain protobuf
-from blockchain_pb2 import Transaction as RPCTransaction, Block as RPCBlock, Transactions, Blocks, BaseFee, Success
+from blockchain_pb2 import (Transaction as RPCTransaction, Block as RPCBlock, Transactions, Blocks, BaseFee, Success,
+                            TransactionProof, ProofStep)
 from blockchain_pb2_grpc import BlockchainServicer, add_BlockchainServicer_to_server as add_blockchain
 
 # Wallet protobuf
@@ -37,7 +38,7 @@ from blockchain.transaction import Transaction
 from blockchain.block import Block
 from blockchain.blockchain import Blockchain
 
-from util.database.blockchain import fetch_block, fetch_block_from_timestamp, fetch_block_from_signature
+from util.database.blockchain import fetch_block_from_timestamp, fetch_block_from_signature, fetch_transaction_proof
 
 
 class BlockchainListener(BlockchainServicer):
@@ -51,6 +52,22 @@ class BlockchainListener(BlockchainServicer):
 
         self.db_q = db_q
 
+    def fetch_block_dict(self, index: int) -> dict | bool:
+        """Fetch a block from its index (served from the block caches of the chain if possible).
+
+        :param index: Index of the block.
+        :type index: int
+
+        :return: Dict-data of the block or False if it could not be found.
+        :rtype: dict | bool
+        """
+        block = self.blockchain.fetch_block(index)
+
+        if not block:
+            return False
+
+        return block.to_dict()
+
     def getBlock(self, request, context):
         """Fetch block from the given values.
 
@@ -62,7 +79,7 @@ class BlockchainListener(BlockchainServicer):
         """
 
         if request.index:
-            block_dict = fetch_block(request.index)
+            block_dict = self.fetch_block_dict(request.index)
 
         elif request.timestamp:
             block_dict = fetch_block_from_timestamp(request.timestamp)
@@ -82,14 +99,14 @@ class BlockchainListener(BlockchainServicer):
 
         for transaction in block_dict['tx']:
             tx.append(RPCTransaction(sender=transaction['sender'], recipient=transaction['recipient'],
-                                     amount=transaction['amount'], fee=transaction['fee'], type=transaction['tx_type'],
+                                     amount=transaction['amount'], fee=transaction['fee'], type=transaction['type'],
                                      timestamp=transaction['timestamp'], hash=transaction['hash'],
                                      signature=transaction['signature']))
 
         return RPCBlock(index=block_dict['index'], previousHash=block_dict['previous_hash'],
                         version=block_dict['version'], timestamp=str(block_dict['timestamp']),
                         baseFee=block_dict['base_fee'], tx=tx, hash=block_dict['hash'],
-                        signature=block_dict['signature'])
+                        signature=block_dict['signature'], merkleRoot=block_dict['merkle_root'] or '')
 
     def getBlocks(self, request, context):
         """Fetch blocks from the given values.
@@ -107,7 +124,7 @@ class BlockchainListener(BlockchainServicer):
 
         for req_block in request:
             if req_block.index:
-                block_dict = fetch_block(req_block.index)
+                block_dict = self.fetch_block_dict(req_block.index)
 
             elif req_block.timestamp:
                 block_dict = fetch_block_from_timestamp(req_block.timestamp)
@@ -125,14 +142,14 @@ class BlockchainListener(BlockchainServicer):
             for transaction in block_dict['tx']:
                 tx.append(RPCTransaction(sender=transaction['sender'], recipient=transaction['recipient'],
                                          amount=transaction['amount'], fee=transaction['fee'],
-                                         type=transaction['tx_type'],
+                                         type=transaction['type'],
                                          timestamp=transaction['timestamp'], hash=transaction['hash'],
                                          signature=transaction['signature']))
 
             blocks.append(RPCBlock(index=block_dict['index'], previousHash=block_dict['previous_hash'],
                                    version=block_dict['version'], timestamp=str(block_dict['timestamp']),
                                    baseFee=block_dict['base_fee'], tx=tx, hash=block_dict['hash'],
-                                   signature=block_dict['signature']))
+                                   signature=block_dict['signature'], merkleRoot=block_dict['merkle_root'] or ''))
 
         return Blocks(blocks=blocks)
 
@@ -169,6 +186,25 @@ class BlockchainListener(BlockchainServicer):
                                             amount=12, fee=23, type='tx', timestamp='1234', hash='123231wef',
                                             signature='asdf')])
 
+    def getTransactionProof(self, request, context):
+        """Fetch the proof that a transaction is included into its block.
+
+        :param request: Information about the request.
+        :param context: Context of the request.
+
+        :return: TransactionProof protocol-message.
+        :rtype: :py:object:`blockchain_pb2.TransactionProof`
+        """
+        proof = fetch_transaction_proof(request.hash)
+
+        # Check if the transaction is included into the chain
+        if not proof:
+            return TransactionProof(blockIndex=0, merkleRoot='', position=0, steps=[])
+
+        return TransactionProof(blockIndex=proof['block_index'], merkleRoot=proof['merkle_root'],
+                                position=proof['position'],
+                                steps=[ProofStep(hash=sibling, left=is_left) for sibling, is_left in proof['proof']])
+
     def addTransaction(self, request, context):
         # Recreate the transaction
         tx = Transaction('', '', 0)
@@ -187,7 +223,7 @@ class BlockchainListener(BlockchainServicer):
         })
 
         # Put it to the processor-queue
-        input_queue.put({'type': 'tx', 'data': tx})
+        input_queue.put_nowait({'type': 'tx', 'data': tx})
 
         return Success(success=True)
 
@@ -211,7 +247,7 @@ class BlockchainListener(BlockchainServicer):
             })
 
             # Put it to the processor-queue
-            input_queue.put({'type': 'tx', 'data': tx})
+            input_queue.put_nowait({'type': 'tx', 'data': tx})
 
         return Success(success=True)
 
@@ -302,14 +338,22 @@ class RPCServer():
 
         self.server = grpc_server(ThreadPoolExecutor(max_workers=1))
 
-        add_blockchain(BlockchainListener(self.blockchain, db_q=self.db_q), self.server)
-        add_wallet(WalletListener(self.blockchain, db_q=self.db_q), self.server)
-
-        self.server.add_insecure_port(f'[::]:{self.port}')
+        self.add_servicers(self.server)
         self.server.start()
 
         return True
 
+    def add_servicers(self, server):
+        """Registers the blockchain- and wallet-services on a grpc server and lets it listen on the rpc port.
+
+        :param server: Server to set up (threaded or asyncio).
+        :type server: :py:class:`grpc.Server` | :py:class:`grpc.aio.Server`
+        """
+        add_blockchain(BlockchainListener(self.blockchain, db_q=self.db_q), server)
+        add_wallet(WalletListener(self.blockchain, db_q=self.db_q), server)
+
+        server.add_insecure_port(f'[::]:{self.port}')
+
     def stop(self):
         """Stops the rpc server.
 
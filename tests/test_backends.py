@@ -0,0 +1,78 @@
+# Cross-checks of the crypto backends
+from unittest import TestCase, main, skipUnless
+
+# Add to path
+from sys import path
+from os.path import dirname, abspath, join
+
+path.insert(0, join(dirname(abspath(__file__)), '..'))
+
+from accounts import backends
+from accounts.backends import KEYPAIRS, EcdsaBackend, available_backends
+
+# The native backend needs the optional cryptography-package
+BACKENDS = available_backends()
+
+
+def tamper(signature: bytes) -> bytes:
+    """Flips a bit in the middle of a signature.
+
+    :param signature: Signature to break.
+    :type signature: bytes
+
+    :return: Tampered signature.
+    :rtype: bytes
+    """
+    return signature[:40] + bytes([signature[40] ^ 1]) + signature[41:]
+
+
+@skipUnless('openssl' in BACKENDS, 'the openssl backend is not available')
+class CrossBackendTest(TestCase):
+    def setUp(self):
+        self.reference = EcdsaBackend()
+        self.native = BACKENDS['openssl']()
+
+    def cross_check(self, signer, verifier):
+        """Signs the keypairs with one backend and verifies them with the other one.
+
+        """
+        for keypair in KEYPAIRS:
+            data = bytes(keypair['data'], 'utf-8')
+
+            signing_key = signer.load_signing_key(bytes.fromhex(keypair['private_key']))
+            verifying_key = verifier.load_verifying_key(bytes.fromhex(keypair['public_key']))
+
+            self.assertEqual(signer.public_key(signing_key).hex(), keypair['public_key'])
+
+            signature = signer.sign(signing_key, data)
+
+            self.assertTrue(verifier.verify(verifying_key, signature, data))
+            self.assertFalse(verifier.verify(verifying_key, tamper(signature), data))
+            self.assertEqual(verifier.verify_batch([(verifying_key, signature, data),
+                                                    (verifying_key, tamper(signature), data)]), [True, False])
+
+    def test_reference_to_native(self):
+        self.cross_check(self.reference, self.native)
+
+    def test_native_to_reference(self):
+        self.cross_check(self.native, self.reference)
+
+    def test_self_test(self):
+        self.assertTrue(backends.self_test(self.native, self.reference))
+
+
+class VectorTest(TestCase):
+    def test_vectors(self):
+        """Every available backend has to give the expected results for the stored signatures.
+
+        """
+        for name, backend_class in BACKENDS.items():
+            backend = backend_class()
+
+            for public_key, signature, data, expected in backends.test_vectors():
+                with self.subTest(backend=name):
+                    self.assertEqual(backend.verify(backend.load_verifying_key(public_key), signature, data), expected)
+
+
+if __name__ == '__main__':
+    main()
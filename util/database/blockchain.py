@@ -1,3 +1,7 @@
+from sqlite3 import Error as SQLiteError, IntegrityError, ProgrammingError
+from enum import Enum
+from time import time
+
 # Add to path
 from sys import path
 from os.path import dirname, abspath, join
@@ -6,9 +10,17 @@ path.insert(0, join(dirname(abspath(__file__)), '..'))
 
 # Transaction-class
 from blockchain.transaction import Transaction
+from blockchain.merkle import merkle_root, merkle_proof
 
 # Database-connector
 from util.database.database import Database
+from util.database.state import (apply_block_state, revert_block_state, shift_checkpoints, changes_stake_lots,
+                                 rebuild_stake_lots)
+
+
+# Columns of the block-table that make up a block-header
+HEADER_COLUMNS = ('block_index, previous_hash, version, timestamp, base_fee, merkle_root, tx_count, hash, validator, '
+                  'signature')
 
 
 def recreate_block(block_data):
@@ -31,7 +43,36 @@ def recreate_block(block_data):
 
         'hash': block_data[5],
         'validator': block_data[6],
-        'signature': block_data[7]
+        'signature': block_data[7],
+
+        'merkle_root': block_data[8]
+    }
+
+
+def recreate_header(header_data):
+    """Recreates block-header from database-data.
+
+    :param header_data: Data fetched from the database.
+    :type header_data: tuple | list
+
+    :return: Information of a block-header as dict-format.
+    :rtype: dict
+    """
+    return {
+        'index': header_data[0],
+        'previous_hash': header_data[1],
+
+        'version': header_data[2],
+        'timestamp': header_data[3],
+
+        'base_fee': header_data[4],
+
+        'merkle_root': header_data[5],
+        'tx_count': header_data[6],
+
+        'hash': header_data[7],
+        'validator': header_data[8],
+        'signature': header_data[9]
     }
 
 
@@ -56,48 +97,110 @@ def recreate_tx(tx_data):
     }
 
 
-def add_block(block_dict: dict, overwrite: bool = False):
-    """Add block to the database.
+class CommitStatus(Enum):
+    """Result of writing a block to the database."""
+    COMMITTED = 'committed'
+
+    # The chain already has a block with this index
+    BLOCK_EXISTS = 'block-exists'
+
+    # At least one transaction of the block is already included into the chain
+    TX_EXISTS = 'tx-exists'
+
+    # Values of the block or its transactions are missing or have the wrong format
+    INVALID_DATA = 'invalid-data'
+
+    # The database refused the write (e.g. because it is locked, corrupted or its account state does not match the
+    # chain)
+    DATABASE_ERROR = 'database-error'
+
+
+def commit_block(block_dict: dict, overwrite: bool = False) -> CommitStatus:
+    """Write the block, all of its transactions and the account state changes in one transaction.
 
     :param block_dict: Dictionary of block-information.
     :type block_dict: dict
     :param overwrite: If block already exists do or do not overwrite.
     :type overwrite: bool
 
-    :return: Status if the block was added successful.
-    :rtype: bool
+    :return: Whether the block was committed or why it was not.
+    :rtype: :py:class:`util.database.blockchain.CommitStatus`
     """
+    replaced = False
 
-    # Check if block already exists in the database
-    if fetch_block(block_dict['index']):
-        # Check if overwriting blocks is set to off
-        if not overwrite:
-            return False
+    try:
+        with Database.transaction() as cursor:
+            # Remove the block that gets overwritten and take its changes of the account state back
+            if overwrite:
+                lots_changed = changes_stake_lots(cursor, block_dict['index'])
 
-        remove_block(block_dict['index'])
+                cursor.execute('DELETE FROM transactions WHERE block_index = :id', {'id': block_dict['index']})
+                replaced = cursor.execute('DELETE FROM blockchain WHERE block_index = :id',
+                                          {'id': block_dict['index']}).rowcount > 0
 
-    # Check if the block includes transactions
-    if type(block_dict['tx']) == list and len(block_dict['tx']) > 0:
-        # Add transactions to database
-        for transaction in block_dict['tx']:
-            transaction['block_index'] = block_dict['index']
+                if replaced:
+                    revert_block_state(cursor, block_dict['index'])
 
-            success = Database.push_to_db('INSERT INTO transactions VALUES (:block_index, :sender, :recipient, :amount, :fee, \
-                                        :type, :timestamp, :hash, :signature)', transaction)
+            # Add block to the database (an existing block is detected by the conflict on its index)
+            cursor.execute('INSERT INTO blockchain VALUES (:index, :previous_hash, :version, :timestamp, :base_fee, '
+                           ':hash, :validator, :signature, :merkle_root, :tx_count) ON CONFLICT(block_index) DO '
+                           'NOTHING', {**block_dict, 'tx_count': len(block_dict['tx'])})
 
-    # Add block to the database
-    success = Database.push_to_db('INSERT INTO blockchain VALUES (:index, :previous_hash, :version, :timestamp, \
-                                   :base_fee, :hash, :validator, :signature)', block_dict)
+            if cursor.rowcount == 0:
+                return CommitStatus.BLOCK_EXISTS
 
-    # Check if block was successfully added to the database
-    if not success:
-        return False
+            # Add all transactions at once (a transaction that is already in the chain violates the unique hash)
+            cursor.executemany('INSERT INTO transactions VALUES (:block_index, :sender, :recipient, :amount, :fee, '
+                               ':type, :timestamp, :hash, :signature)',
+                               [{**transaction, 'block_index': block_dict['index']}
+                                for transaction in block_dict['tx']])
 
-    return True
+            # Keep the account state in sync with the chain
+            changes = apply_block_state(cursor, block_dict)
+
+            if replaced:
+                # Checkpoints after a replaced block contain its old changes
+                shift_checkpoints(cursor, block_dict['index'], changes)
+
+                if lots_changed or changes_stake_lots(cursor, block_dict['index']):
+                    rebuild_stake_lots(cursor)
+
+                # A replaced block was not validated yet
+                cursor.execute('DELETE FROM validation_state WHERE block_index >= :id', {'id': block_dict['index']})
+
+    except IntegrityError as error:
+        # Only the unique hash of the transactions means that a transaction is included already (lookup index of
+        # migration 1), any other violated constraint is an inconsistent database
+        if str(error) == 'UNIQUE constraint failed: transactions.hash':
+            return CommitStatus.TX_EXISTS
+
+        return CommitStatus.DATABASE_ERROR
+
+    except (KeyError, TypeError, ValueError, ProgrammingError):
+        return CommitStatus.INVALID_DATA
+
+    except SQLiteError:
+        return CommitStatus.DATABASE_ERROR
+
+    return CommitStatus.COMMITTED
+
+
+def add_block(block_dict: dict, overwrite: bool = False):
+    """Add block to the database.
+
+    :param block_dict: Dictionary of block-information.
+    :type block_dict: dict
+    :param overwrite: If block already exists do or do not overwrite.
+    :type overwrite: bool
+
+    :return: Status if the block was added successful.
+    :rtype: bool
+    """
+    return commit_block(block_dict, overwrite) is CommitStatus.COMMITTED
 
 
 def remove_block(index: int):
-    """Remove block from its index.
+    """Remove block from its index (its transactions and its changes of the account state are removed with it).
 
     :param index: Index of the block to delete.
     :type idnex: int
@@ -105,12 +208,45 @@ def remove_block(index: int):
     :return: Status if the block was removed successful.
     :rtype: bool
     """
+    try:
+        with Database.transaction() as cursor:
+            lots_changed = changes_stake_lots(cursor, index)
+
+            # Delete block and its transactions from database
+            cursor.execute('DELETE FROM transactions WHERE block_index = :id', {'id': index})
+
+            if cursor.execute('DELETE FROM blockchain WHERE block_index = :id', {'id': index}).rowcount == 0:
+                return False
+
+            # Keep the account state in sync with the chain
+            revert_block_state(cursor, index)
+
+            if lots_changed:
+                rebuild_stake_lots(cursor)
+
+            # The chain has to be validated again from the start if the block was covered by the watermark
+            cursor.execute('DELETE FROM validation_state WHERE block_index >= :id', {'id': index})
+
+    except SQLiteError:
+        return False
+
+    return True
+
+
+def reset_chain() -> bool:
+    """Removes all blocks and transactions and everything that is derived from them (account state, its history, the
+       stake lots and the validation watermark) at once.
 
-    # Delete block from database
-    success = Database.push_to_db('DELETE FROM blockchain WHERE block_index = :id', {'id': index})
+    :return: Status if the chain was reset successful.
+    :rtype: bool
+    """
+    try:
+        with Database.transaction() as cursor:
+            for table in ('transactions', 'blockchain', 'account_state', 'stake_lots', 'account_deltas',
+                          'account_checkpoints', 'validation_state'):
+                cursor.execute(f'DELETE FROM {table}')
 
-    # Check if execution was not succesful
-    if not success:
+    except SQLiteError:
         return False
 
     return True
@@ -162,6 +298,166 @@ def fetch_block(index: int):
     return block_dict
 
 
+def fetch_blocks(start: int, end: int) -> list:
+    """Fetch all blocks of an index range with one query for the blocks and one for their transactions.
+
+    :param start: Index of the first block to fetch.
+    :type start: int
+    :param end: Index of the last block to fetch (included).
+    :type end: int
+
+    :return: Dict-data of the blocks (ordered by their index, missing blocks are left out).
+    :rtype: [ dict ]
+    """
+    block_data = Database.fetchall_from_db('SELECT * FROM blockchain WHERE block_index BETWEEN :start AND :end '
+                                           'ORDER BY block_index', {'start': start, 'end': end})
+
+    # Check if there are any blocks in the range
+    if not block_data:
+        return []
+
+    # Convert blocks to dictionary format
+    block_dicts = {}
+
+    for block in block_data:
+        block_dicts[block[0]] = recreate_block(block)
+        block_dicts[block[0]]['tx'] = []
+
+    # Fetch the transactions of all blocks and group them by their block
+    tx = Database.fetchall_from_db('SELECT block_index, sender, recipient, amount, fee, type, timestamp, hash, '
+                                   'signature FROM transactions WHERE block_index BETWEEN :start AND :end ORDER BY '
+                                   'block_index, rowid', {'start': start, 'end': end})
+
+    for transaction in tx if tx else []:
+        if transaction[0] in block_dicts:
+            block_dicts[transaction[0]]['tx'].append(recreate_tx(transaction[1:]))
+
+    return list(block_dicts.values())
+
+
+def fetch_tx_counts(start: int, end: int) -> list:
+    """Fetch the amount of transactions of every block in an index range.
+
+    :param start: Index of the first block.
+    :type start: int
+    :param end: Index of the last block (included).
+    :type end: int
+
+    :return: Transaction counts of the blocks (ordered by their index, missing blocks are left out).
+    :rtype: [ int ]
+    """
+    counts = Database.fetchall_from_db('SELECT tx_count FROM blockchain WHERE block_index BETWEEN :start AND :end '
+                                       'ORDER BY block_index', {'start': start, 'end': end})
+
+    if not counts:
+        return []
+
+    return [count[0] for count in counts]
+
+
+def fetch_last_index() -> int:
+    """Fetch the index of the last block of the chain.
+
+    :return: Index of the last block (0 if there are no blocks).
+    :rtype: int
+    """
+    last_index = Database.fetchone_from_db('SELECT MAX(block_index) FROM blockchain', {})
+
+    if not last_index or not last_index[0]:
+        return 0
+
+    return last_index[0]
+
+
+def fetch_header(index: int):
+    """Fetch the header of a block (without its transactions) from its index.
+
+    :param index: Index of the block.
+    :type index: int
+
+    :return: Fetch was not succesful.
+    :rtype: bool
+    :return: Dict-data of the header.
+    :rtype: dict
+    """
+    header_data = Database.fetchone_from_db(f'SELECT {HEADER_COLUMNS} FROM blockchain WHERE block_index = :id',
+                                            {'id': index})
+
+    # Check if the response of the database is correct
+    if not header_data:
+        return False
+
+    return recreate_header(header_data)
+
+
+def fetch_headers(start: int, end: int) -> list:
+    """Fetch the headers of all blocks of an index range (without their transactions).
+
+    :param start: Index of the first block.
+    :type start: int
+    :param end: Index of the last block (included).
+    :type end: int
+
+    :return: Dict-data of the headers (ordered by their index, missing blocks are left out).
+    :rtype: [ dict ]
+    """
+    header_data = Database.fetchall_from_db(f'SELECT {HEADER_COLUMNS} FROM blockchain WHERE block_index BETWEEN '
+                                            ':start AND :end ORDER BY block_index', {'start': start, 'end': end})
+
+    if not header_data:
+        return []
+
+    return [recreate_header(header) for header in header_data]
+
+
+def iter_blocks(start: int, end: int, chunk: int = 256):
+    """Iterate through all blocks of an index range (fetched chunk by chunk).
+
+    :param start: Index of the first block to fetch.
+    :type start: int
+    :param end: Index of the last block to fetch (included).
+    :type end: int
+    :param chunk: Amount of blocks to fetch at once.
+    :type chunk: int
+
+    :return: Dict-data of the blocks (ordered by their index).
+    :rtype: Generator[dict]
+    """
+    for chunk_start in range(start, end + 1, chunk):
+        yield from fetch_blocks(chunk_start, min(chunk_start + chunk - 1, end))
+
+
+def fetch_validation_state():
+    """Fetch the watermark of the chain validation.
+
+    :return: Index and hash of the last validated block or False if the chain was never validated.
+    :rtype: (int, str) | bool
+    """
+    state = Database.fetchone_from_db('SELECT block_index, block_hash FROM validation_state WHERE id = 1', {})
+
+    if not state:
+        return False
+
+    return state[0], state[1]
+
+
+def save_validation_state(index: int, block_hash: str) -> bool:
+    """Moves the watermark of the chain validation to a block.
+
+    :param index: Index of the last validated block.
+    :type index: int
+    :param block_hash: Hash of the last validated block.
+    :type block_hash: str (hex-digest)
+
+    :return: Status whether the watermark was saved or not.
+    :rtype: bool
+    """
+    return Database.push_to_db('INSERT INTO validation_state VALUES (1, :index, :hash, :validated_at) ON CONFLICT(id) '
+                               'DO UPDATE SET block_index = excluded.block_index, block_hash = excluded.block_hash, '
+                               'validated_at = excluded.validated_at',
+                               {'index': index, 'hash': block_hash, 'validated_at': time()})
+
+
 def fetch_block_from_timestamp(timestamp):
     """Fetch block from its index.
 
@@ -258,6 +554,42 @@ def fetch_block_from_signature(signature: str, hash: str):
     return block_dict
 
 
+def fetch_transaction_proof(tx_hash: str):
+    """Fetch the proof that a transaction is included into its block.
+
+    :param tx_hash: Hex-digest of the transaction-hash.
+    :type tx_hash: str
+
+    :return: Fetch was not succesful.
+    :rtype: bool
+    :return: Index and merkle-root of the block, position of the transaction and the proof-steps.
+    :rtype: dict
+    """
+    block_data = Database.fetchone_from_db('SELECT blockchain.block_index, blockchain.merkle_root FROM transactions '
+                                           'JOIN blockchain ON blockchain.block_index = transactions.block_index '
+                                           'WHERE transactions.hash = :hash', {'hash': tx_hash})
+
+    # Check if the transaction is included into the chain
+    if not block_data:
+        return False
+
+    # Only the hashes and signatures of the block's transactions are needed (in the order they were added)
+    leaves = [(tx_data[0], tx_data[1]) for tx_data in Database.fetchall_from_db('SELECT hash, signature FROM '
+                                                                                'transactions WHERE block_index = '
+                                                                                ':index ORDER BY rowid',
+                                                                                {'index': block_data[0]})]
+
+    position = [leaf[0] for leaf in leaves].index(tx_hash)
+
+    return {
+        'block_index': block_data[0],
+        'merkle_root': block_data[1] if block_data[1] else merkle_root(leaves),
+
+        'position': position,
+        'proof': merkle_proof(leaves, position)
+    }
+
+
 def fetch_transaction_block_index(tx: Transaction):
     """Check if a transaction is included into the database.
 
@@ -299,7 +631,7 @@ def fetch_transactions(public_key: str, tx_type: str = None, is_sender: bool = N
     """
 
     # Check if the maximal block index is set
-    if not max_block_index:
+    if max_block_index is None:
         # Check if the type of the transaction is provided and no other specifications
         if tx_type and is_sender is None:
             # Fetch the transactions
@@ -333,7 +665,7 @@ def fetch_transactions(public_key: str, tx_type: str = None, is_sender: bool = N
                                                           {'public_key': public_key})
 
         # Check if only the transactions should be fetched were the account is the recipient
-        elif is_sender is True:
+        elif is_sender is False:
             # Fetch the transactions
             transactions_data = Database.fetchall_from_db('SELECT sender, recipient, amount, fee, type, timestamp, '
                                                           'hash, signature FROM transactions '
@@ -394,7 +726,7 @@ def fetch_transactions(public_key: str, tx_type: str = None, is_sender: bool = N
                                                           {'public_key': public_key, 'max_index': max_block_index})
 
         # Check if only the transactions should be fetched were the account is the recipient
-        elif is_sender is True:
+        elif is_sender is False:
             # Fetch the transactions
             transactions_data = Database.fetchall_from_db('SELECT sender, recipient, amount, fee, type, timestamp, '
                                                           'hash, signature FROM transactions WHERE '
@@ -404,8 +736,9 @@ def fetch_transactions(public_key: str, tx_type: str = None, is_sender: bool = N
         # Fetch all transactions where this account is involved
         else:
             transactions_data = Database.fetchall_from_db('SELECT sender, recipient, amount, fee, type, timestamp, '
-                                                          'hash, signature FROM transactions WHERE sender = :public_key'
-                                                          ' AND block_index <= :max_index OR recipient = :public_key',
+                                                          'hash, signature FROM transactions WHERE block_index <= '
+                                                          ':max_index AND (sender = :public_key OR '
+                                                          'recipient = :public_key)',
                                                           {
                                                               'type': tx_type, 'public_key': public_key,
                                                               'max_index': max_block_index
@@ -1,55 +1,342 @@
+# Compressed blocks of the warm tier
+from pickle import dumps, loads, HIGHEST_PROTOCOL
+from zlib import compress, decompress
+
+from collections import OrderedDict
+from threading import Lock
+
 # Add to path
-from sys import path
+from sys import path, getsizeof
 from os.path import dirname, abspath, join
 path.insert(0, join(dirname(abspath(__file__)), '..'))
 
+from __init__ import BLOCK_CACHE_SIZE, BLOCK_CACHE_MEMORY
+
 # Block class to recreate cache
 from blockchain.block import Block
 
 # Database-connector
-from util.database.blockchain import fetch_block
-from util.database.database import Database
+from util.database.blockchain import fetch_blocks, fetch_last_index
+
+
+class BlockCache:
+    def __init__(self, size: int = BLOCK_CACHE_SIZE, blocks=None):
+        """Set the cache of the last blocks up (a ring buffer, every block has the slot of its index).
+
+        :param size: Most blocks that are kept.
+        :type size: int
+        :param blocks: Consecutive blocks to put into the cache (the oldest first).
+        :type blocks: [ :py:class:`blockchain.Block` ] | NoneType
+        """
+        self.size = max(size, 1)
+
+        # Slots of the blocks (the slot of a block is its index modulo the size)
+        self.slots = [None] * self.size
+
+        # Indices of the cached blocks by their hashes and by the hashes of their transactions
+        self.hashes = {}
+        self.tx_hashes = {}
+
+        # Index of the newest block and amount of cached blocks
+        self.tip = 0
+        self.count = 0
+
+        # Lookups by index that were answered from the cache and that were not
+        self.hits = 0
+        self.misses = 0
+
+        # The rpc threads read the cache while the processor adds blocks
+        self.lock = Lock()
+
+        for block in blocks if blocks else []:
+            self.add(block)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, position: int) -> Block:
+        """Returns a block by its position (the newest block is the first one, the oldest block is the last one).
+
+        :param position: Position of the block.
+        :type position: int
+
+        :return: Block at the position.
+        :rtype: :py:class:`blockchain.Block`
+        """
+        with self.lock:
+            if position < 0:
+                position += self.count
+
+            if not 0 <= position < self.count:
+                raise IndexError('block cache position out of range')
+
+            return self.slots[(self.tip - position) % self.size]
+
+    def __iter__(self):
+        """Iterates through the blocks (the newest block first).
+
+        """
+        for position in range(self.count):
+            yield self.slots[(self.tip - position) % self.size]
+
+    def __reversed__(self):
+        """Iterates through the blocks (the oldest block first).
+
+        """
+        for position in reversed(range(self.count)):
+            yield self.slots[(self.tip - position) % self.size]
+
+    def __contains__(self, block: Block) -> bool:
+        """Check whether the same block (by its hash) is cached.
+
+        """
+        return self.hashes.get(block.hash) == block.index
+
+    def add(self, block: Block) -> bool:
+        """Adds a block on top of the cached blocks (the oldest block is dropped if the cache is full).
+
+        :param block: Block that follows the newest block.
+        :type block: :py:class:`blockchain.Block`
+
+        :return: Status whether the block was added (it must follow the newest block).
+        :rtype: bool
+        """
+        with self.lock:
+            if self.count and not block.index == self.tip + 1:
+                return False
+
+            slot = block.index % self.size
+
+            # Drop the block that used the slot before
+            if self.count == self.size:
+                self.forget(self.slots[slot])
+
+            else:
+                self.count += 1
+
+            self.slots[slot] = block
+            self.tip = block.index
+
+            self.hashes[block.hash] = block.index
+
+            for tx in block.tx:
+                self.tx_hashes[tx.hash] = block.index
+
+        return True
+
+    def forget(self, block: Block):
+        """Removes the hashes of a block that leaves the cache (the lock must be held).
+
+        :param block: Block that leaves the cache.
+        :type block: :py:class:`blockchain.Block`
+        """
+        if self.hashes.get(block.hash) == block.index:
+            del self.hashes[block.hash]
+
+        for tx in block.tx:
+            if self.tx_hashes.get(tx.hash) == block.index:
+                del self.tx_hashes[tx.hash]
+
+    def get(self, index: int) -> Block | None:
+        """Returns a cached block from its index.
+
+        :param index: Index of the block.
+        :type index: int
+
+        :return: Block or None if it is not cached.
+        :rtype: :py:class:`blockchain.Block` | NoneType
+        """
+        with self.lock:
+            block = self.slots[index % self.size] if self.tip - self.count < index <= self.tip else None
+
+            # The slot is shared with the blocks whose indices differ by the size
+            if block is None or not block.index == index:
+                self.misses += 1
+
+                return None
+
+            self.hits += 1
+
+        return block
+
+    def get_by_hash(self, block_hash: str) -> Block | None:
+        """Returns a cached block from its hash.
+
+        :param block_hash: Hash of the block.
+        :type block_hash: str (hex-digest)
+
+        :return: Block or None if it is not cached.
+        :rtype: :py:class:`blockchain.Block` | NoneType
+        """
+        index = self.hashes.get(block_hash)
 
+        return None if index is None else self.get(index)
 
-def load_cache():
-    """Loads the last 100 blocks from the chain.
+    def tx_block_index(self, tx_hash: str) -> int | None:
+        """Returns the index of the cached block that includes a transaction.
+
+        :param tx_hash: Hash of the transaction.
+        :type tx_hash: str (hex-digest)
+
+        :return: Index of the block or None if the transaction is not in a cached block.
+        :rtype: int | NoneType
+        """
+        return self.tx_hashes.get(tx_hash)
+
+
+class CompressedBlockCache:
+    def __init__(self, budget: int = BLOCK_CACHE_MEMORY):
+        """Set the warm tier up: older blocks that were accessed recently are kept compressed, the least recently used
+           block is dropped when the memory budget is exceeded.
+
+        :param budget: Most bytes the compressed blocks use.
+        :type budget: int
+        """
+        self.budget = budget
+
+        # Compressed blocks by their indices (the least recently used block first)
+        self.blocks = OrderedDict()
+        self.memory = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        # The rpc threads and the processor use the cache at the same time
+        self.lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self.blocks)
+
+    def get(self, index: int) -> Block | None:
+        """Returns a block from its index (the block becomes the most recently used one).
+
+        :param index: Index of the block.
+        :type index: int
+
+        :return: Block or None if it is not cached.
+        :rtype: :py:class:`blockchain.Block` | NoneType
+        """
+        with self.lock:
+            data = self.blocks.get(index)
+
+            if data is None:
+                self.misses += 1
+
+                return None
+
+            self.blocks.move_to_end(index)
+            self.hits += 1
+
+        # The block was serialized by this process, so it is restored without parsing or checking it again
+        return loads(decompress(data))
+
+    def put(self, block: Block) -> bool:
+        """Adds a block (the least recently used blocks are dropped until it fits into the budget).
+
+        :param block: Block to add.
+        :type block: :py:class:`blockchain.Block`
+
+        :return: Status whether the block was added (blocks that are bigger than the budget are not).
+        :rtype: bool
+        """
+        data = compress(dumps(block, HIGHEST_PROTOCOL))
+        size = getsizeof(data)
+
+        if size > self.budget:
+            return False
+
+        with self.lock:
+            self.remove(block.index)
+
+            while self.blocks and self.memory + size > self.budget:
+                _, dropped = self.blocks.popitem(last=False)
+
+                self.memory -= getsizeof(dropped)
+                self.evictions += 1
+
+            self.blocks[block.index] = data
+            self.memory += size
+
+        return True
+
+    def discard(self, index: int):
+        """Removes a block (its index got a different block).
+
+        :param index: Index of the block.
+        :type index: int
+        """
+        with self.lock:
+            self.remove(index)
+
+    def remove(self, index: int):
+        """Removes a block (the lock must be held).
+
+        :param index: Index of the block.
+        :type index: int
+        """
+        data = self.blocks.pop(index, None)
+
+        if data is not None:
+            self.memory -= getsizeof(data)
+
+    def clear(self):
+        """Removes all blocks (the statistics are kept).
+
+        """
+        with self.lock:
+            self.blocks.clear()
+            self.memory = 0
+
+    @property
+    def stats(self) -> dict:
+        """Returns the statistics of the cache.
+
+        :return: Amount of blocks, used memory and budget (in bytes), hits, misses, hit-rate and evictions.
+        :rtype: dict
+        """
+        lookups = self.hits + self.misses
+
+        return {
+            'blocks': len(self.blocks),
+            'memory': self.memory,
+            'budget': self.budget,
+
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.,
+
+            'evictions': self.evictions
+        }
+
+
+def load_cache(size: int = BLOCK_CACHE_SIZE):
+    """Loads the last blocks from the chain.
+
+    :param size: Most blocks that are kept.
+    :type size: int
 
     :return: Status when no blocks are available or fetchable
     :rtype: bool
-    :return: List of blocks.
-    :rtype: :py:class:`blockchain.Block`
+    :return: Cache of the last blocks.
+    :rtype: :py:class:`util.database.cache.BlockCache`
     """
-    biggest_index = Database.fetchone_from_db('SELECT MAX(block_index) AS block_index FROM blockchain', { })
-
-    if not type(biggest_index) == int:
-        biggest_index = biggest_index[0]
+    biggest_index = fetch_last_index()
 
     # Check if there are any blocks
     if not biggest_index:
         return False
 
     # Set the cache up
-    last_blocks = [ ]
+    last_blocks = BlockCache(size)
 
-    if biggest_index == 1:
-        block_dict = fetch_block(1)
-
-        block = Block()
+    # Fetch all blocks that come into the cache at once
+    for block_dict in fetch_blocks(max(biggest_index - last_blocks.size + 1, 1), biggest_index):
+        block = Block(base_fee=False)
         block.from_dict(block_dict)
-        last_blocks.append(block)
-
-        return last_blocks
-
-    # Go through all blocks that come into the cache
-    for x in reversed(range(biggest_index - 100, biggest_index + 1)):
-        # Check if no more blocks can be fetched
-        if x < 0:
-            return last_blocks
 
-        block_dict = fetch_block(x)
-
-        block = Block()
-        block.from_dict(block_dict)
-        last_blocks.append(block)
+        # A gap in the chain starts the cache again
+        if not last_blocks.add(block):
+            last_blocks = BlockCache(size, [block])
 
     return last_blocks
@@ -1,18 +1,25 @@
 # Database handling
-from sqlite3 import connect, Connection
+from sqlite3 import Connection
+from atexit import register as register_exit
 
 from queue import Queue
 from threading import Thread, Event
-
-from time import sleep as time_sleep
+from contextlib import contextmanager
 
 # Path of the database
 from __init__ import DATABASE_FILE
 
 from util.database.initialize import create_database
+from util.database.pool import ConnectionPool
 
 
 class Database:
+    # Long-lived read-only connections shared by every database user of this process
+    pool = ConnectionPool(DATABASE_FILE, read_only=True)
+
+    # Single connection that serializes all writes
+    writer = ConnectionPool(DATABASE_FILE, size=1)
+
     def __init__(self, manual=False):
         """Sets up the database connection values.
 
@@ -43,12 +50,10 @@ class Database:
 
         :return: Status whether the execution was successful or not.
         """
-        # Set the database connection up
-        connection = connect(DATABASE_FILE)
-
-        # Try to execute the sql and wait for the response
+        # Try to execute the sql on the writing connection and wait for the response
         try:
-            cls.execute_sql(connection, sql_command, sql_data)
+            with cls.writer.connection() as connection:
+                cls.execute_sql(connection, sql_command, sql_data, commit=True)
 
         except:
             # Development Log
@@ -70,11 +75,9 @@ class Database:
         :return: Response of the database.
         """
 
-        # Set the database connection up
-        connection = connect(DATABASE_FILE)
-
-        # Execute the sql and wait for the response
-        response = cls.execute_sql(connection, sql_command, sql_data, 'one')
+        # Execute the sql on a read-only connection and wait for the response
+        with cls.pool.connection() as connection:
+            response = cls.execute_sql(connection, sql_command, sql_data, 'one')
 
         return response
 
@@ -90,16 +93,36 @@ class Database:
         :return: Response of the database.
         """
 
-        # Set the database connection up
-        connection = connect(DATABASE_FILE)
-
-        # Execute the sql and wait for the response
-        response = cls.execute_sql(connection, sql_command, sql_data, 'all')
+        # Execute the sql on a read-only connection and wait for the response
+        with cls.pool.connection() as connection:
+            response = cls.execute_sql(connection, sql_command, sql_data, 'all')
 
         return response
 
+    @classmethod
+    @contextmanager
+    def transaction(cls):
+        """Runs all statements of the with-block in one transaction on the writing connection (rolled back if an
+           error occurs).
+
+        :return: Cursor of the writing connection.
+        :rtype: :py:class:`sqlite3.Cursor`
+        """
+        with cls.writer.connection() as connection:
+            cursor = connection.cursor()
+
+            try:
+                yield cursor
+
+                # Commit everything at once
+                connection.commit()
+
+            finally:
+                cursor.close()
+
     @staticmethod
-    def execute_sql(connection: Connection, sql_command: str, executing_args: dict = None, fetch=None):
+    def execute_sql(connection: Connection, sql_command: str, executing_args: dict = None, fetch=None,
+                    commit=False):
         """Execute the given sql.
 
         :param connection: Connection to the database.
@@ -110,6 +133,8 @@ class Database:
         :type executing_args: dict
         :param fetch: Provides information about anything, that the execution wants to fetch from the database.
         :type fetch: str ('one', 'all' or None)
+        :param commit: Whether the changes should be committed (reads skip the commit).
+        :type commit: bool
 
         :return: If fetch is not none, return the response of the database.
         """
@@ -128,7 +153,9 @@ class Database:
             response = cursor.fetchall()
 
         # Commit the changes and close the cursor
-        connection.commit()
+        if commit:
+            connection.commit()
+
         cursor.close()
 
         return response
@@ -138,29 +165,38 @@ class Database:
 
         """
 
-        # Set the database connection up
-        connection = connect(DATABASE_FILE)
-
         # Run until the connection stops
         while not self.stop_event.is_set():
-            # Check if the queue is empty
-            if self.db_q.empty():
-                time_sleep(.01)
+            # Wait for the next task (stop puts None into the queue to wake the handler up)
+            sql_data = self.db_q.get()
+
+            if sql_data is None:
                 continue
 
-            # Fetch the values from the queue
-            sql_data = self.db_q.get()
+            self.handle_task(sql_data)
+
+    @classmethod
+    def handle_task(cls, sql_data: tuple):
+        """Executes one task of the database-queue.
+
+        :param sql_data: Command, its arguments, what to fetch ('one', 'all' or None) and a queue for the response
+                         (everything after the command is optional).
+        :type sql_data: tuple
+        """
+        # If the sql_data is too small, append empty data to fill the space
+        while len(sql_data) < 4:
+            sql_data += (None,)
 
-            # If the sql_data is too small, append empty data to fill the space
-            while len(sql_data) < 4:
-                sql_data += (None,)
+        # Reads go to a read-only connection, everything else to the writing connection
+        pool = cls.pool if sql_data[2] else cls.writer
 
-            # Execute the sql and wait for the response
-            response = self.execute_sql(connection, sql_data[0], sql_data[1], sql_data[2])
+        # Execute the sql and wait for the response
+        with pool.connection() as connection:
+            response = cls.execute_sql(connection, sql_data[0], sql_data[1], sql_data[2], commit=not sql_data[2])
 
-            # Check if a queue was provided to push the response to
-            if sql_data[3]:
-                sql_data[3].put(response)
+        # Check if a queue was provided to push the response to
+        if sql_data[3]:
+            sql_data[3].put(response)
 
     def fetchone(self, sql_command: str, sql_data: dict):
         """Fetches one response from the database.
@@ -180,10 +216,6 @@ class Database:
         self.db_q.put((sql_command, sql_data, 'one', query_queue))
 
         # Wait until the data arrives
-        while query_queue.empty():
-            time_sleep(.01)
-
-        # Return the data
         return query_queue.get()
 
     def fetchall(self, sql_command: str, sql_data: dict):
@@ -204,12 +236,16 @@ class Database:
         self.db_q.put((sql_command, sql_data, 'all', query_queue))
 
         # Wait until the data arrives
-        while query_queue.empty():
-            time_sleep(.01)
-
-        # Return the data
         return query_queue.get()
 
+    @classmethod
+    def close_connections(cls):
+        """Closes all pooled database connections (they get reopened on the next database access).
+
+        """
+        cls.pool.close()
+        cls.writer.close()
+
     def start(self):
         """Starts the database-thread manually.
 
@@ -245,8 +281,9 @@ class Database:
         # if self.stop_event.is_set():
         #     return False
 
-        # Stop the database-handler
+        # Stop the database-handler (and wake it up if it waits for a task)
         self.stop_event.set()
+        self.db_q.put(None)
 
         return True
 
@@ -264,9 +301,8 @@ class Database:
         # Stop the database
         self.stop()
 
-        # Wait until stop is injected
-        while self.db_thread.is_alive():
-            time_sleep(.01)
+        # Wait until the thread has finished
+        self.db_thread.join()
 
         # Start the database
         self.start()
@@ -276,3 +312,7 @@ class Database:
             return False
 
         return True
+
+
+# Close the pooled connections when the program exits
+register_exit(Database.close_connections)
@@ -9,8 +9,10 @@ from os.path import dirname, abspath, join
 
 path.insert(0, join(dirname(abspath(__file__)), '..', '..'))
 
-from __init__ import DATABASE_FILE, LOG_LEVEL
+from __init__ import DATABASE_FILE, LOG_LEVEL, STORAGE_PROFILE, STORAGE_PROFILES
 from util.log.logger import init_logger
+from util.database.pool import apply_pragmas
+from util.database.migrations import migrate
 
 
 def create_tables(cursor):
@@ -47,10 +49,19 @@ def create_database(overwrite=False):
     if exists(DATABASE_FILE) and not overwrite:
         log_warning('Database already exists, not overwriting')
 
+        # Upgrade the schema of the existing database
+        connection = connect(DATABASE_FILE)
+        migrate(connection)
+        connection.close()
+
         return False
 
     # Create the file
     connection = connect(DATABASE_FILE)
+
+    # Apply the storage profile (the journal mode is kept by the file itself)
+    apply_pragmas(connection, STORAGE_PROFILES[STORAGE_PROFILE])
+
     cursor = connection.cursor()
 
     # Create the tables
@@ -59,6 +70,13 @@ def create_database(overwrite=False):
     # Commit and close connection
     connection.commit()
     cursor.close()
+
+    # Bring the schema up to the newest version
+    success = migrate(connection)
+
     connection.close()
 
+    if not success:
+        return False
+
     return True
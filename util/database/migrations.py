@@ -0,0 +1,109 @@
+from logging import info as log_info, error as log_error
+from sqlite3 import Connection, Error as SQLiteError
+from os import listdir
+from os.path import dirname, abspath, join
+
+# Directory of the migration-scripts (named "<version>_<description>.sql")
+MIGRATIONS_PATH = join(dirname(abspath(__file__)), 'sql', 'migrations')
+
+
+def fetch_migrations():
+    """Fetch all migration-scripts sorted by their version.
+
+    :return: List of the versions and the paths of the scripts.
+    :rtype: [ (int, str) ]
+    """
+    migrations = []
+
+    for file_name in listdir(MIGRATIONS_PATH):
+        # Skip everything that is not a migration-script
+        if not file_name.endswith('.sql'):
+            continue
+
+        migrations.append((int(file_name.split('_')[0]), join(MIGRATIONS_PATH, file_name)))
+
+    migrations.sort(key=lambda migration: migration[0])
+
+    return migrations
+
+
+def duplicate_transactions(connection: Connection) -> list:
+    """Fetch the transactions that are included more than once (they prevent the unique index of migration 1).
+
+    :param connection: Connection to the database.
+    :type connection: :py:class:`sqlite3.Connection`
+
+    :return: Hashes of the transactions and the indices of the blocks that include them.
+    :rtype: [ (str, str) ]
+    """
+    return connection.execute('SELECT hash, GROUP_CONCAT(block_index) FROM transactions GROUP BY hash HAVING '
+                              'COUNT(*) > 1').fetchall()
+
+
+# Checks that have to pass before a migration is applied (they return the rows that prevent it)
+MIGRATION_CHECKS = {
+    1: duplicate_transactions
+}
+
+
+def schema_version(connection: Connection) -> int:
+    """Fetch the schema version of the database.
+
+    :param connection: Connection to the database.
+    :type connection: :py:class:`sqlite3.Connection`
+
+    :return: Version of the last applied migration (0 if none was applied).
+    :rtype: int
+    """
+    return connection.execute('PRAGMA user_version').fetchone()[0]
+
+
+def migrate(connection: Connection) -> bool:
+    """Upgrade the database in place by applying all migrations that are newer than its schema version.
+
+    :param connection: Connection to the database.
+    :type connection: :py:class:`sqlite3.Connection`
+
+    :return: Status whether all migrations were applied or not.
+    :rtype: bool
+    """
+    current_version = schema_version(connection)
+
+    for version, migration_file in fetch_migrations():
+        # Check if the migration was already applied
+        if version <= current_version:
+            continue
+
+        # Check if the data allows the migration (the ledger is never rewritten to make it fit)
+        check = MIGRATION_CHECKS.get(version)
+
+        if check:
+            conflicts = check(connection)
+
+            if conflicts:
+                log_error(f'Database migration {version} failed: {len(conflicts)} conflicting rows found')
+
+                for conflict in conflicts:
+                    log_error(f'Database migration {version} conflict: {conflict}')
+
+                return False
+
+        with open(migration_file) as sql_file:
+            sql_script = sql_file.read()
+
+        # Apply the migration and its version in one transaction
+        try:
+            connection.executescript(f'BEGIN;\n{sql_script}\nPRAGMA user_version = {version};\nCOMMIT;')
+
+        except SQLiteError as error:
+            connection.rollback()
+
+            log_error(f'Database migration {version} failed: {error}')
+
+            return False
+
+        log_info(f'Applied database migration {version}')
+
+        current_version = version
+
+    return True
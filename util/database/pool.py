@@ -0,0 +1,169 @@
+# Connection pooling
+from sqlite3 import connect, Connection
+
+from threading import Condition, local
+from contextlib import contextmanager
+
+# Add to path
+from sys import path
+from os.path import dirname, abspath, join
+
+path.insert(0, join(dirname(abspath(__file__)), '..', '..'))
+
+from __init__ import DATABASE_POOL_SIZE, STORAGE_PROFILE, STORAGE_PROFILES
+
+
+def apply_pragmas(connection: Connection, pragmas: dict):
+    """Applies pragmas to a database connection.
+
+    :param connection: Connection to configure.
+    :type connection: :py:class:`sqlite3.Connection`
+    :param pragmas: Names of the pragmas and their values.
+    :type pragmas: dict
+    """
+    for name, value in pragmas.items():
+        connection.execute(f'PRAGMA {name} = {value}')
+
+
+class ConnectionPool:
+    def __init__(self, database_file: str, size: int = DATABASE_POOL_SIZE, read_only: bool = False,
+                 profile: str = STORAGE_PROFILE):
+        """Sets up a pool of long-lived database connections.
+
+        :param database_file: Path of the database-file.
+        :type database_file: str
+        :param size: Maximal amount of connections that are open at the same time.
+        :type size: int
+        :param read_only: Whether the connections are only allowed to read from the database.
+        :type read_only: bool
+        :param profile: Name of the storage profile to apply to the connections.
+        :type profile: str
+        """
+        self.database_file = database_file
+        self.size = size
+
+        self.read_only = read_only
+        self.pragmas = STORAGE_PROFILES[profile]
+
+        # Connections that are currently not in use and all connections the pool has opened
+        self.idle = []
+        self.connections = []
+
+        # Guards the connection lists and wakes up threads that wait for a free connection
+        self.condition = Condition()
+
+        # Remembers the connection a thread used last (and the one it is currently holding)
+        self.local = local()
+
+    def open_connection(self) -> Connection:
+        """Opens a new connection to the database.
+
+        :return: New database connection.
+        :rtype: :py:class:`sqlite3.Connection`
+        """
+        # Connections are handed between threads, the pool makes sure only one thread uses them at a time
+        connection = connect(self.database_file, check_same_thread=False)
+
+        apply_pragmas(connection, self.pragmas)
+
+        # Refuse any write on reading connections
+        if self.read_only:
+            connection.execute('PRAGMA query_only = ON')
+
+        return connection
+
+    def acquire(self) -> Connection:
+        """Takes a connection from the pool (the connection the thread used last is preferred).
+
+        :return: Database connection that is reserved for the calling thread.
+        :rtype: :py:class:`sqlite3.Connection`
+        """
+        last_connection = getattr(self.local, 'last_connection', None)
+
+        with self.condition:
+            while True:
+                # Reuse the connection of this thread if it is still free
+                if last_connection is not None and last_connection in self.idle:
+                    self.idle.remove(last_connection)
+
+                    return last_connection
+
+                # Take any free connection
+                if self.idle:
+                    connection = self.idle.pop()
+                    self.local.last_connection = connection
+
+                    return connection
+
+                # Open a new connection if the pool is not full yet
+                if len(self.connections) < self.size:
+                    connection = self.open_connection()
+
+                    self.connections.append(connection)
+                    self.local.last_connection = connection
+
+                    return connection
+
+                # Wait until another thread releases its connection
+                self.condition.wait()
+
+    def release(self, connection: Connection):
+        """Gives a connection back to the pool.
+
+        :param connection: Connection that was taken from the pool.
+        :type connection: :py:class:`sqlite3.Connection`
+        """
+        with self.condition:
+            # The pool was closed while the connection was in use
+            if connection not in self.connections:
+                connection.close()
+
+                return
+
+            self.idle.append(connection)
+            self.condition.notify()
+
+    @contextmanager
+    def connection(self):
+        """Reserves a connection for the duration of the with-block (nested blocks share the same connection).
+
+        :return: Database connection.
+        :rtype: :py:class:`sqlite3.Connection`
+        """
+        # Check if the thread already holds a connection
+        held_connection = getattr(self.local, 'held_connection', None)
+
+        if held_connection is not None:
+            yield held_connection
+
+            return
+
+        connection = self.acquire()
+        self.local.held_connection = connection
+
+        try:
+            yield connection
+
+        except BaseException:
+            # Do not hand out a connection with a half-finished transaction
+            connection.rollback()
+
+            raise
+
+        finally:
+            self.local.held_connection = None
+            self.release(connection)
+
+    def close(self):
+        """Closes all connections of the pool (connections in use get closed as soon as they are released).
+
+        """
+        with self.condition:
+            for connection in self.idle:
+                connection.close()
+
+            self.idle = []
+            self.connections = []
+
+            # Let waiting threads open fresh connections
+            self.condition.notify_all()
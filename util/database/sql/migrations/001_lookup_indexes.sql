@@ -0,0 +1,19 @@
+-- Migration 001: Indexes for the block and transaction lookups
+
+-- Transaction by its hash (fetch_transaction_block_index), the migration fails if a transaction is included twice
+-- (stored blocks are never changed to make the hash unique)
+CREATE UNIQUE INDEX IF NOT EXISTS transactions_hash ON transactions (hash);
+
+-- Transactions of an account as sender or recipient, optionally filtered by type and maximal block index
+-- (fetch_transactions)
+CREATE INDEX IF NOT EXISTS transactions_sender ON transactions (sender, type, block_index);
+CREATE INDEX IF NOT EXISTS transactions_recipient ON transactions (recipient, type, block_index);
+
+-- Transactions of a block (fetch_block)
+CREATE INDEX IF NOT EXISTS transactions_block_index ON transactions (block_index);
+
+-- Block by its timestamp (fetch_block_from_timestamp)
+CREATE INDEX IF NOT EXISTS blockchain_timestamp ON blockchain (timestamp);
+
+-- Block by its hash and signature (fetch_block_from_signature)
+CREATE INDEX IF NOT EXISTS blockchain_hash ON blockchain (hash, signature);
@@ -0,0 +1,22 @@
+-- Migration 002: Materialized account state (maintained by add_block, rebuildable from the chain)
+
+-- Balance, stake and claimed rewards of every account
+CREATE TABLE IF NOT EXISTS account_state (
+    public_key VARCHAR(128) PRIMARY KEY,
+
+    balance DECIMAL NOT NULL DEFAULT 0,
+    stake DECIMAL NOT NULL DEFAULT 0,
+    claims DECIMAL NOT NULL DEFAULT 0
+);
+
+-- Staked amounts that were not unstaked yet (the age of a lot is used for the staking score)
+CREATE TABLE IF NOT EXISTS stake_lots (
+    public_key VARCHAR(128) NOT NULL,
+
+    amount DECIMAL NOT NULL,
+    timestamp DECIMAL NOT NULL,
+
+    block_index INT(32) NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS stake_lots_public_key ON stake_lots (public_key, timestamp);
@@ -0,0 +1,29 @@
+-- Migration 003: History of the account state (per-block changes and periodic checkpoints)
+
+-- Changes of the account state by every block
+CREATE TABLE IF NOT EXISTS account_deltas (
+    block_index INT(32) NOT NULL,
+    public_key VARCHAR(128) NOT NULL,
+
+    balance DECIMAL NOT NULL,
+    stake DECIMAL NOT NULL,
+    claims DECIMAL NOT NULL,
+
+    PRIMARY KEY (public_key, block_index)
+);
+
+-- Full account state after every checkpoint block
+CREATE TABLE IF NOT EXISTS account_checkpoints (
+    block_index INT(32) NOT NULL,
+    public_key VARCHAR(128) NOT NULL,
+
+    balance DECIMAL NOT NULL,
+    stake DECIMAL NOT NULL,
+    claims DECIMAL NOT NULL,
+
+    PRIMARY KEY (public_key, block_index)
+);
+
+-- Reset the account state, so that it gets rebuilt together with its history
+DELETE FROM account_state;
+DELETE FROM stake_lots;
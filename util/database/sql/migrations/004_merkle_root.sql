@@ -0,0 +1,4 @@
+-- Migration 004: Merkle-root of the transactions of every block
+
+-- Blocks that were stored before the merkle-root existed keep it empty
+ALTER TABLE blockchain ADD COLUMN merkle_root VARCHAR(64);
@@ -0,0 +1,7 @@
+-- Migration 005: Transaction count of every block (block-headers are read without touching the transactions)
+
+ALTER TABLE blockchain ADD COLUMN tx_count INT(32) NOT NULL DEFAULT 0;
+
+-- Count the transactions of the blocks that are already stored
+UPDATE blockchain SET tx_count = (SELECT COUNT(*) FROM transactions WHERE
+                                  transactions.block_index = blockchain.block_index);
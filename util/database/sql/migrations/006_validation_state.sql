@@ -0,0 +1,11 @@
+-- Migration 006: Watermark of the chain validation (periodic checks only validate the blocks after it)
+
+-- Last block up to which the chain was validated (at most one row)
+CREATE TABLE IF NOT EXISTS validation_state (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+
+    block_index INT(32) NOT NULL,
+    block_hash VARCHAR(64) NOT NULL,
+
+    validated_at DECIMAL NOT NULL
+);
@@ -0,0 +1,326 @@
+from sqlite3 import Cursor
+
+# Add to path
+from sys import path
+from os.path import dirname, abspath, join
+
+path.insert(0, join(dirname(abspath(__file__)), '..', '..'))
+
+from __init__ import STATE_CHECKPOINT_INTERVAL
+from blockchain.encoding import parse_timestamp
+
+# Database-connector
+from util.database.database import Database
+
+
+def tx_state_changes(tx_dict: dict) -> list:
+    """Calculates how a transaction changes the state of the involved accounts.
+
+    :param tx_dict: Information of a transaction as dict-format.
+    :type tx_dict: dict
+
+    :return: List of the public-keys with their balance-, stake- and claims-change.
+    :rtype: [ (str, float, float, float) ]
+    """
+    sender, recipient = tx_dict['sender'], tx_dict['recipient']
+    amount, fee = tx_dict['amount'], tx_dict['fee']
+
+    match tx_dict['type']:
+        case 'tx':
+            # Transactions to itself do not change anything
+            if sender == recipient:
+                return []
+
+            return [(sender, -(amount + fee), 0, 0), (recipient, amount, 0, 0)]
+
+        case 'stake':
+            return [(sender, -(amount + fee), 0, 0), (recipient, 0, amount - fee, 0)]
+
+        case 'unstake':
+            return [(sender, 0, -(amount - fee), 0), (recipient, amount - fee, 0, 0)]
+
+        case 'claim':
+            return [(recipient, amount - fee, 0, amount - fee)]
+
+    return []
+
+
+def apply_tx_lots(cursor: Cursor, tx_dict: dict, block_index: int):
+    """Adds or consumes the stake-lots of a stake- or unstake-transaction.
+
+    :param cursor: Cursor of the writing connection.
+    :type cursor: :py:class:`sqlite3.Cursor`
+    :param tx_dict: Information of a transaction as dict-format.
+    :type tx_dict: dict
+    :param block_index: Index of the block that includes the transaction.
+    :type block_index: int
+    """
+    # Every stake becomes a new lot of the recipient
+    if tx_dict['type'] == 'stake':
+        # Timestamps without microseconds are stored without their fraction
+        timestamp = parse_timestamp(tx_dict['timestamp']) / 1_000_000
+
+        cursor.execute('INSERT INTO stake_lots VALUES (:public_key, :amount, :timestamp, :block_index)',
+                       {'public_key': tx_dict['recipient'], 'amount': tx_dict['amount'],
+                        'timestamp': timestamp, 'block_index': block_index})
+
+        return
+
+    if not tx_dict['type'] == 'unstake':
+        return
+
+    amount_left = tx_dict['amount']
+
+    # Unstaking consumes the youngest lots first
+    lots = cursor.execute('SELECT rowid, amount FROM stake_lots WHERE public_key = :public_key ORDER BY timestamp '
+                          'DESC, rowid DESC', {'public_key': tx_dict['sender']}).fetchall()
+
+    for rowid, amount in lots:
+        if amount_left <= 0:
+            break
+
+        # Check if the whole lot gets unstaked
+        if amount_left >= amount:
+            cursor.execute('DELETE FROM stake_lots WHERE rowid = :rowid', {'rowid': rowid})
+
+        else:
+            cursor.execute('UPDATE stake_lots SET amount = :amount WHERE rowid = :rowid',
+                           {'amount': amount - amount_left, 'rowid': rowid})
+
+        amount_left -= amount
+
+
+def apply_block_state(cursor: Cursor, block_dict: dict) -> list:
+    """Applies the transactions of a block to the account state (must run in the transaction of the block insert).
+
+    :param cursor: Cursor of the writing connection.
+    :type cursor: :py:class:`sqlite3.Cursor`
+    :param block_dict: Dictionary of block-information.
+    :type block_dict: dict
+
+    :return: Changes of the block per account.
+    :rtype: [ dict ]
+    """
+    changes = {}
+
+    for tx_dict in block_dict['tx']:
+        # Sum the changes up per account
+        for public_key, balance, stake, claims in tx_state_changes(tx_dict):
+            previous = changes.get(public_key, (0, 0, 0))
+            changes[public_key] = (previous[0] + balance, previous[1] + stake, previous[2] + claims)
+
+        apply_tx_lots(cursor, tx_dict, block_dict['index'])
+
+    changes = [{'index': block_dict['index'], 'public_key': public_key, 'balance': change[0], 'stake': change[1],
+                'claims': change[2]} for public_key, change in changes.items()]
+
+    # Write one row per account
+    cursor.executemany('INSERT INTO account_state (public_key, balance, stake, claims) VALUES (:public_key, '
+                       ':balance, :stake, :claims) ON CONFLICT(public_key) DO UPDATE SET '
+                       'balance = balance + excluded.balance, stake = stake + excluded.stake, '
+                       'claims = claims + excluded.claims', changes)
+
+    # Keep the changes of this block for point-in-time queries
+    cursor.executemany('INSERT INTO account_deltas VALUES (:index, :public_key, :balance, :stake, :claims)', changes)
+
+    # Save the full state at every checkpoint
+    if block_dict['index'] % STATE_CHECKPOINT_INTERVAL == 0:
+        cursor.execute('INSERT INTO account_checkpoints SELECT :index, public_key, balance, stake, claims FROM '
+                       'account_state', {'index': block_dict['index']})
+
+    return changes
+
+
+def shift_checkpoints(cursor: Cursor, index: int, changes: list):
+    """Adds the changes of a block to all checkpoints after it (needed when a block in the past changes).
+
+    :param cursor: Cursor of the writing connection.
+    :type cursor: :py:class:`sqlite3.Cursor`
+    :param index: Index of the block.
+    :type index: int
+    :param changes: Changes of the block per account.
+    :type changes: [ dict ]
+    """
+    # Accounts that did not exist at a checkpoint get their row
+    cursor.executemany('INSERT INTO account_checkpoints (block_index, public_key, balance, stake, claims) SELECT '
+                       'DISTINCT block_index, :public_key, :balance, :stake, :claims FROM account_checkpoints WHERE '
+                       'block_index > :index ON CONFLICT(public_key, block_index) DO UPDATE SET '
+                       'balance = balance + excluded.balance, stake = stake + excluded.stake, '
+                       'claims = claims + excluded.claims', [{**change, 'index': index} for change in changes])
+
+
+def revert_block_state(cursor: Cursor, index: int):
+    """Takes the changes of a block back from the account state and its history (the stake-lots are not touched,
+       see :py:func:`rebuild_stake_lots`).
+
+    :param cursor: Cursor of the writing connection.
+    :type cursor: :py:class:`sqlite3.Cursor`
+    :param index: Index of the block.
+    :type index: int
+    """
+    changes = [{'index': index, 'public_key': public_key, 'balance': -balance, 'stake': -stake, 'claims': -claims}
+               for public_key, balance, stake, claims in
+               cursor.execute('SELECT public_key, balance, stake, claims FROM account_deltas WHERE block_index = '
+                              ':index', {'index': index}).fetchall()]
+
+    cursor.executemany('UPDATE account_state SET balance = balance + :balance, stake = stake + :stake, '
+                       'claims = claims + :claims WHERE public_key = :public_key', changes)
+
+    shift_checkpoints(cursor, index, changes)
+
+    cursor.execute('DELETE FROM account_checkpoints WHERE block_index = :index', {'index': index})
+    cursor.execute('DELETE FROM account_deltas WHERE block_index = :index', {'index': index})
+
+
+def changes_stake_lots(cursor: Cursor, index: int) -> bool:
+    """Check whether a stored block has stake- or unstake-transactions.
+
+    :param cursor: Cursor of the writing connection.
+    :type cursor: :py:class:`sqlite3.Cursor`
+    :param index: Index of the block.
+    :type index: int
+
+    :return: Whether the block changes the stake-lots or not.
+    :rtype: bool
+    """
+    return bool(cursor.execute('SELECT EXISTS (SELECT 1 FROM transactions WHERE block_index = :index AND type IN '
+                               '(\'stake\', \'unstake\'))', {'index': index}).fetchone()[0])
+
+
+def rebuild_stake_lots(cursor: Cursor):
+    """Recreates the stake-lots from the stake- and unstake-transactions of the chain (unstakes consume the lots that
+       are left at their time, so the lots can not be reverted block by block).
+
+    :param cursor: Cursor of the writing connection.
+    :type cursor: :py:class:`sqlite3.Cursor`
+    """
+    cursor.execute('DELETE FROM stake_lots')
+
+    for tx_data in cursor.execute('SELECT block_index, sender, recipient, amount, type, timestamp FROM transactions '
+                                  'WHERE type IN (\'stake\', \'unstake\') ORDER BY block_index, rowid').fetchall():
+        apply_tx_lots(cursor, {'sender': tx_data[1], 'recipient': tx_data[2], 'amount': tx_data[3],
+                               'type': tx_data[4], 'timestamp': tx_data[5]}, tx_data[0])
+
+
+def rebuild_account_state() -> bool:
+    """Recreates the account state and its history from all blocks of the chain.
+
+    :return: Status whether the rebuild was successful or not.
+    :rtype: bool
+    """
+    with Database.transaction() as cursor:
+        cursor.execute('DELETE FROM account_state')
+        cursor.execute('DELETE FROM stake_lots')
+        cursor.execute('DELETE FROM account_deltas')
+        cursor.execute('DELETE FROM account_checkpoints')
+
+        block_dict = None
+
+        # Replay the chain block by block (blocks without transactions are needed for the checkpoints)
+        for tx_data in cursor.execute('SELECT blockchain.block_index, sender, recipient, amount, fee, type, '
+                                      'transactions.timestamp FROM blockchain LEFT JOIN transactions ON '
+                                      'transactions.block_index = blockchain.block_index ORDER BY '
+                                      'blockchain.block_index, transactions.rowid').fetchall():
+            # Apply the block as soon as all of its transactions were collected
+            if block_dict and not block_dict['index'] == tx_data[0]:
+                apply_block_state(cursor, block_dict)
+                block_dict = None
+
+            if not block_dict:
+                block_dict = {'index': tx_data[0], 'tx': []}
+
+            # Check if the block has no transactions
+            if tx_data[1] is None:
+                continue
+
+            block_dict['tx'].append({'sender': tx_data[1], 'recipient': tx_data[2], 'amount': tx_data[3],
+                                     'fee': tx_data[4], 'type': tx_data[5], 'timestamp': tx_data[6]})
+
+        # Apply the last block
+        if block_dict:
+            apply_block_state(cursor, block_dict)
+
+    return True
+
+
+def fetch_account_state(public_key: str, index: int = None) -> dict:
+    """Fetch the state of an account (at the end of the given block).
+
+    :param public_key: Verifying key of the account.
+    :type public_key: str
+    :param index: Index of the block to use as last block (the current state if it is not set).
+    :type index: int | NoneType
+
+    :return: Balance, stake and claims of the account.
+    :rtype: dict
+    """
+    if index is None:
+        state = Database.fetchone_from_db('SELECT balance, stake, claims FROM account_state WHERE '
+                                          'public_key = :public_key', {'public_key': public_key})
+
+    else:
+        # Start from the last checkpoint and add the changes of the blocks after it
+        state = Database.fetchone_from_db(
+            'SELECT COALESCE(checkpoint.balance, 0) + COALESCE(deltas.balance, 0), '
+            'COALESCE(checkpoint.stake, 0) + COALESCE(deltas.stake, 0), '
+            'COALESCE(checkpoint.claims, 0) + COALESCE(deltas.claims, 0) FROM '
+            '(SELECT SUM(balance) AS balance, SUM(stake) AS stake, SUM(claims) AS claims FROM account_deltas WHERE '
+            'public_key = :public_key AND block_index > :checkpoint AND block_index <= :index) AS deltas LEFT JOIN '
+            'account_checkpoints AS checkpoint ON checkpoint.public_key = :public_key AND '
+            'checkpoint.block_index = :checkpoint',
+            {'public_key': public_key, 'index': index,
+             'checkpoint': index // STATE_CHECKPOINT_INTERVAL * STATE_CHECKPOINT_INTERVAL})
+
+    # Unknown accounts have an empty state
+    if not state:
+        return {'balance': 0, 'stake': 0, 'claims': 0}
+
+    return {'balance': state[0], 'stake': state[1], 'claims': state[2]}
+
+
+def fetch_stake_lots(public_key: str) -> list:
+    """Fetch the stake-lots of an account, that were not unstaked yet.
+
+    :param public_key: Verifying key of the account.
+    :type public_key: str
+
+    :return: List of the staked amounts and their timestamps (in seconds), the oldest first.
+    :rtype: [ (float, float) ]
+    """
+    lots = Database.fetchall_from_db('SELECT amount, timestamp FROM stake_lots WHERE public_key = :public_key '
+                                     'ORDER BY timestamp, rowid', {'public_key': public_key})
+
+    if not lots:
+        return []
+
+    return lots
+
+
+def fetch_all_stakes() -> tuple:
+    """Fetch the stake and the stake-lots of all accounts at once (one pass over the stake-lots).
+
+    :return: Stakes by public-key and the staked amounts and their timestamps (in seconds) by public-key, the oldest
+             first.
+    :rtype: (dict, dict)
+    """
+    stakes = dict(Database.fetchall_from_db('SELECT public_key, stake FROM account_state WHERE stake > 0', {}) or [])
+
+    lots = {}
+
+    for public_key, amount, timestamp in Database.fetchall_from_db('SELECT public_key, amount, timestamp FROM '
+                                                                   'stake_lots ORDER BY timestamp, rowid', {}) or []:
+        lots.setdefault(public_key, []).append((amount, timestamp))
+
+    return stakes, lots
+
+
+def account_state_empty() -> bool:
+    """Check whether the account state was not built yet although the chain contains transactions.
+
+    :return: Whether the account state has to be rebuilt or not.
+    :rtype: bool
+    """
+    state = Database.fetchone_from_db('SELECT EXISTS (SELECT 1 FROM account_state), EXISTS (SELECT 1 FROM '
+                                      'transactions)', {})
+
+    return not state[0] and bool(state[1])
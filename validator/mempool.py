@@ -0,0 +1,235 @@
+from heapq import heappush, heappop, heapify
+from collections import deque
+from itertools import count
+from threading import Lock
+from time import monotonic
+
+# Add to path
+from sys import path
+from os.path import dirname, abspath, join
+
+path.insert(0, join(dirname(abspath(__file__)), '..'))
+
+from __init__ import MEMPOOL_SIZE, MEMPOOL_TX_TTL, BLOCK_TX_LIMIT
+
+
+class Mempool:
+    def __init__(self, size: int = MEMPOOL_SIZE, ttl: float = MEMPOOL_TX_TTL):
+        """Set the pool of pending transactions up.
+
+        :param size: Most transactions that are kept.
+        :type size: int
+        :param ttl: Seconds until a transaction expires.
+        :type ttl: float
+        """
+        self.size = size
+        self.ttl = ttl
+
+        # Transactions with their arrival number, arrival time and whether their signature was verified by their
+        # hashes
+        self.transactions = {}
+
+        # Hashes of the transactions per sender
+        self.senders = {}
+
+        # Highest fee first (the fee includes the tip) and lowest fee first (for the eviction), entries of removed
+        # transactions are skipped when they come up
+        self.best = []
+        self.worst = []
+
+        # Hashes in the order of their arrival (for the expiry)
+        self.arrivals = deque()
+
+        # Arrival numbers keep transactions with the same fee in order
+        self.sequence = count()
+
+        self.lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self.transactions)
+
+    def __contains__(self, tx_hash: str) -> bool:
+        return tx_hash in self.transactions
+
+    def add(self, tx, verified: bool = True, age: float = 0) -> bool:
+        """Adds a transaction (the transaction with the lowest fee is dropped if the pool is full).
+
+        :param tx: Transaction to add.
+        :type tx: :py:class:`blockchain.Transaction`
+        :param verified: Whether the signature of the transaction was verified.
+        :type verified: bool
+        :param age: Seconds since the transaction arrived (transactions from a snapshot keep their age).
+        :type age: float
+
+        :return: Whether the transaction was added or not (duplicates and too cheap transactions are not).
+        :rtype: bool
+        """
+        with self.lock:
+            self.expire()
+
+            if tx.hash in self.transactions:
+                return False
+
+            # Check if the pool is full and the transaction pays less than all others
+            if len(self.transactions) >= self.size:
+                lowest = self.lowest()
+
+                if lowest is None or not tx.fee > self.transactions[lowest][0].fee:
+                    return False
+
+                self.discard(lowest)
+
+            sequence = next(self.sequence)
+
+            self.transactions[tx.hash] = (tx, sequence, monotonic() - age, verified)
+            self.senders.setdefault(tx.sender, set()).add(tx.hash)
+
+            heappush(self.best, (-tx.fee, sequence, tx.hash))
+            heappush(self.worst, (tx.fee, -sequence, tx.hash))
+            self.arrivals.append((sequence, tx.hash))
+
+            self.compact()
+
+        return True
+
+    def select(self, limit: int = BLOCK_TX_LIMIT) -> list:
+        """Picks the transactions with the highest fees for a new block (they stay in the pool until a block with them
+           is added to the chain).
+
+        :param limit: Most transactions to pick.
+        :type limit: int
+
+        :return: Transactions with the highest fee first.
+        :rtype: [ :py:class:`blockchain.Transaction` ]
+        """
+        with self.lock:
+            self.expire()
+
+            entries = []
+
+            # Only the picked transactions and the skipped entries are popped from the heap
+            while self.best and len(entries) < limit:
+                entry = heappop(self.best)
+
+                if self.current(entry[2], entry[1]):
+                    entries.append(entry)
+
+            for entry in entries:
+                heappush(self.best, entry)
+
+            return [self.transactions[tx_hash][0] for _, _, tx_hash in entries]
+
+    def remove(self, tx_hashes) -> int:
+        """Removes transactions (e.g. the ones that were included into a block).
+
+        :param tx_hashes: Hashes of the transactions.
+        :type tx_hashes: [ str ]
+
+        :return: Amount of removed transactions.
+        :rtype: int
+        """
+        with self.lock:
+            removed = sum(1 for tx_hash in tx_hashes if self.discard(tx_hash))
+
+            self.compact()
+
+        return removed
+
+    def entries(self) -> list:
+        """Returns all transactions with their verification status and age (the oldest first).
+
+        :return: Transactions, whether their signatures were verified and their ages in seconds.
+        :rtype: [ (:py:class:`blockchain.Transaction`, bool, float) ]
+        """
+        now = monotonic()
+
+        with self.lock:
+            return [(tx, verified, now - arrival) for tx, _, arrival, verified in sorted(
+                self.transactions.values(), key=lambda entry: entry[1])]
+
+    def by_sender(self, sender: str) -> list:
+        """Returns the pending transactions of a sender.
+
+        :param sender: Public-key of the sender.
+        :type sender: str (hex-digest)
+
+        :return: Transactions of the sender.
+        :rtype: [ :py:class:`blockchain.Transaction` ]
+        """
+        with self.lock:
+            return [self.transactions[tx_hash][0] for tx_hash in self.senders.get(sender, ())]
+
+    def current(self, tx_hash: str, sequence: int) -> bool:
+        """Check if a heap entry belongs to a transaction that is still in the pool (and was not added again since).
+
+        """
+        return tx_hash in self.transactions and self.transactions[tx_hash][1] == sequence
+
+    def lowest(self) -> str | None:
+        """Returns the hash of the transaction with the lowest fee (the newest one if several have the same fee).
+
+        """
+        while self.worst:
+            _, sequence, tx_hash = self.worst[0]
+
+            if self.current(tx_hash, -sequence):
+                return tx_hash
+
+            heappop(self.worst)
+
+        return None
+
+    def discard(self, tx_hash: str) -> bool:
+        """Removes a transaction from the indexes (its heap entries are skipped later on).
+
+        """
+        if tx_hash not in self.transactions:
+            return False
+
+        tx = self.transactions.pop(tx_hash)[0]
+
+        hashes = self.senders.get(tx.sender)
+
+        if hashes is not None:
+            hashes.discard(tx_hash)
+
+            if not hashes:
+                del self.senders[tx.sender]
+
+        return True
+
+    def expire(self):
+        """Removes the transactions that are older than the ttl (the oldest ones are always at the start).
+
+        """
+        deadline = monotonic() - self.ttl
+
+        while self.arrivals:
+            sequence, tx_hash = self.arrivals[0]
+
+            # Skip entries of removed transactions
+            if not self.current(tx_hash, sequence):
+                self.arrivals.popleft()
+                continue
+
+            if self.transactions[tx_hash][2] > deadline:
+                break
+
+            self.arrivals.popleft()
+            self.discard(tx_hash)
+
+    def compact(self):
+        """Rebuilds the heaps when most of their entries belong to removed transactions.
+
+        """
+        if len(self.best) + len(self.worst) <= 4 * len(self.transactions) + 64:
+            return
+
+        self.best = [(-tx.fee, sequence, tx_hash) for tx_hash, (tx, sequence, *_) in self.transactions.items()]
+        self.worst = [(tx.fee, -sequence, tx_hash) for tx_hash, (tx, sequence, *_) in self.transactions.items()]
+
+        heapify(self.best)
+        heapify(self.worst)
+
+        self.arrivals = deque((sequence, tx_hash) for tx_hash, (_, sequence, *_) in sorted(
+            self.transactions.items(), key=lambda item: item[1][1]))
@@ -1,9 +1,9 @@
 # Processor execution
 from threading import Thread, Event
-from queue import Queue
+from queue import Queue, Empty
 
 # Scheduling
-from time import sleep as time_sleep
+from time import monotonic
 from datetime import datetime, timezone, timedelta
 
 # Data transfer
@@ -19,18 +19,22 @@ from logging import basicConfig, info as log_info, error as log_error, warning a
 path.insert(0, join(dirname(abspath(__file__)), '..'))
 
 # Project modules
-from __init__ import DATABASE_FILE, LOG_LEVEL
+from __init__ import AUDIT_ON_START, DATABASE_FILE, LOG_LEVEL, MEMPOOL_SNAPSHOT_INTERVAL, RUNTIME
 from util.log.logger import init_logger
 
 from validator.validator import Validator
+from validator.mempool import Mempool
+from validator.snapshot import save_snapshot, load_snapshot
+from validator.runtime import AsyncRuntime
 from util.database.database import Database
+from util.database.blockchain import reset_chain
 
 from blockchain.transaction import Transaction
 from blockchain.block import Block
 from blockchain.blockchain import Blockchain
 
 from rpc.server import RPCServer
-from accounts import Wallet
+from accounts import Wallet, verifier
 
 from node.client import Client as NodeClient
 from node.server import Server as NodeServer
@@ -49,12 +53,18 @@ class Processor:
         # Input of the rpc server and the other nodes
         self.input_queue = Queue()
 
-        # Transactions to add to chain (list of :py::class:`blockchain.Transaction`)
-        self.tx = []
+        # Transactions to add to chain (ordered by their fees)
+        self.mempool = Mempool()
 
         # Temporary blocks for the next epoch
         self.next_epoch = []
 
+        # Time of the last mempool snapshot
+        self.last_snapshot = monotonic()
+
+        # Event loop that runs all components (only used by the asyncio runtime)
+        self.runtime = None
+
         # Logger
         handler = init_logger()
         basicConfig(level=LOG_LEVEL, handlers=[handler])
@@ -67,7 +77,39 @@ class Processor:
     def run(self):
         # TODO -> Synchronize with other nodes (via rpc server of these nodes)
 
-        # Set the validator up
+        if not self.setup_validator():
+            return False
+
+        # Listen to new data and validate blocks
+        while not self.stop_event.is_set():
+            block = self.propose_block()
+
+            if not block:
+                return False
+
+            # Collect all temporary blocks and transactions from queue, until time is over (32 seconds)
+            minimal_timestamp = self.round_deadline()
+
+            while datetime.now().timestamp() <= minimal_timestamp:
+                self.handle_round_items(self.collect(minimal_timestamp), block)
+
+            # Share winner with other nodes, fetch their winner (for 5 seconds)
+            minimal_timestamp = self.vote_winner()
+
+            while datetime.now().timestamp() <= minimal_timestamp:
+                self.handle_winner_items(self.collect(minimal_timestamp))
+
+            if not self.finish_round():
+                return False
+
+        # TODO -> Turn all processes off
+
+    def setup_validator(self) -> bool:
+        """Sets the validator up.
+
+        :return: Whether the validator has enough stake to validate or not.
+        :rtype: bool
+        """
         self.validator = Validator(self.private_key)
 
         # Check if enough VAC is staked to become a validator
@@ -77,6 +119,10 @@ class Processor:
 
             return False
 
+        # The periodic checks only cover the new blocks, the older blocks are audited once in the background
+        if AUDIT_ON_START:
+            self.blockchain.start_audit()
+
         # TODO -> Advertise to the network
 
         # TODO -> Connect to other nodes
@@ -85,170 +131,296 @@ class Processor:
 
         log_info('Validation process is running!')
 
-        # Listen to new data and validate blocks
-        while not self.stop_event.is_set():
-            log_info('Creating new block...')
+        return True
 
-            # Fetch the transactions for this block
-            if self.tx:
-                tx = self.tx[0:2048] if len(self.tx) >= 2048 else self.tx[0:len(self.tx)]
+    def log_cache_stats(self):
+        """Logs how well the block caches answer the lookups.
 
-                self.tx = list(set(self.tx) - set(tx))
+        """
+        stats = self.blockchain.cache_stats
+        hot, warm = stats['hot'], stats['warm']
 
-            else:
-                tx = []
+        log_info(f'Block cache: {hot["blocks"]}/{hot["size"]} recent blocks, {hot["hit_rate"]:.1%} hits | '
+                 f'{warm["blocks"]} compressed blocks, {warm["memory"] / 1_048_576:.1f}/'
+                 f'{warm["budget"] / 1_048_576:.1f} MiB, {warm["hit_rate"]:.1%} hits, {warm["evictions"]} evictions')
 
-            # Create own block
-            block = Block(tx, self.blockchain.last_blocks[0])
+    def propose_block(self) -> Block | bool:
+        """Creates, signs and emits the own block of this round.
 
-            if self.blockchain.last_blocks[0].timestamp + timedelta(0, 32) > datetime.now(timezone.utc):
-                block.timestamp = self.blockchain.last_blocks[0].timestamp + timedelta(0, 32)
+        :return: Own block or False if it is invalid.
+        :rtype: :py:class:`blockchain.Block` | bool
+        """
+        log_info('Creating new block...')
 
-            else:
-                block.timestamp = datetime.now(timezone.utc)
+        # Fetch the most valuable transactions for this block (they stay pending until a block includes them)
+        tx = self.mempool.select()
 
-            # Sign the block
-            block, success = self.validator.validate_block(block)
+        # Create own block
+        block = Block(tx, self.blockchain.last_blocks[0], blockchain=self.blockchain)
 
-            # Check if the block is valid
-            if not block.is_valid(self.blockchain):
-                log_error('Error occurred! Stopping program (Own block is invalid)')
+        if self.blockchain.last_blocks[0].timestamp + timedelta(0, 32) > datetime.now(timezone.utc):
+            block.timestamp = self.blockchain.last_blocks[0].timestamp + timedelta(0, 32)
 
-                # TODO -> Change behaviour when block is invalid
+        else:
+            block.timestamp = datetime.now(timezone.utc)
 
-                return False
+        # Sign the block
+        block, success = self.validator.validate_block(block)
 
-            # Add blocks fetched previously
-            self.validator.temp_blocks = self.next_epoch
-            self.next_epoch = []
+        # Check if the block is valid
+        if not block.is_valid(self.blockchain):
+            log_error('Error occurred! Stopping program (Own block is invalid)')
 
-            # Add block to own temp block
-            self.validator.temp_blocks.append(block)
+            # TODO -> Change behaviour when block is invalid
 
-            # Emit the temp block to the network
-            self.node_client.send_message(json_dumps({'type': 'temp_block', 'data': block.to_json()}).encode('utf-8'))
+            return False
 
-            # Set the timestamp that at least should be reached before the next block
-            minimal_timestamp = self.blockchain.last_blocks[0].timestamp.timestamp() + 32
+        # Add blocks fetched previously
+        self.validator.temp_blocks = self.next_epoch
+        self.next_epoch = []
 
-            # Collect all temporary blocks and transactions from queue, until time is over (32 seconds)
-            while datetime.now().timestamp() <= minimal_timestamp:
-                if not self.input_queue.empty():
-                    # Fetch item from queue
-                    item_queue = self.input_queue.get()
+        # Add block to own temp block
+        self.validator.temp_blocks.append(block)
 
-                    # Check if the item is a transaction
-                    if item_queue['type'] == 'tx':
-                        # Check if the transaction is valid
-                        if item_queue['data'].is_valid(self.blockchain):
-                            # Add transaction to tx list
-                            self.tx.append(item_queue['data'])
+        # Emit the temp block to the network
+        self.node_client.send_message(json_dumps({'type': 'temp_block', 'data': block.to_json()}).encode('utf-8'))
 
-                        else:
-                            log_warning('Found an invalid transaction!')
+        return block
 
-                    # Check if the item is a block
-                    elif item_queue['type'] == 'temp_block':
-                        # Check if the block is valid
-                        if not item_queue['data'].is_valid(self.blockchain):
-                            continue
+    def round_deadline(self) -> float:
+        """Returns the timestamp that at least should be reached before the next block.
 
-                        # Check if the block is for this round
-                        if item_queue['data'].index == block.index:
-                            exists = False
+        :return: Timestamp in seconds.
+        :rtype: float
+        """
+        return self.blockchain.last_blocks[0].timestamp.timestamp() + 32
 
-                            for tmp in self.validator.temp_blocks:
-                                if tmp.validator == item_queue['data'].validator:
-                                    exists = True
-                                    break
+    def handle_round_items(self, items: list, block: Block):
+        """Handles the input that arrived while the temporary blocks of this round are collected.
 
-                            if not exists:
-                                self.validator.temp_blocks.append(item_queue['data'])
+        :param items: Transactions and blocks of the rpc server and the other nodes.
+        :type items: [ dict ]
+        :param block: Own block of this round.
+        :type block: :py:class:`blockchain.Block`
+        """
+        if not items:
+            return
 
-                        # Check if the block is for the next round
-                        elif item_queue['data'].index == block.index + 1:
-                            exists = False
+        # Verify the signatures of all new transactions at once
+        self.admit_transactions([item['data'] for item in items if item['type'] == 'tx'])
 
-                            for tmp in self.next_epoch:
-                                if tmp.validator == item_queue['data'].validator:
-                                    exists = True
-                                    break
+        for item_queue in items:
+            # Check if the item is a block
+            if item_queue['type'] == 'temp_block':
+                # Check if the block is valid
+                if not item_queue['data'].is_valid(self.blockchain):
+                    continue
 
-                            if not exists:
-                                self.next_epoch.append(item_queue['data'])
+                # Check if the block is for this round
+                if item_queue['data'].index == block.index:
+                    exists = False
 
-                    elif item_queue['type'] == 'winner_block':
-                        # Check if the block is valid
-                        if not item_queue['data'].is_valid(self.blockchain):
-                            continue
+                    for tmp in self.validator.temp_blocks:
+                        if tmp.validator == item_queue['data'].validator:
+                            exists = True
+                            break
 
-                        # Check if the block is for this round
-                        if not item_queue['data'].index == block.index:
-                            continue
+                    if not exists:
+                        self.validator.temp_blocks.append(item_queue['data'])
 
-                        self.validator.winner_blocks.append(item_queue['data'])
+                # Check if the block is for the next round
+                elif item_queue['data'].index == block.index + 1:
+                    exists = False
 
-                else:
-                    time_sleep(.01)
+                    for tmp in self.next_epoch:
+                        if tmp.validator == item_queue['data'].validator:
+                            exists = True
+                            break
 
-            # Select the winner block of the temporary blocks and add it to the winner blocks list
-            self.validator.winner_blocks.append(self.validator.select_winner(self.blockchain, clear_temp=True))
+                    if not exists:
+                        self.next_epoch.append(item_queue['data'])
 
-            # Set the current time plus 5 seconds to collect the winner blocks
-            minimal_timestamp = datetime.now().timestamp() + 5
+            elif item_queue['type'] == 'winner_block':
+                # Check if the block is valid
+                if not item_queue['data'].is_valid(self.blockchain):
+                    continue
 
-            # Share winner with other nodes, fetch their winner
-            while datetime.now().timestamp() <= minimal_timestamp:
-                if not self.input_queue.empty():
-                    # Fetch item from queue
-                    item_queue = self.input_queue.get()
+                # Check if the block is for this round
+                if not item_queue['data'].index == block.index:
+                    continue
+
+                self.validator.winner_blocks.append(item_queue['data'])
+
+    def vote_winner(self) -> float:
+        """Selects the winner block of the temporary blocks and adds it to the winner blocks list.
+
+        :return: Timestamp (in seconds) until when the winner blocks of the other nodes are collected.
+        :rtype: float
+        """
+        self.validator.winner_blocks.append(self.validator.select_winner(self.blockchain, clear_temp=True))
+
+        # Set the current time plus 5 seconds to collect the winner blocks
+        return datetime.now().timestamp() + 5
+
+    def handle_winner_items(self, items: list):
+        """Handles the input that arrived while the winner blocks of the other nodes are collected.
+
+        :param items: Transactions and blocks of the rpc server and the other nodes.
+        :type items: [ dict ]
+        """
+        if not items:
+            return
+
+        # Transactions that arrive in the meantime are kept for the next block
+        self.admit_transactions([item['data'] for item in items if item['type'] == 'tx'])
+
+        for item_queue in items:
+            # Check if the item is a block
+            if item_queue['type'] == 'winner_block':
+                # Check if the block is for this round
+                if item_queue['data'].index == self.validator.winner_blocks[0].index:
+                    self.validator.winner_blocks.append(item_queue['data'])
+
+    def finish_round(self) -> bool:
+        """Adds the block with the most votes to the chain.
+
+        :return: Status whether the round was finished successfully (validating stops otherwise).
+        :rtype: bool
+        """
+        # Compares the winner blocks
+        winner_block_points = {}
+
+        for winner_block in self.validator.winner_blocks:
+            if winner_block in winner_block_points:
+                winner_block_points[winner_block] += 1
+
+            else:
+                winner_block_points[winner_block] = 1
+
+        # Select the winner block
+        winner_block = max(winner_block_points, key=winner_block_points.get)
+
+        # Add block to the blockchain
+        success = self.blockchain.add_block(winner_block)
 
-                    # Check if the item is a block
-                    if item_queue['type'] == 'winner_block':
-                        # Check if the block is for this round
-                        if item_queue['data'] == self.validator.winner_blocks[0].index:
-                            self.validator.winner_blocks.append(item_queue['data'])
+        if not success:
+            log_error('Block could not be added to blockchain! Stopping program...')
 
-            # Compares the winner blocks
-            winner_block_points = {}
+            return False
 
-            for winner_block in self.validator.winner_blocks:
-                if winner_block in winner_block_points:
-                    winner_block_points[winner_block] += 1
+        log_info(f'Added block {winner_block.index} successfully')
 
-                else:
-                    winner_block_points[winner_block] = 1
+        # Drop the transactions that are in the chain now
+        self.mempool.remove(tx.hash for tx in winner_block.tx)
 
-            # Select the winner block
-            winner_block = max(winner_block_points, key=winner_block_points.get)
+        # Reset temporary and winner blocks
+        self.validator.temp_blocks = []
+        self.validator.winner_blocks = []
 
-            # Add block to the blockchain
-            success = self.blockchain.add_block(winner_block)
+        # Every 10 blocks check the blocks that were added since the last validation (and the result of the audit)
+        if winner_block.index % 10 == 0:
+            if self.blockchain.audit_result is False or not self.blockchain.valid_since_watermark():
+                # TODO -> Find the error and resync the chain with the help of other nodes
 
-            if not success:
-                log_error('Block could not be added to blockchain! Stopping program...')
+                log_error('Blockchain is invalid! Stopping program...')
 
                 return False
 
-            log_info(f'Added block {winner_block.index} successfully')
+            else:
+                log_info('Chain is valid')
 
-            # Reset temporary and winner blocks
-            self.validator.temp_blocks = []
-            self.validator.winner_blocks = []
+            self.log_cache_stats()
 
-            # Every 10 blocks check if whole chain is valid
-            if winner_block.index % 10 == 0:
-                if not self.blockchain.is_valid:
-                    # TODO -> Find the error and resync the chain with the help of other nodes
+        # Save the pending transactions for a fast restart
+        if monotonic() - self.last_snapshot >= MEMPOOL_SNAPSHOT_INTERVAL:
+            self.save_snapshot()
 
-                    log_error('Blockchain is invalid! Stopping program...')
+        return True
 
-                    return False
+    def collect(self, deadline: float) -> list:
+        """Waits for input of the rpc server and the other nodes (returns as soon as something arrives).
 
-                else:
-                    log_info('Chain is valid')
+        :param deadline: Timestamp (in seconds) until when to wait at most.
+        :type deadline: float
 
-        # TODO -> Turn all processes off
+        :return: All items that arrived (empty if nothing arrived before the deadline).
+        :rtype: [ dict ]
+        """
+        timeout = deadline - datetime.now().timestamp()
+
+        if timeout <= 0:
+            return []
+
+        try:
+            items = [self.input_queue.get(timeout=timeout)]
+
+        except Empty:
+            return []
+
+        # Fetch everything else that arrived in the meantime
+        while True:
+            try:
+                items.append(self.input_queue.get_nowait())
+
+            except Empty:
+                return items
+
+    def admit_transactions(self, transactions: [Transaction]):
+        """Adds the valid transactions to the mempool (their signatures are verified in parallel).
+
+        :param transactions: Transactions that arrived from the rpc server or other nodes.
+        :type transactions: [ :py:class:`blockchain.Transaction` ]
+        """
+        valid_signatures = verifier.verify(tx.signature_item for tx in transactions)
+
+        for tx, valid_signature in zip(transactions, valid_signatures):
+            # Check if the transaction is valid
+            if valid_signature and tx.is_valid(self.blockchain, verify_signature=False):
+                # Add transaction to the mempool (duplicates are ignored)
+                self.mempool.add(tx)
+
+            else:
+                log_warning('Found an invalid transaction!')
+
+    def save_snapshot(self) -> bool:
+        """Writes the mempool and the blocks of the next epoch to disk.
+
+        :return: Status whether the snapshot was written or not.
+        :rtype: bool
+        """
+        self.last_snapshot = monotonic()
+
+        if not save_snapshot(self.mempool.entries(), list(self.next_epoch)):
+            log_warning('Mempool snapshot could not be written!')
+
+            return False
+
+        return True
+
+    def restore_snapshot(self):
+        """Reloads the last snapshot (verified transactions are only checked for their inclusion into the chain).
+
+        """
+        entries, blocks = load_snapshot()
+
+        unverified = []
+
+        for tx, verified, age in entries:
+            if not verified:
+                unverified.append(tx)
+
+            elif not self.blockchain.tx_included(tx):
+                self.mempool.add(tx, age=age)
+
+        # Transactions that were never verified go through the normal admission
+        if unverified:
+            self.admit_transactions(unverified)
+
+        # Only blocks for the upcoming round are still useful
+        if not self.next_epoch:
+            self.next_epoch = [block for block in blocks if block.index == self.blockchain.last_blocks[0].index + 1]
+
+        log_info(f'Restored {len(self.mempool)} pending transactions and {len(self.next_epoch)} blocks')
 
     def start(self):
         """Starts the processor-thread.
@@ -267,19 +439,31 @@ class Processor:
             self.stop_event = Event()
             self.thread = Thread(target=self.run)
 
-        # Start database handler
-        self.database = Database()
+        # The asyncio runtime replaces the threads of the components with one event loop
+        if RUNTIME == 'asyncio':
+            self.runtime = AsyncRuntime(self)
+            self.thread = Thread(target=self.runtime.run)
+
+            self.input_queue = self.runtime.input_queue
+
+            # Database tasks are executed by the runtime instead of the database-thread
+            self.database = Database(manual=True)
+            self.database.db_q = self.runtime.database_queue
+
+        else:
+            # Start database handler
+            self.database = Database()
 
         # Initialize the blockchain
         if not self.genesis_validation:
             self.blockchain = Blockchain()
 
         else:
-            # Check if the database is empty
-            if self.database.fetchone('SELECT * FROM blockchain', {}) or self.database.fetchone('SELECT * FROM transactions', {}):
-                # Reset the chain
-                self.database.push_to_db('DELETE FROM blockchain', {})
-                self.database.push_to_db('DELETE FROM transactions', {})
+            # Reset the chain (the account state of the old chain would collide with the new genesis block)
+            if not reset_chain():
+                log_error('Error occurred! Stopping program (Could not reset the chain)')
+
+                return False
 
             # Test values
             test_tx = Transaction(
@@ -294,11 +478,32 @@ class Processor:
                 4_096, tx_type='tx')
             test_tx2.signature = '00000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000 '
 
-            self.blockchain = Blockchain(genesis_tx=[test_tx, test_tx2])
+            try:
+                self.blockchain = Blockchain(genesis_tx=[test_tx, test_tx2])
+
+            # The error was logged by the blockchain
+            except RuntimeError:
+                return False
+
+        # Reload the pending transactions of the last run
+        self.restore_snapshot()
 
         # Start the rpc server
         self.rpc_server = RPCServer(self.blockchain, processor_queue=self.input_queue, db_q=self.database.db_q)
 
+        # Set the node client and server up
+        self.node_client = NodeClient(self.database)
+        self.node_server = NodeServer(self.input_queue, self.blockchain, client=self.node_client,
+                                      database=self.database)
+
+        # The runtime starts the servers and the client itself
+        if self.runtime:
+            self.thread.start()
+
+            log_info('Processor started!')
+
+            return True
+
         # Start the rpc server
         try:
             self.rpc_server.start()
@@ -310,11 +515,6 @@ class Processor:
 
             return False
 
-        # Set the node client and server up
-        self.node_client = NodeClient(self.database)
-        self.node_server = NodeServer(self.input_queue, self.blockchain, client=self.node_client,
-                                      database=self.database)
-
         # Start the node client and server
         self.node_server.start()
         self.node_client.start()
@@ -347,6 +547,13 @@ class Processor:
         # Stop the thread
         self.stop_event.set()
 
+        # Keep the pending transactions for the next start
+        self.save_snapshot()
+
+        # Stop the event loop of the asyncio runtime
+        if self.runtime:
+            self.runtime.stop()
+
         # Cut the socket and rpc connections
         self.rpc_server.stop()
         self.rpc_server = None
@@ -370,9 +577,8 @@ class Processor:
         # Stop the processor
         self.stop()
 
-        # Wait until stop is injected
-        while self.thread.is_alive():
-            time_sleep(.01)
+        # Wait until the thread has finished
+        self.thread.join()
 
         # Start the processor
         self.start()
@@ -0,0 +1,257 @@
+# Event loop
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+# Optional asyncio-interfaces of zmq and grpc
+from zmq import REP
+from zmq.asyncio import Context as AsyncContext
+from grpc import aio as grpc_aio
+
+# Logging
+from logging import info as log_info, error as log_error
+
+# Add to path
+from sys import path
+from os.path import dirname, abspath, join
+
+path.insert(0, join(dirname(abspath(__file__)), '..'))
+
+from __init__ import DATABASE_POOL_SIZE
+from util.database.database import Database
+
+
+class LoopQueue:
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        """Input queue of the processor, that can be filled from every thread (the items are handed to the event loop).
+
+        :param loop: Event loop of the runtime.
+        :type loop: :py:class:`asyncio.AbstractEventLoop`
+        """
+        self.loop = loop
+        self.queue = asyncio.Queue()
+
+    def put_nowait(self, item):
+        """Adds an item (called by the rpc threads and the tasks of the event loop).
+
+        :param item: Transaction or block with its type.
+        :type item: dict
+        """
+        self.loop.call_soon_threadsafe(self.queue.put_nowait, item)
+
+    put = put_nowait
+
+    async def collect(self, deadline: float) -> list:
+        """Waits for input of the rpc server and the other nodes (returns as soon as something arrives).
+
+        :param deadline: Timestamp (in seconds) until when to wait at most.
+        :type deadline: float
+
+        :return: All items that arrived (empty if nothing arrived before the deadline).
+        :rtype: [ dict ]
+        """
+        timeout = deadline - datetime.now().timestamp()
+
+        if timeout <= 0:
+            return []
+
+        try:
+            items = [await asyncio.wait_for(self.queue.get(), timeout)]
+
+        except asyncio.TimeoutError:
+            return []
+
+        # Fetch everything else that arrived in the meantime
+        while not self.queue.empty():
+            items.append(self.queue.get_nowait())
+
+        return items
+
+
+class DatabaseQueue:
+    def __init__(self, executor: ThreadPoolExecutor):
+        """Replaces the queue of the database-thread (the tasks run on one executor-thread in their order).
+
+        :param executor: Executor with a single thread.
+        :type executor: :py:class:`concurrent.futures.ThreadPoolExecutor`
+        """
+        self.executor = executor
+
+    def put(self, sql_data: tuple):
+        """Schedules a database task.
+
+        :param sql_data: Command, its arguments, what to fetch and a queue for the response.
+        :type sql_data: tuple
+        """
+        self.executor.submit(Database.handle_task, sql_data)
+
+    put_nowait = put
+
+
+class AsyncRuntime:
+    def __init__(self, processor):
+        """Sets the event loop up, that drives the processor, the node server and the rpc server.
+
+        :param processor: Processor whose components are run.
+        :type processor: :py:class:`validator.processor.Processor`
+        """
+        self.processor = processor
+
+        self.loop = asyncio.new_event_loop()
+
+        # Input of the rpc server and the other nodes
+        self.input_queue = LoopQueue(self.loop)
+
+        # Blocking work (validation, signatures and database reads) runs next to the loop, writes keep their order
+        self.executor = ThreadPoolExecutor(max_workers=DATABASE_POOL_SIZE, thread_name_prefix='runtime')
+        self.database_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='database')
+
+        self.database_queue = DatabaseQueue(self.database_executor)
+
+        # Set when the runtime should stop
+        self.stopped = asyncio.Event()
+
+    def run(self):
+        """Runs the event loop until the runtime is stopped (target of the processor-thread).
+
+        """
+        asyncio.set_event_loop(self.loop)
+
+        try:
+            self.loop.run_until_complete(self.main())
+
+        finally:
+            self.executor.shutdown(wait=True, cancel_futures=True)
+            self.database_executor.shutdown(wait=True)
+
+            self.loop.close()
+
+    def stop(self):
+        """Stops the runtime (can be called from every thread).
+
+        """
+        if not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self.stopped.set)
+
+    async def call(self, function, *args):
+        """Runs a blocking function on the executor, so that the event loop keeps serving.
+
+        :param function: Function to call.
+        :type function: function
+
+        :return: Return value of the function.
+        """
+        return await self.loop.run_in_executor(self.executor, function, *args)
+
+    async def main(self):
+        """Schedules the tasks of all components and cancels them when the runtime stops.
+
+        """
+        self.loop.set_default_executor(self.executor)
+
+        tasks = [asyncio.create_task(self.rpc_server(), name='rpc-server'),
+                 asyncio.create_task(self.node_server(), name='node-server'),
+                 asyncio.create_task(self.node_client(), name='node-client'),
+                 asyncio.create_task(self.validate(), name='processor')]
+
+        log_info('Asyncio runtime started')
+
+        await self.stopped.wait()
+
+        for task in tasks:
+            task.cancel()
+
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        log_info('Asyncio runtime stopped')
+
+    async def validate(self):
+        """Runs the rounds of the processor (the same steps as the processor-thread).
+
+        """
+        processor = self.processor
+
+        if not await self.call(processor.setup_validator):
+            return
+
+        while True:
+            block = await self.call(processor.propose_block)
+
+            if not block:
+                return
+
+            # Collect all temporary blocks and transactions from queue, until time is over (32 seconds)
+            deadline = await self.call(processor.round_deadline)
+
+            while datetime.now().timestamp() <= deadline:
+                await self.call(processor.handle_round_items, await self.input_queue.collect(deadline), block)
+
+            # Share winner with other nodes, fetch their winner (for 5 seconds)
+            deadline = await self.call(processor.vote_winner)
+
+            while datetime.now().timestamp() <= deadline:
+                await self.call(processor.handle_winner_items, await self.input_queue.collect(deadline))
+
+            if not await self.call(processor.finish_round):
+                return
+
+    async def node_server(self):
+        """Answers the requests of the other nodes with an asyncio-socket.
+
+        """
+        server = self.processor.node_server
+
+        context = AsyncContext()
+        socket = context.socket(REP)
+        socket.bind(f'tcp://*:{server.port}')
+
+        try:
+            while True:
+                message = await socket.recv()
+
+                # Verifying the request and broadcasting it can block
+                await socket.send(await self.call(server.reply, message))
+
+        finally:
+            socket.close(linger=0)
+            context.term()
+
+    async def node_client(self):
+        """Connects to the other nodes and sends the keep alive messages.
+
+        """
+        client = self.processor.node_client
+
+        if not await self.call(client.connect_nodes):
+            return
+
+        try:
+            while True:
+                if client.connected_nodes:
+                    await self.call(client.keep_alive)
+
+                await asyncio.sleep(20)
+
+        finally:
+            client.disconnect_nodes()
+
+    async def rpc_server(self):
+        """Serves the rpc services with the asyncio-server of grpc (the synchronous handlers run on the executor).
+
+        """
+        server = grpc_aio.server(migration_thread_pool=self.executor)
+
+        self.processor.rpc_server.add_servicers(server)
+
+        try:
+            await server.start()
+
+            log_info('RPC Server started!')
+
+            await server.wait_for_termination()
+
+        except Exception as error:
+            log_error(f'RPC Server failed to start! ({error})')
+
+        finally:
+            await server.stop(0)
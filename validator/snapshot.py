@@ -0,0 +1,178 @@
+# Binary format
+from struct import Struct, error as StructError
+from os import replace
+from os.path import exists
+import json
+
+# Add to path
+from sys import path
+from os.path import dirname, abspath, join
+
+path.insert(0, join(dirname(abspath(__file__)), '..'))
+
+from __init__ import MEMPOOL_FILE
+from blockchain.transaction import Transaction
+from blockchain.block import Block
+
+# File-header: magic, format version, amount of transactions and blocks
+MAGIC = b'AVMP'
+VERSION = 1
+HEADER = Struct('>4sBII')
+
+# Fixed part of a transaction: amount, fee, timestamp (microseconds since the epoch), age (seconds) and whether the
+# signature was verified
+TX_VALUES = Struct('>ddqd?')
+
+# Text fields: kind (hex-digest, text or none) and length
+FIELD = Struct('>BH')
+FIELD_HEX, FIELD_TEXT, FIELD_NONE = 0, 1, 2
+
+# Length of a block (blocks are stored as json)
+BLOCK_LENGTH = Struct('>I')
+
+
+def pack_field(value) -> bytes:
+    """Packs a text field (hex-digests are stored as their raw bytes, which halves their size).
+
+    :param value: Value of the field.
+    :type value: str | NoneType
+
+    :return: Packed field.
+    :rtype: bytes
+    """
+    if value is None:
+        return FIELD.pack(FIELD_NONE, 0)
+
+    try:
+        payload = bytes.fromhex(value)
+
+        # Only lowercase hex-digests survive the round-trip
+        if payload.hex() == value:
+            return FIELD.pack(FIELD_HEX, len(payload)) + payload
+
+    except ValueError:
+        pass
+
+    payload = value.encode('utf-8')
+
+    return FIELD.pack(FIELD_TEXT, len(payload)) + payload
+
+
+def unpack_field(data: memoryview, offset: int) -> tuple:
+    """Unpacks a text field.
+
+    :param data: Content of the snapshot.
+    :type data: memoryview
+    :param offset: Position of the field.
+    :type offset: int
+
+    :return: Value of the field and the position after it.
+    :rtype: (str | NoneType, int)
+    """
+    kind, length = FIELD.unpack_from(data, offset)
+    offset += FIELD.size
+
+    payload = bytes(data[offset:offset + length])
+
+    if not len(payload) == length:
+        raise ValueError('Snapshot is truncated')
+
+    if kind == FIELD_NONE:
+        return None, offset
+
+    return (payload.hex() if kind == FIELD_HEX else payload.decode('utf-8')), offset + length
+
+
+def save_snapshot(entries: list, blocks: list, file: str = MEMPOOL_FILE) -> bool:
+    """Writes the pending transactions and the blocks of the next epoch to disk (replaces the last snapshot at once,
+       so that a crash never leaves half a snapshot).
+
+    :param entries: Transactions, whether their signatures were verified and their ages in seconds.
+    :type entries: [ (:py:class:`blockchain.Transaction`, bool, float) ]
+    :param blocks: Temporary blocks of the next epoch.
+    :type blocks: [ :py:class:`blockchain.Block` ]
+    :param file: Path of the snapshot.
+    :type file: str
+
+    :return: Status whether the snapshot was written or not.
+    :rtype: bool
+    """
+    parts = [HEADER.pack(MAGIC, VERSION, len(entries), len(blocks))]
+
+    for tx, verified, age in entries:
+        parts.append(TX_VALUES.pack(tx.amount, tx.fee, tx.microseconds, age, verified))
+        parts += [pack_field(tx.sender), pack_field(tx.recipient), pack_field(tx.type), pack_field(tx.signature)]
+
+    for block in blocks:
+        payload = block.to_json().encode('utf-8')
+
+        parts += [BLOCK_LENGTH.pack(len(payload)), payload]
+
+    try:
+        with open(f'{file}.tmp', 'wb') as snapshot:
+            snapshot.write(b''.join(parts))
+
+        replace(f'{file}.tmp', file)
+
+    except OSError:
+        return False
+
+    return True
+
+
+def load_snapshot(file: str = MEMPOOL_FILE) -> tuple:
+    """Reads the last snapshot (a missing or broken snapshot is treated as empty).
+
+    :param file: Path of the snapshot.
+    :type file: str
+
+    :return: Transactions with their verification status and age and the blocks of the next epoch.
+    :rtype: ([ (:py:class:`blockchain.Transaction`, bool, float) ], [ :py:class:`blockchain.Block` ])
+    """
+    if not exists(file):
+        return [], []
+
+    try:
+        with open(file, 'rb') as snapshot:
+            data = memoryview(snapshot.read())
+
+        magic, version, tx_count, block_count = HEADER.unpack_from(data, 0)
+
+        if not magic == MAGIC or not version == VERSION:
+            return [], []
+
+        offset = HEADER.size
+        entries, blocks = [], []
+
+        for _ in range(tx_count):
+            amount, fee, microseconds, age, verified = TX_VALUES.unpack_from(data, offset)
+            offset += TX_VALUES.size
+
+            tx = Transaction('', '', 0)
+
+            tx.sender, offset = unpack_field(data, offset)
+            tx.recipient, offset = unpack_field(data, offset)
+            tx.type, offset = unpack_field(data, offset)
+            tx.signature, offset = unpack_field(data, offset)
+
+            # Set the values after the constructor (it would change the fee)
+            tx.amount, tx.fee = amount, fee
+            tx.microseconds = microseconds
+
+            entries.append((tx, verified, age))
+
+        for _ in range(block_count):
+            length, = BLOCK_LENGTH.unpack_from(data, offset)
+            offset += BLOCK_LENGTH.size
+
+            block = Block(base_fee=False)
+
+            if block.from_dict(json.loads(bytes(data[offset:offset + length]))):
+                blocks.append(block)
+
+            offset += length
+
+    except (OSError, StructError, ValueError):
+        return [], []
+
+    return entries, blocks
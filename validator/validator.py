@@ -66,10 +66,13 @@ class Validator():
         """
         attendees = [ ]
 
+        # Scores of all validators at the end of the last block (calculated once per block height)
+        stakes = blockchain.stake_snapshot()
+
         # Go through all temporary blocks
         for tmp in self.temp_blocks:
             # Add the validators staking score (stake and its age), his address and the decimal-version of the blocks hash
-            attendees.append([Wallet.score(tmp.validator, blockchain), tmp.validator, int(tmp.hash, 16)])
+            attendees.append([stakes.score(tmp.validator), tmp.validator, int(tmp.hash, 16)])
 
         # Sort the attendees after the smallest to the biggest decimal hash value
         attendees.sort(key=lambda x: x[2])
@@ -79,13 +82,13 @@ class Validator():
 
         for i in range(0, len(attendees)):
             # Calculate the validators staking score with his current rank
-            attendees[i][0] * .9 ** (i + 1)
+            attendees[i][0] *= .9 ** (i + 1)
 
         # Filter attendees out until a winner gets found
         while len(attendees) > 1:
             for i in range(0, len(attendees), 2):
                 # Check if there is another competitor
-                if len(attendees) <= pos + 1:
+                if len(attendees) <= i + 1:
                     # Drop this attendee from the competitors list
                     attendees.pop(i)
                     break